@@ -0,0 +1,112 @@
+import argparse
+import random
+import sys
+import timeit
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from benchmarks.synthetic import make_functions
+from src.argument_validation import get_argument_validator
+from src.get_function_calling_schema import get_function_calling_schema
+
+JSON_TYPES: Dict[str, Any] = {
+    "string": str,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "number": (int, float),
+}
+
+
+def validate_generically(
+    schema: Dict[str, Any],
+    arguments: Dict[str, Any],
+) -> Dict[str, Any]:
+    # A schema-walking validator, standing in for a generic JSON Schema
+    #  validator when `jsonschema` is not installed.
+    parameters = schema["parameters"]
+    for name in parameters["required"]:
+        if name not in arguments:
+            raise ValueError(f"Missing {name}.")
+    for name, value in arguments.items():
+        property_schema = parameters["properties"].get(name)
+        if property_schema is None:
+            raise ValueError(f"Unexpected {name}.")
+        expected = JSON_TYPES[property_schema["type"]]
+        if isinstance(value, bool) and property_schema["type"] != "boolean":
+            raise ValueError(f"Invalid {name}.")
+        if not isinstance(value, expected):
+            raise ValueError(f"Invalid {name}.")
+        if "enum" in property_schema and value not in property_schema["enum"]:
+            raise ValueError(f"Invalid {name}.")
+    return arguments
+
+
+def make_arguments(
+    rng: random.Random,
+    schema: Dict[str, Any],
+) -> Dict[str, Any]:
+    values = {
+        "string": "value",
+        "boolean": True,
+        "array": [1, 2],
+        "object": {"key": 1},
+        "number": 1,
+    }
+    arguments = {}
+    for name, property_schema in schema["parameters"]["properties"].items():
+        if name in schema["parameters"]["required"] or rng.random() < 0.5:
+            arguments[name] = property_schema.get(
+                "enum", [values[property_schema["type"]]]
+            )[0]
+    return arguments
+
+
+def get_validators(
+    schema: Dict[str, Any],
+    func: Callable,
+) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    validators = {
+        "compiled": get_argument_validator(func),
+        "generic": lambda arguments: validate_generically(schema, arguments),
+    }
+    try:
+        import jsonschema
+    except ImportError:
+        return validators
+    validator = jsonschema.Draft7Validator(schema["parameters"])
+    validators["jsonschema"] = validator.validate
+    return validators
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark compiled against generic argument validation."
+    )
+    parser.add_argument("--functions", type=int, default=200)
+    parser.add_argument("--max-parameters", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    totals: Dict[str, float] = {}
+    for func in make_functions(
+        args.functions, max_parameters=args.max_parameters
+    ):
+        schema = get_function_calling_schema(func)
+        arguments = make_arguments(rng, schema)
+        for name, validator in get_validators(schema, func).items():
+            totals[name] = totals.get(name, 0.0) + timeit.timeit(
+                lambda: validator(arguments), number=args.repeat
+            )
+
+    calls = args.functions * args.repeat
+    for name, total in totals.items():
+        print(
+            f"{name:<12} {total / calls * 1e6:>8.2f}us/call"
+            f" {total / totals['compiled']:>6.1f}x the compiled time"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import argparse
+import sys
+import tracemalloc
+from typing import Callable, List, Optional, Sequence
+
+from benchmarks.synthetic import make_functions
+from src.function_spec import build_function_spec
+from src.get_function_calling_schema import generate_function_calling_schema
+
+
+def measure(build: Callable, funcs: List[Callable]) -> int:
+    # Memory still held once the results are built, i.e. what a catalog of
+    #  them costs to keep around.
+    tracemalloc.start()
+    results = [build(func) for func in funcs]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return size
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the memory of schema dicts and function specs."
+    )
+    parser.add_argument("--functions", type=int, default=10000)
+    parser.add_argument("--max-parameters", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    funcs = make_functions(args.functions, max_parameters=args.max_parameters)
+    # Warm the docstring style and type caches so neither side pays for them.
+    build_function_spec(funcs[0])
+
+    dict_size = measure(generate_function_calling_schema, funcs)
+    spec_size = measure(build_function_spec, funcs)
+    print(f"tools        {args.functions:>10}")
+    print(f"dicts        {dict_size / args.functions:>10.0f} B/tool")
+    print(
+        f"specs        {spec_size / args.functions:>10.0f} B/tool"
+        f" {(dict_size - spec_size) / args.functions:>8.0f} B/tool saved"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
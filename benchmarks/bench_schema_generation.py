@@ -0,0 +1,205 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from docstring_parser import parse
+
+from benchmarks.synthetic import DOCSTRING_STYLES, make_functions
+from src.docstring_parsing import parse_docstring
+from src.get_function_calling_schema import (
+    SCHEMA_CACHE,
+    create_description,
+    create_parameters,
+    get_function_calling_schema,
+    invalidate_schema_cache,
+)
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+PERCENTILES = [50, 90, 99]
+CACHED_PHASE = "get_function_calling_schema[cached]"
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    # Nearest rank: the smallest value with at least `percent` percent of
+    #  the values at or below it.
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def measure(
+    call: Callable[[Any], Any],
+    inputs: Sequence[Any],
+    track_memory: bool = True,
+) -> Dict[str, Any]:
+    latencies = []
+    clock = time.perf_counter_ns
+    total_start = clock()
+    for value in inputs:
+        start = clock()
+        call(value)
+        latencies.append((clock() - start) / 1_000)
+    total_seconds = (clock() - total_start) / 1e9
+    latencies.sort()
+
+    result: Dict[str, Any] = {
+        "calls": len(inputs),
+        "throughput_per_second": len(inputs) / total_seconds,
+        "latency_us": {
+            f"p{percent}": percentile(latencies, percent)
+            for percent in PERCENTILES
+        },
+    }
+    # Memory is traced in a second pass so that it does not skew timings.
+    if track_memory:
+        tracemalloc.start()
+        for value in inputs:
+            call(value)
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def get_phases(
+    funcs: Sequence[Callable],
+) -> Dict[str, Callable[[Any], Any]]:
+    parsed_docstrings = {func: parse(func.__doc__) for func in funcs}
+
+    def cached_schema(func: Callable) -> Any:
+        return get_function_calling_schema(func)
+
+    return {
+        "get_function_calling_schema": lambda func: (
+            get_function_calling_schema(func, use_cache=False)
+        ),
+        CACHED_PHASE: cached_schema,
+        "parse": lambda func: parse(func.__doc__),
+        "parse[fast]": lambda func: parse_docstring(func.__doc__, fast=True),
+        "create_description": lambda func: create_description(
+            parsed_docstrings[func], include_long_description=False
+        ),
+        "create_parameters": lambda func: create_parameters(
+            func,
+            parsed_docstrings[func],
+            include_return_in_parameters=False,
+        ),
+    }
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    styles: Sequence[str],
+    max_parameters: int,
+    track_memory: bool = True,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    maxsize = SCHEMA_CACHE.maxsize
+    try:
+        for style in styles:
+            for size in sizes:
+                funcs = make_functions(
+                    size, style=style, max_parameters=max_parameters
+                )
+                # The cache is sized to the corpus and warmed, so that the
+                #  cached case measures hits only.
+                invalidate_schema_cache()
+                SCHEMA_CACHE.maxsize = max(maxsize, size)
+                for func in funcs:
+                    get_function_calling_schema(func)
+                for phase, call in get_phases(funcs).items():
+                    key = f"{phase}/{style}/{size}"
+                    SCHEMA_CACHE.reset_stats()
+                    results[key] = measure(
+                        call, funcs, track_memory=track_memory
+                    )
+                    line = (
+                        f"{key:<55}"
+                        f" p50={results[key]['latency_us']['p50']:>9.1f}us"
+                        f" {results[key]['throughput_per_second']:>11.0f}/s"
+                    )
+                    if phase == CACHED_PHASE:
+                        info = SCHEMA_CACHE.info()
+                        results[key]["hit_rate"] = info.hits / max(
+                            1, info.hits + info.misses
+                        )
+                        line += f" hits={results[key]['hit_rate']:.0%}"
+                    print(line, file=sys.stderr)
+                invalidate_schema_cache()
+    finally:
+        SCHEMA_CACHE.maxsize = maxsize
+    return results
+
+
+def compare_with_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+) -> List[str]:
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        current = result["latency_us"]["p50"]
+        previous = baseline[key]["latency_us"]["p50"]
+        if previous and current > previous * (1 + tolerance):
+            regressions.append(
+                f"{key}: p50 {previous:.1f}us -> {current:.1f}us"
+                f" (+{(current / previous - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark function calling schema generation."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--styles",
+        nargs="+",
+        choices=DOCSTRING_STYLES,
+        default=DOCSTRING_STYLES,
+    )
+    parser.add_argument("--max-parameters", type=int, default=50)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Results file to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        sizes=args.sizes,
+        styles=args.styles,
+        max_parameters=args.max_parameters,
+        track_memory=not args.no_memory,
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            file,
+            indent=2,
+            sort_keys=True,
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
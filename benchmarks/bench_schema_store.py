@@ -0,0 +1,39 @@
+import argparse
+import sys
+import tracemalloc
+from typing import Optional, Sequence
+
+from benchmarks.synthetic import make_functions
+from src.get_function_calling_schema import get_function_calling_schema
+from src.schema_store import warmup
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the memory held by schema dicts and a store."
+    )
+    parser.add_argument("--functions", type=int, default=2000)
+    parser.add_argument("--max-parameters", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    funcs = make_functions(args.functions, max_parameters=args.max_parameters)
+    store = warmup(funcs, freeze=False)
+
+    tracemalloc.start()
+    schemas = [
+        get_function_calling_schema(func, use_cache=False) for func in funcs
+    ]
+    dict_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"schemas      {len(schemas):>10}")
+    print(f"dicts        {dict_size / 1024:>10.1f} KiB")
+    print(
+        f"store        {store.nbytes / 1024:>10.1f} KiB"
+        f" {dict_size / store.nbytes:>6.1f}x smaller"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
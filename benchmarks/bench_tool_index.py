@@ -0,0 +1,96 @@
+import argparse
+import random
+import sys
+import timeit
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.tool_index import ToolIndex
+
+# Word ranks follow a Zipf distribution, as in real tool descriptions where
+#  a few verbs and nouns are shared by most tools.
+ZIPF_EXPONENT = 1.1
+
+
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        for _ in range(size)
+    ]
+
+
+def make_schemas(
+    count: int,
+    vocabulary_size: int,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, vocabulary_size)
+    weights = [
+        1.0 / rank**ZIPF_EXPONENT for rank in range(1, vocabulary_size)
+    ]
+    weights.insert(0, 1.0)
+
+    def make_text(length: int) -> str:
+        return " ".join(rng.choices(vocabulary, weights, k=length))
+
+    return [
+        {
+            "name": (
+                "_".join(rng.choices(vocabulary, weights, k=2)) + f"_{index}"
+            ),
+            "description": make_text(rng.randint(5, 30)),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    f"p{parameter}": {
+                        "type": "string",
+                        "description": make_text(rng.randint(3, 12)),
+                    }
+                    for parameter in range(rng.randint(0, 8))
+                },
+                "required": [],
+            },
+        }
+        for index in range(count)
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark top-k tool retrieval."
+    )
+    parser.add_argument("--tools", type=int, default=3000)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    schemas = make_schemas(args.tools, args.vocabulary)
+    index = ToolIndex()
+    build_time = timeit.timeit(
+        lambda: [index.add(schema) for schema in schemas], number=1
+    )
+
+    rng = random.Random(1)
+    queries = [
+        rng.choice(schemas)["description"].split()[:6]
+        for _ in range(args.queries)
+    ]
+    texts = [" ".join(query) for query in queries]
+    # The first pass also computes the term weights.
+    cold_time = timeit.timeit(
+        lambda: [index.rank(text, args.k) for text in texts], number=1
+    )
+    warm_time = timeit.timeit(
+        lambda: [index.rank(text, args.k) for text in texts], number=5
+    )
+
+    print(f"build {build_time * 1e3:>8.2f}ms for {args.tools} tools")
+    print(f"cold  {cold_time / len(texts) * 1e6:>8.2f}us/query")
+    print(f"warm  {warm_time / (5 * len(texts)) * 1e6:>8.2f}us/query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
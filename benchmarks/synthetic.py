@@ -0,0 +1,132 @@
+import random
+import textwrap
+from typing import Callable, Dict, List, Literal
+
+DOCSTRING_STYLES = ["rest", "google", "numpy"]
+
+PARAMETER_TYPES = ["int", "float", "str", "bool", "list", "dict", "enum"]
+
+WORDS = (
+    "fetch update create delete user order invoice account record report"
+    " price amount date limit offset query filter region status value"
+).split()
+
+
+def make_sentence(rng: random.Random, length: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def make_parameter(rng: random.Random, index: int) -> Dict[str, str]:
+    type_name = rng.choice(PARAMETER_TYPES)
+    annotation = type_name
+    if type_name == "enum":
+        annotation = 'Literal["a", "b", "c"]'
+    return {
+        "name": f"p{index}",
+        "annotation": annotation,
+        "type_name": "str" if type_name == "enum" else type_name,
+        "description": make_sentence(rng, rng.randint(3, 12)),
+        "default": " = None" if rng.random() < 0.3 else "",
+    }
+
+
+def make_docstring(
+    style: str,
+    short_description: str,
+    long_description: str,
+    parameters: List[Dict[str, str]],
+    return_description: str,
+) -> str:
+    lines = [short_description, ""]
+    if long_description:
+        lines += [long_description, ""]
+
+    if style == "rest":
+        for parameter in parameters:
+            lines.append(
+                f":param {parameter['name']}: {parameter['description']}"
+            )
+            lines.append(
+                f":type {parameter['name']}: {parameter['type_name']}"
+            )
+        if return_description:
+            lines += [f":return: {return_description}", ":rtype: int"]
+    elif style == "google":
+        if parameters:
+            lines.append("Args:")
+        for parameter in parameters:
+            lines.append(
+                f"    {parameter['name']} ({parameter['type_name']}):"
+                f" {parameter['description']}"
+            )
+        if return_description:
+            lines += ["", "Returns:", f"    int: {return_description}"]
+    else:
+        if parameters:
+            lines += ["Parameters", "----------"]
+        for parameter in parameters:
+            lines.append(f"{parameter['name']} : {parameter['type_name']}")
+            lines.append(f"    {parameter['description']}")
+        if return_description:
+            lines += ["", "Returns", "-------", "int"]
+            lines.append(f"    {return_description}")
+    return "\n".join(lines).rstrip()
+
+
+def make_function_source(
+    rng: random.Random,
+    name: str,
+    style: str,
+    num_parameters: int,
+    long_description: bool,
+    return_doc: bool,
+) -> str:
+    parameters = [
+        make_parameter(rng, index) for index in range(num_parameters)
+    ]
+    # Parameters with defaults have to come last in the signature.
+    signature_parameters = sorted(
+        parameters, key=lambda parameter: bool(parameter["default"])
+    )
+    signature = ", ".join(
+        f"{parameter['name']}: {parameter['annotation']}{parameter['default']}"
+        for parameter in signature_parameters
+    )
+    docstring = make_docstring(
+        style,
+        short_description=make_sentence(rng, rng.randint(4, 10)),
+        long_description=(
+            make_sentence(rng, rng.randint(20, 60)) if long_description else ""
+        ),
+        parameters=parameters,
+        return_description=make_sentence(rng, 6) if return_doc else "",
+    )
+    body = textwrap.indent(f'"""\n{docstring}\n"""\npass', "    ")
+    return f"def {name}({signature}) -> int:\n{body}\n"
+
+
+def make_functions(
+    count: int,
+    style: str = "google",
+    max_parameters: int = 50,
+    long_description_ratio: float = 0.5,
+    return_doc_ratio: float = 0.5,
+    seed: int = 0,
+) -> List[Callable]:
+    rng = random.Random(seed)
+    sources = []
+    for index in range(count):
+        sources.append(
+            make_function_source(
+                rng,
+                name=f"{style}_tool_{index}",
+                style=style,
+                num_parameters=rng.randint(0, max_parameters),
+                long_description=rng.random() < long_description_ratio,
+                return_doc=rng.random() < return_doc_ratio,
+            )
+        )
+    namespace: Dict[str, object] = {"Literal": Literal}
+    exec("\n\n".join(sources), namespace)
+    return [namespace[f"{style}_tool_{index}"] for index in range(count)]
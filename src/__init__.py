@@ -1,3 +1,82 @@
-from .get_function_calling_schema import get_function_calling_schema
+from .argument_validation import (
+    ArgumentValidationError,
+    get_argument_validator,
+    validate_arguments,
+)
+from .async_api import ToolTimeoutError, get_function_calling_schemas_async
+from .class_schemas import (
+    get_class_function_calling_schemas,
+    invalidate_class_schemas,
+)
+from .compaction import CompactionResult, compact_function_calling_schemas
+from .disk_cache import DiskSchemaCache
+from .function_spec import FunctionSpec, get_function_spec
+from .get_function_calling_schema import (
+    disable_disk_cache,
+    enable_disk_cache,
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+    invalidate_schema_cache,
+    schema_cache_info,
+)
+from .get_function_calling_schemas import (
+    get_function_calling_schemas,
+    get_tools_json,
+)
+from .instrumentation import MetricsCollector, collect_metrics
+from .parallel_execution import ParallelToolExecutor, ToolCallResult
+from .renderers import render_tool, render_tools
+from .result_cache import CachePolicy, ToolResultCache
+from .schema_store import SchemaStore, warmup
+from .static_schema import (
+    get_function_calling_schemas_from_directory,
+    get_static_function_calling_schemas,
+)
+from .streaming import StreamingArgumentsParser
+from .tool_decorator import get_tool_schema, tool
+from .tool_index import ToolIndex
+from .tool_registry import ToolCallError, ToolRegistry
+from .tool_set import ToolSet, build_tool_set
 
-__all__ = ["get_function_calling_schema"]
+__all__ = [
+    "ArgumentValidationError",
+    "CachePolicy",
+    "CompactionResult",
+    "DiskSchemaCache",
+    "FunctionSpec",
+    "MetricsCollector",
+    "ParallelToolExecutor",
+    "SchemaStore",
+    "StreamingArgumentsParser",
+    "ToolCallError",
+    "ToolCallResult",
+    "ToolIndex",
+    "ToolRegistry",
+    "ToolResultCache",
+    "ToolSet",
+    "ToolTimeoutError",
+    "build_tool_set",
+    "collect_metrics",
+    "compact_function_calling_schemas",
+    "disable_disk_cache",
+    "enable_disk_cache",
+    "get_argument_validator",
+    "get_class_function_calling_schemas",
+    "get_function_calling_schema",
+    "get_function_calling_schema_bytes",
+    "get_function_calling_schemas",
+    "get_function_calling_schemas_async",
+    "get_function_calling_schemas_from_directory",
+    "get_function_spec",
+    "get_static_function_calling_schemas",
+    "get_tool_schema",
+    "get_tools_json",
+    "invalidate_class_schemas",
+    "invalidate_schema_cache",
+    "render_tool",
+    "render_tools",
+    "schema_cache_info",
+    "tool",
+    "validate_arguments",
+    "warmup",
+]
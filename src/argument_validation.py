@@ -0,0 +1,329 @@
+import json
+import threading
+import typing
+import weakref
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from .get_function_calling_schema import get_function_calling_schema
+from .introspection import get_annotations
+from .schema_cache import get_cache_target, get_function_fingerprint
+
+Arguments = Union[str, bytes, Mapping[str, Any]]
+ArgumentValidator = Callable[[Arguments], Dict[str, Any]]
+
+
+class ArgumentValidationError(ValueError):
+    pass
+
+
+# JSON types are checked by exact class, so that `True` is not accepted as a
+#  number and `1` is not accepted as a boolean.
+TYPE_CHECKS = {
+    "string": "value.__class__ is not str",
+    "boolean": "value.__class__ is not bool",
+    "array": "value.__class__ is not list",
+    "object": "value.__class__ is not dict",
+    "number": "value.__class__ is not int and value.__class__ is not float",
+}
+
+# The "number" type is mapped back to the annotated Python type.
+NUMBER_COERCIONS = {
+    int: [
+        "if value.__class__ is not int:",
+        "    if value.__class__ is float and value.is_integer():",
+        "        {target} = int(value)",
+        "    else:",
+        "        raise ArgumentValidationError({message})",
+    ],
+    float: [
+        "if value.__class__ is int:",
+        "    {target} = float(value)",
+        "elif value.__class__ is not float:",
+        "    raise ArgumentValidationError({message})",
+    ],
+}
+
+NULL_SCHEMA = {"type": "null"}
+
+ARGUMENT_VALIDATORS: "weakref.WeakKeyDictionary[Callable, Tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+ARGUMENT_VALIDATORS_LOCK = threading.Lock()
+
+
+def compile_argument_validator(
+    schema: Dict[str, Any],
+    annotations: Optional[Mapping[str, Any]] = None,
+) -> ArgumentValidator:
+    # Generates straight-line code for one schema, so that validating a tool
+    #  call never has to walk the schema again.
+    name = schema["name"]
+    properties = schema["parameters"]["properties"]
+    required = schema["parameters"]["required"]
+    annotations = annotations or {}
+
+    namespace: Dict[str, Any] = {
+        "ArgumentValidationError": ArgumentValidationError,
+        "decode": decode_arguments,
+        "PROPERTY_NAMES": frozenset(properties),
+        "REQUIRED": frozenset(required),
+        "NAME": name,
+        "report_keys": report_keys,
+    }
+    lines = [
+        "def validate_arguments(arguments):",
+        "    if arguments.__class__ is dict:",
+        "        result = arguments.copy()",
+        "    else:",
+        "        result = decode(NAME, arguments)",
+        (
+            "    if not result.keys() <= PROPERTY_NAMES"
+            " or not REQUIRED <= result.keys():"
+        ),
+        "        report_keys(NAME, result, PROPERTY_NAMES, REQUIRED)",
+    ]
+    for index, (property_name, property_schema) in enumerate(
+        properties.items()
+    ):
+        checks = compile_property_checks(
+            name,
+            property_name,
+            property_schema,
+            annotations.get(property_name),
+            namespace,
+            enum_variable=f"ENUM_{index}",
+            target=f"result[{property_name!r}]",
+        )
+        if not checks:
+            continue
+        # Required keys were checked above and need no membership test.
+        if property_name in required:
+            lines.append(f"    value = result[{property_name!r}]")
+            lines += [f"    {line}" for line in checks]
+        else:
+            lines += [
+                f"    if {property_name!r} in result:",
+                f"        value = result[{property_name!r}]",
+            ]
+            lines += [f"        {line}" for line in checks]
+    lines.append("    return result")
+
+    exec("\n".join(lines), namespace)
+    validator = namespace["validate_arguments"]
+    validator.__qualname__ = f"validate_{name}_arguments"
+    return validator
+
+
+def compile_property_checks(
+    name: str,
+    property_name: str,
+    property_schema: Dict[str, Any],
+    annotation: Any,
+    namespace: Dict[str, Any],
+    enum_variable: str,
+    target: str = "value",
+) -> List[str]:
+    # Enum values are added to the namespace of the generated code.
+    if "anyOf" in property_schema:
+        return compile_union_checks(
+            name,
+            property_name,
+            property_schema["anyOf"],
+            annotation,
+            namespace,
+            enum_variable,
+            target,
+        )
+
+    json_type = property_schema.get("type")
+    message = repr(
+        f"Argument {property_name!r} of {name} must be of type {json_type}."
+    )
+    lines = []
+    if json_type == "number" and annotation in NUMBER_COERCIONS:
+        lines += [
+            line.format(message=message, target=target)
+            for line in NUMBER_COERCIONS[annotation]
+        ]
+    elif json_type in TYPE_CHECKS:
+        lines += [
+            f"if {TYPE_CHECKS[json_type]}:",
+            f"    raise ArgumentValidationError({message})",
+        ]
+
+    if "enum" in property_schema:
+        namespace[enum_variable] = tuple(property_schema["enum"])
+        enum_message = repr(
+            f"Argument {property_name!r} of {name} must be one of"
+            f" {property_schema['enum']!r}."
+        )
+        lines += [
+            f"if value not in {enum_variable}:",
+            f"    raise ArgumentValidationError({enum_message})",
+        ]
+    return lines
+
+
+def compile_union_checks(
+    name: str,
+    property_name: str,
+    options: List[Dict[str, Any]],
+    annotation: Any,
+    namespace: Dict[str, Any],
+    enum_variable: str,
+    target: str,
+) -> List[str]:
+    # `Optional[X]` is checked like `X` unless the value is None. Any other
+    #  union only checks that the value has the JSON type of one of its
+    #  branches, and is passed through unchecked if a branch is more than
+    #  a plain JSON type, like an enum or a reference.
+    non_null = [option for option in options if option != NULL_SCHEMA]
+    nullable = len(non_null) < len(options)
+    args = [
+        arg for arg in typing.get_args(annotation) if arg is not type(None)
+    ]
+
+    if len(non_null) == 1:
+        checks = compile_property_checks(
+            name,
+            property_name,
+            non_null[0],
+            args[0] if len(args) == 1 else None,
+            namespace,
+            enum_variable,
+            target,
+        )
+        if not nullable or not checks:
+            return checks
+        return ["if value is not None:"] + [f"    {line}" for line in checks]
+
+    if any(
+        option.keys() - {"type", "items"}
+        or option.get("type") not in TYPE_CHECKS
+        for option in non_null
+    ):
+        return []
+    json_types = list(dict.fromkeys(option["type"] for option in non_null))
+    message = repr(
+        f"Argument {property_name!r} of {name} must be of type"
+        f" {' or '.join(json_types + ['null'] * nullable)}."
+    )
+    checks = [
+        TYPE_CHECKS[json_type]
+        for json_type in json_types
+        if json_type != "number"
+    ]
+    if nullable:
+        checks.append("value is not None")
+
+    numbers = [arg for arg in args if arg in NUMBER_COERCIONS]
+    lines = []
+    if "number" in json_types and len(numbers) == 1:
+        # The number is mapped back to the one number type of the union.
+        lines += [
+            "if value.__class__ is int or value.__class__ is float:",
+            *(
+                f"    {line.format(message=message, target=target)}"
+                for line in NUMBER_COERCIONS[numbers[0]]
+            ),
+        ]
+    elif "number" in json_types:
+        checks.append(TYPE_CHECKS["number"])
+    if checks:
+        lines += [
+            f"{'elif' if lines else 'if'} {' and '.join(checks)}:",
+            f"    raise ArgumentValidationError({message})",
+        ]
+    return lines
+
+
+def compile_property_validators(
+    schema: Dict[str, Any],
+    annotations: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Callable[[Any], Any]]:
+    # One function per property, for callers that receive the arguments one
+    #  at a time, e.g. while the model is still streaming them.
+    name = schema["name"]
+    properties = schema["parameters"]["properties"]
+    annotations = annotations or {}
+
+    namespace: Dict[str, Any] = {
+        "ArgumentValidationError": ArgumentValidationError
+    }
+    lines = []
+    for index, (property_name, property_schema) in enumerate(
+        properties.items()
+    ):
+        lines.append(f"def validate_{index}(value):")
+        lines += [
+            f"    {line}"
+            for line in compile_property_checks(
+                name,
+                property_name,
+                property_schema,
+                annotations.get(property_name),
+                namespace,
+                enum_variable=f"ENUM_{index}",
+            )
+        ]
+        lines.append("    return value")
+
+    exec("\n".join(lines), namespace)
+    return {
+        property_name: namespace[f"validate_{index}"]
+        for index, property_name in enumerate(properties)
+    }
+
+
+def decode_arguments(name: str, arguments: Arguments) -> Dict[str, Any]:
+    if isinstance(arguments, (str, bytes, bytearray)):
+        try:
+            arguments = json.loads(arguments)
+        except ValueError as error:
+            raise ArgumentValidationError(
+                f"Arguments of {name} are not valid JSON: {error}"
+            ) from error
+    elif isinstance(arguments, Mapping):
+        arguments = dict(arguments)
+    if not isinstance(arguments, dict):
+        raise ArgumentValidationError(
+            f"Arguments of {name} must be a JSON object."
+        )
+    return arguments
+
+
+def report_keys(
+    name: str,
+    arguments: Dict[str, Any],
+    property_names: frozenset,
+    required: frozenset,
+) -> None:
+    unexpected = sorted(arguments.keys() - property_names)
+    if unexpected:
+        raise ArgumentValidationError(
+            f"Unexpected arguments for {name}: {', '.join(unexpected)}."
+        )
+    missing = sorted(required - arguments.keys())
+    raise ArgumentValidationError(
+        f"Missing required arguments for {name}: {', '.join(missing)}."
+    )
+
+
+def get_argument_validator(func: Callable) -> ArgumentValidator:
+    target = get_cache_target(func)
+    fingerprint = get_function_fingerprint(func)
+    cached = ARGUMENT_VALIDATORS.get(target)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    schema = get_function_calling_schema(func)
+    validator = compile_argument_validator(
+        schema, annotations=get_annotations(func)
+    )
+    with ARGUMENT_VALIDATORS_LOCK:
+        ARGUMENT_VALIDATORS[target] = (fingerprint, validator)
+    return validator
+
+
+def validate_arguments(func: Callable, arguments: Arguments) -> Dict[str, Any]:
+    return get_argument_validator(func)(arguments)
@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .get_function_calling_schemas import (
+    DEFAULT_CHUNK_SIZE,
+    SchemaOrError,
+    generate_schemas,
+    get_function_calling_schemas,
+)
+
+
+class ToolTimeoutError(asyncio.TimeoutError):
+    pass
+
+
+async def get_function_calling_schemas_async(
+    funcs: Iterable[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[SchemaOrError]:
+    # Generation runs in `executor` (the loop's default thread pool when not
+    #  given), so the event loop stays responsive however many functions
+    #  there are. Chunks bound the number of executor jobs.
+    loop = asyncio.get_running_loop()
+    funcs = list(funcs)
+    if isinstance(executor, ProcessPoolExecutor):
+        # The batch API already splits the work between the pool and this
+        #  process and fills our cache; only its waiting is moved off the loop.
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                get_function_calling_schemas,
+                funcs,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+                executor=executor,
+                chunk_size=chunk_size,
+            ),
+        )
+
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor,
+                generate_schemas,
+                funcs[start : start + chunk_size],
+                include_long_description,
+                include_return_in_parameters,
+            )
+            for start in range(0, len(funcs), chunk_size)
+        )
+    )
+    return [schema for chunk in chunks for schema in chunk]
+
+
+def is_async_callable(func: Callable) -> bool:
+    return inspect.iscoroutinefunction(func) or (
+        inspect.iscoroutinefunction(getattr(func, "__call__", None))
+    )
+
+
+async def call_tool_async(
+    func: Callable,
+    arguments: Dict[str, Any],
+    executor: Optional[Executor] = None,
+) -> Any:
+    # Coroutine functions run on the loop; everything else runs in a thread
+    #  so that blocking tools do not stall other requests.
+    if is_async_callable(func):
+        return await func(**arguments)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        executor, functools.partial(func, **arguments)
+    )
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def run_tool_async(
+    func: Callable,
+    arguments: Dict[str, Any],
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> Any:
+    # On timeout or cancellation a coroutine tool is cancelled. A sync tool
+    #  cannot be interrupted: its thread finishes in the background and the
+    #  result is discarded. Timeout errors raised by the tool itself are
+    #  passed on unchanged.
+    if timeout is None:
+        return await call_tool_async(func, arguments, executor=executor)
+    task = asyncio.ensure_future(
+        call_tool_async(func, arguments, executor=executor)
+    )
+    try:
+        return await asyncio.wait_for(task, timeout)
+    except asyncio.TimeoutError as error:
+        if not task.cancelled():
+            raise
+        name = getattr(func, "__name__", repr(func))
+        raise ToolTimeoutError(
+            f"Tool {name} did not finish within {timeout} seconds."
+        ) from error
@@ -0,0 +1,107 @@
+import threading
+import types
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from .get_function_calling_schema import (
+    get_function_calling_schema,
+    get_schema_options,
+)
+from .schema_cache import copy_schema
+
+ClassSchemas = Dict[str, Dict[str, Any]]
+ClassSchemasByOptions = Dict[Hashable, ClassSchemas]
+
+# Schemas of every tool method of a class, per set of options. Entries hold
+#  no reference to the class, and are shared by all of its instances.
+CLASS_SCHEMAS: "weakref.WeakKeyDictionary[type, ClassSchemasByOptions]" = (
+    weakref.WeakKeyDictionary()
+)
+_CLASS_SCHEMAS_LOCK = threading.Lock()
+
+
+def iter_tool_methods(
+    cls: type,
+    include_private: bool = False,
+) -> Iterator[Tuple[str, Callable]]:
+    # Yields the name and a callable for every public method of `cls`,
+    #  inherited ones included, in the order of the MRO. Instance and class
+    #  methods are bound to the class so that their first parameter is left
+    #  out of the schema like on a bound method. Methods without a docstring
+    #  are helpers rather than tools, and are skipped.
+    seen = set()
+    for base in cls.__mro__:
+        if base is object:
+            continue
+        for name, attribute in vars(base).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            if name.startswith("__") or (
+                name.startswith("_") and not include_private
+            ):
+                continue
+            if isinstance(attribute, staticmethod):
+                func = attribute.__func__
+                method: Callable = func
+            elif isinstance(attribute, classmethod):
+                func = attribute.__func__
+                method = types.MethodType(func, cls)
+            elif isinstance(attribute, types.FunctionType):
+                func = attribute
+                method = types.MethodType(func, cls)
+            else:
+                continue
+            if func.__doc__ is None or getattr(
+                func, "__isabstractmethod__", False
+            ):
+                continue
+            yield name, method
+
+
+def get_class_function_calling_schemas(
+    cls_or_instance: Any,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    include_private: bool = False,
+) -> ClassSchemas:
+    # Maps method names to schemas. They are generated once per class and
+    #  options, so instances only pay for a lookup and a copy. Use
+    #  `invalidate_class_schemas` after changing the methods of a class.
+    cls = (
+        cls_or_instance
+        if isinstance(cls_or_instance, type)
+        else type(cls_or_instance)
+    )
+    options = get_schema_options(
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+    ) + (include_private,)
+    schemas = CLASS_SCHEMAS.get(cls, {}).get(options)
+    if schemas is None:
+        schemas = {}
+        for name, method in iter_tool_methods(
+            cls, include_private=include_private
+        ):
+            schema = get_function_calling_schema(
+                method,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+            )
+            # Aliases are called by the name they are reached through.
+            schema["name"] = name
+            schemas[name] = schema
+        with _CLASS_SCHEMAS_LOCK:
+            CLASS_SCHEMAS.setdefault(cls, {})[options] = schemas
+    return copy_schema(schemas)
+
+
+def invalidate_class_schemas(cls: Optional[type] = None) -> None:
+    with _CLASS_SCHEMAS_LOCK:
+        if cls is None:
+            CLASS_SCHEMAS.clear()
+        else:
+            # Subclasses inherit the methods of `cls`.
+            for cached_cls in list(CLASS_SCHEMAS):
+                if issubclass(cached_cls, cls):
+                    del CLASS_SCHEMAS[cached_cls]
@@ -0,0 +1,211 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from .get_function_calling_schema import (
+    DESCRIPTION_SEPARATOR,
+    get_function_calling_schema,
+)
+from .schema_cache import copy_schema
+from .serialization import dumps_canonical, dumps_json
+from .type_conversion import DEFS_KEY, REF_PREFIX
+
+# BPE tokenizers split English into roughly one token per short word or word
+#  piece, and one per punctuation mark; this is close enough to budget with.
+TOKEN_PATTERN = re.compile(rb"[A-Za-z]{1,8}|[0-9]{1,3}|[^\sA-Za-z0-9]")
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+MAX_PARAMETER_DESCRIPTION_LENGTH = 80
+
+COMPACTION_CACHE_SIZE = 128
+
+
+class CompactionResult(NamedTuple):
+    schemas: List[Dict[str, Any]]
+    tokens_before: int
+    tokens_after: int
+    budget: int
+    stages: List[str]
+
+    @property
+    def within_budget(self) -> bool:
+        return self.tokens_after <= self.budget
+
+
+def estimate_tokens(schema: Any) -> int:
+    return len(TOKEN_PATTERN.findall(dumps_canonical(schema)))
+
+
+def drop_long_descriptions(schema: Dict[str, Any]) -> None:
+    description = schema.get("description")
+    if description:
+        schema["description"] = description.split(DESCRIPTION_SEPARATOR)[0]
+
+
+def truncate_parameter_descriptions(schema: Dict[str, Any]) -> None:
+    for property_schema in schema["parameters"]["properties"].values():
+        description = property_schema.get("description")
+        if description:
+            property_schema["description"] = truncate_description(description)
+
+
+def drop_optional_parameters(schema: Dict[str, Any]) -> None:
+    parameters = schema["parameters"]
+    required = set(parameters["required"])
+    parameters["properties"] = {
+        name: property_schema
+        for name, property_schema in parameters["properties"].items()
+        if name in required
+    }
+    if DEFS_KEY in parameters:
+        prune_defs(parameters)
+
+
+def drop_string_types(schema: Dict[str, Any]) -> None:
+    # A missing type is read as a string by the models, so the most common
+    #  type can go without changing what the schema asks for.
+    for property_schema in schema["parameters"]["properties"].values():
+        remove_string_types(property_schema)
+    for definition in schema["parameters"].get(DEFS_KEY, {}).values():
+        remove_string_types(definition)
+
+
+# Applied in order, each to every schema, until the tool list fits.
+COMPACTION_STAGES: List[Callable[[Dict[str, Any]], None]] = [
+    drop_long_descriptions,
+    truncate_parameter_descriptions,
+    drop_optional_parameters,
+    drop_string_types,
+]
+
+
+def truncate_description(description: str) -> str:
+    description = SENTENCE_END.split(description.strip(), maxsplit=1)[0]
+    if len(description) <= MAX_PARAMETER_DESCRIPTION_LENGTH:
+        return description
+    truncated = description[:MAX_PARAMETER_DESCRIPTION_LENGTH]
+    return truncated.rsplit(" ", 1)[0] if " " in truncated else truncated
+
+
+def remove_string_types(schema: Any) -> None:
+    if isinstance(schema, dict):
+        if schema.get("type") == "string":
+            del schema["type"]
+        for value in schema.values():
+            remove_string_types(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            remove_string_types(value)
+
+
+def prune_defs(parameters: Dict[str, Any]) -> None:
+    # Keeps the definitions still reachable from the remaining properties.
+    defs = parameters[DEFS_KEY]
+    reachable: Dict[str, Any] = {}
+    pending = [parameters["properties"]]
+    while pending:
+        text = dumps_canonical(pending.pop()).decode("utf-8")
+        for name, definition in defs.items():
+            if name not in reachable and f'"{REF_PREFIX}{name}"' in text:
+                reachable[name] = definition
+                pending.append(definition)
+    if reachable:
+        parameters[DEFS_KEY] = {
+            name: definition
+            for name, definition in defs.items()
+            if name in reachable
+        }
+    else:
+        del parameters[DEFS_KEY]
+
+
+def compact_schemas(
+    schemas: Sequence[Dict[str, Any]],
+    budget: int,
+) -> CompactionResult:
+    compacted: List[Dict[str, Any]] = copy_schema(list(schemas))
+    tokens_before = tokens = sum(
+        estimate_tokens(schema) for schema in compacted
+    )
+    stages: List[str] = []
+    for stage in COMPACTION_STAGES:
+        if tokens <= budget:
+            break
+        for schema in compacted:
+            stage(schema)
+        stages.append(stage.__name__)
+        tokens = sum(estimate_tokens(schema) for schema in compacted)
+    return CompactionResult(
+        schemas=compacted,
+        tokens_before=tokens_before,
+        tokens_after=tokens,
+        budget=budget,
+        stages=stages,
+    )
+
+
+class CompactionCache:
+    def __init__(self, maxsize: int = COMPACTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._results: "OrderedDict[Hashable, CompactionResult]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CompactionResult]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: CompactionResult) -> None:
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+
+COMPACTION_CACHE = CompactionCache()
+
+
+def compact_function_calling_schemas(
+    funcs: Iterable[Callable],
+    budget: int,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> CompactionResult:
+    # Results are cached per budget and keyed on the content of the schemas,
+    #  which come from the schema cache. The key thus holds no references
+    #  to the functions, and a function cannot be mistaken for a later one
+    #  that happens to reuse its id.
+    schemas = [
+        get_function_calling_schema(
+            func,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        )
+        for func in funcs
+    ]
+    key = (budget, dumps_json(schemas))
+    result = COMPACTION_CACHE.get(key)
+    if result is None:
+        result = compact_schemas(schemas, budget)
+        COMPACTION_CACHE.put(key, result)
+    return result._replace(schemas=copy_schema(result.schemas))
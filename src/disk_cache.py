@@ -0,0 +1,222 @@
+import enum
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+import typing
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Set
+
+from .introspection import get_annotations, get_parameter_has_default
+from .schema_cache import get_cache_target
+from .serialization import dumps_json, loads_json
+
+# Part of every key, so that schemas written by an older version of the
+#  generator are never read back.
+DISK_CACHE_VERSION = 2
+
+DEFAULT_DISK_CACHE_SIZE = 64 * 1024 * 1024
+DISK_CACHE_DIRECTORY_VARIABLE = "OPENAI_FUNC_PARSER_CACHE_DIR"
+ENTRY_SUFFIX = ".json"
+
+# Eviction scans the whole directory, so it only runs after this fraction of
+#  the size limit has been written since the last scan.
+EVICTION_INTERVAL = 0.1
+
+
+def get_default_cache_directory() -> str:
+    directory = os.environ.get(DISK_CACHE_DIRECTORY_VARIABLE)
+    if directory:
+        return directory
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "openai-func-parser")
+
+
+def get_annotation_key(
+    annotation: Any, seen: Optional[Set[int]] = None
+) -> str:
+    # Classes are represented by their name only, so the fields of
+    #  dataclasses and TypedDicts and the members of enums are added to the
+    #  key as well; otherwise editing them would not invalidate the entry.
+    seen = set() if seen is None else seen
+    if id(annotation) in seen:
+        return repr(annotation)
+    seen.add(id(annotation))
+    parts = [repr(annotation)]
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        parts += [repr(member.value) for member in annotation]
+    elif isinstance(annotation, type):
+        parts += [
+            f"{name}={get_annotation_key(field, seen)}"
+            for name, field in get_field_annotations(annotation).items()
+        ]
+    parts += [
+        get_annotation_key(arg, seen)
+        for arg in getattr(annotation, "__args__", ())
+    ]
+    return ",".join(parts)
+
+
+def get_field_annotations(cls: type) -> Dict[str, Any]:
+    # Postponed field annotations are resolved, so that the key changes with
+    #  the types they name and not only with their spelling.
+    try:
+        return typing.get_type_hints(cls, include_extras=True)
+    except (AttributeError, NameError, TypeError):
+        return dict(getattr(cls, "__annotations__", {}))
+
+
+def compute_cache_key(func: Callable, options: Hashable) -> str:
+    # Everything the generated schema depends on: where the function lives,
+    #  its docstring, annotations and which parameters have defaults, and
+    #  the generation options.
+    target = get_cache_target(func)
+    code = getattr(target, "__code__", None)
+    annotations = get_annotations(func)
+    digest = hashlib.sha256()
+    for part in [
+        str(DISK_CACHE_VERSION),
+        getattr(code, "co_filename", "") or "",
+        getattr(target, "__module__", "") or "",
+        getattr(target, "__qualname__", "") or "",
+        func.__doc__ or "",
+        ";".join(
+            f"{name}:{get_annotation_key(annotation)}"
+            for name, annotation in annotations.items()
+        ),
+        repr(sorted(get_parameter_has_default(func).items())),
+        repr(options),
+        repr(inspect.ismethod(func)),
+    ]:
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskSchemaCache:
+    # One JSON file per entry, spread over 256 subdirectories like git
+    #  objects. Entries are written to a temporary file and renamed into
+    #  place, so concurrent readers in other processes never see a partial
+    #  file, and racing writers of the same key write identical content.
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_size: int = DEFAULT_DISK_CACHE_SIZE,
+    ):
+        self.directory = directory or get_default_cache_directory()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._written_since_eviction = max_size
+        self._lock = threading.Lock()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:] + ENTRY_SUFFIX)
+
+    def get(
+        self, func: Callable, options: Hashable
+    ) -> Optional[Dict[str, Any]]:
+        path = self.get_path(compute_cache_key(func, options))
+        try:
+            with open(path, "rb") as file:
+                schema = loads_json(file.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # Unreadable or corrupt entries are dropped and regenerated.
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return schema
+
+    def put(
+        self, func: Callable, options: Hashable, schema: Dict[str, Any]
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        path = self.get_path(compute_cache_key(func, options))
+        # Keys keep their order, so that a schema read back is the one that
+        #  was generated.
+        data = dumps_json(schema)
+        temporary_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix=".tmp"
+            )
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+        except OSError:
+            # A read-only or full disk only costs us the cache.
+            if temporary_path is not None:
+                self._remove(temporary_path)
+            return
+
+        with self._lock:
+            self._written_since_eviction += len(data)
+            evict = (
+                self._written_since_eviction
+                >= self.max_size * EVICTION_INTERVAL
+            )
+            if evict:
+                self._written_since_eviction = 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        # Removes the least recently written entries until the cache fits in
+        #  `max_size`. Entries removed by another process are skipped.
+        entries = []
+        total_size = 0
+        for path in self._iter_entry_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def clear(self) -> None:
+        for path in self._iter_entry_paths():
+            self._remove(path)
+
+    def size(self) -> int:
+        total_size = 0
+        for path in self._iter_entry_paths():
+            try:
+                total_size += os.stat(path).st_size
+            except FileNotFoundError:
+                continue
+        return total_size
+
+    def _iter_entry_paths(self) -> Iterator[str]:
+        try:
+            subdirectories = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for subdirectory in subdirectories:
+            subdirectory_path = os.path.join(self.directory, subdirectory)
+            try:
+                names = os.listdir(subdirectory_path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for name in names:
+                if name.endswith(ENTRY_SUFFIX):
+                    yield os.path.join(subdirectory_path, name)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,454 @@
+import inspect
+import re
+from typing import Callable, Dict, List, Optional, Union
+
+from docstring_parser import (
+    Docstring,
+    DocstringParam,
+    DocstringReturns,
+    DocstringStyle,
+    ParseError,
+    parse,
+)
+from docstring_parser.common import (
+    PARAM_KEYWORDS,
+    RAISES_KEYWORDS,
+    RETURNS_KEYWORDS,
+    YIELDS_KEYWORDS,
+)
+from docstring_parser.google import (
+    GOOGLE_TYPED_ARG_REGEX,
+    MULTIPLE_PATTERN,
+    GoogleParser,
+    SectionType,
+)
+from docstring_parser.numpydoc import (
+    KV_REGEX,
+    PARAM_DEFAULT_REGEX,
+    PARAM_KEY_REGEX,
+    PARAM_OPTIONAL_REGEX,
+    RETURN_KEY_REGEX,
+    NumpydocParser,
+    ParamSection,
+    ReturnsSection,
+    YieldsSection,
+)
+
+# Detect the docstring style once per module and reuse it for every other
+#  function in that module, instead of letting `docstring_parser` try (and
+#  rank) all of its styles on every single docstring.
+MODULE_STYLE = "module"
+
+DocstringStyleOption = Union[DocstringStyle, str]
+
+MODULE_DOCSTRING_STYLES: Dict[str, DocstringStyle] = {}
+
+NUMPYDOC_STYLE_REGEX = re.compile(
+    r"^\s*(Parameters|Params|Arguments|Args|Returns|Return|Yields|Yield"
+    r"|Raises|Attributes)\s*\n\s*-{3,}\s*$",
+    flags=re.M,
+)
+GOOGLE_STYLE_REGEX = re.compile(
+    r"^\s*(Arguments|Args|Parameters|Params|Returns|Yields|Raises"
+    r"|Attributes):\s*$",
+    flags=re.M,
+)
+REST_STYLE_REGEX = re.compile(
+    r"^\s*:(param|parameter|arg|argument|key|keyword|type|returns?|rtype"
+    r"|raises?)\b",
+    flags=re.M,
+)
+EPYDOC_STYLE_REGEX = re.compile(r"^\s*@(param|type|return|rtype)\b", re.M)
+
+REST_META_REGEX = re.compile("^:", flags=re.M)
+REST_CHUNK_REGEX = re.compile(r"(^:.*?)(?=^:|\Z)", flags=re.S | re.M)
+
+GOOGLE_PARSER = GoogleParser()
+NUMPYDOC_PARSER = NumpydocParser()
+
+
+def parse_docstring(
+    text: str,
+    style: DocstringStyleOption = DocstringStyle.AUTO,
+    module_name: Optional[str] = None,
+    fast: bool = False,
+) -> Docstring:
+    detected = style in (DocstringStyle.AUTO, MODULE_STYLE)
+    if isinstance(style, DocstringStyle):
+        docstring_style = style
+    elif style == MODULE_STYLE:
+        docstring_style = get_module_docstring_style(module_name, text)
+    else:
+        raise ValueError(f"Unknown docstring style {style}.")
+    if not fast:
+        return parse(text, docstring_style)
+
+    if docstring_style == DocstringStyle.AUTO:
+        docstring_style = detect_docstring_style(text) or DocstringStyle.REST
+    fast_parser = FAST_PARSERS.get(docstring_style)
+    try:
+        if fast_parser is not None:
+            return fast_parser(text)
+    except ParseError:
+        # `docstring_parser` would have fallen back to another style here,
+        #  so we let it do exactly that.
+        if not detected:
+            raise
+        return parse(text)
+    return parse(text, docstring_style)
+
+
+def detect_docstring_style(text: str) -> Optional[DocstringStyle]:
+    for style, style_regex in [
+        (DocstringStyle.NUMPYDOC, NUMPYDOC_STYLE_REGEX),
+        (DocstringStyle.GOOGLE, GOOGLE_STYLE_REGEX),
+        (DocstringStyle.REST, REST_STYLE_REGEX),
+        (DocstringStyle.EPYDOC, EPYDOC_STYLE_REGEX),
+    ]:
+        if style_regex.search(text):
+            return style
+    return None
+
+
+def get_module_docstring_style(
+    module_name: Optional[str],
+    text: str,
+) -> DocstringStyle:
+    style = MODULE_DOCSTRING_STYLES.get(module_name or "")
+    if style is not None:
+        return style
+
+    # Docstrings without any sections say nothing about the style of their
+    #  module, so the decision is postponed until one that does shows up.
+    style = detect_docstring_style(text)
+    if style is None:
+        return DocstringStyle.AUTO
+    if module_name is not None:
+        MODULE_DOCSTRING_STYLES[module_name] = style
+    return style
+
+
+def clear_module_docstring_styles() -> None:
+    MODULE_DOCSTRING_STYLES.clear()
+
+
+def set_descriptions(docstring: Docstring, description_chunk: str) -> None:
+    parts = description_chunk.split("\n", 1)
+    docstring.short_description = parts[0] or None
+    if len(parts) > 1:
+        long_description_chunk = parts[1] or ""
+        docstring.blank_after_short_description = (
+            long_description_chunk.startswith("\n")
+        )
+        docstring.blank_after_long_description = (
+            long_description_chunk.endswith("\n\n")
+        )
+        docstring.long_description = long_description_chunk.strip() or None
+
+
+def clean_description(description: str) -> str:
+    if "\n" in description:
+        first_line, rest = description.split("\n", 1)
+        description = first_line + "\n" + inspect.cleandoc(rest)
+    return description
+
+
+# The fast parsers below only build the parts of a docstring we consume, i.e.
+#  the descriptions, the parameters and the returns. They follow the rules of
+#  the corresponding `docstring_parser` styles, including the cases where
+#  those raise `ParseError`, so that the results are identical.
+
+
+def fast_parse_rest(text: str) -> Docstring:
+    docstring = Docstring(style=DocstringStyle.REST)
+    if not text:
+        return docstring
+
+    text = inspect.cleandoc(text)
+    match = REST_META_REGEX.search(text)
+    if match:
+        set_descriptions(docstring, text[: match.start()])
+        meta_chunk = text[match.start() :]
+    else:
+        set_descriptions(docstring, text)
+        meta_chunk = ""
+
+    types: Dict[str, str] = {}
+    return_types: Dict[Optional[str], str] = {}
+    for match in REST_CHUNK_REGEX.finditer(meta_chunk):
+        chunk = match.group(0)
+        if not chunk:
+            continue
+        try:
+            args_chunk, description = chunk.lstrip(":").split(":", 1)
+        except ValueError as error:
+            raise ParseError(
+                f'Error parsing meta information near "{chunk}".'
+            ) from error
+        args = args_chunk.split()
+        description = clean_description(description.strip())
+        if not args:
+            raise ParseError(f'Missing keyword near "{chunk}".')
+
+        if len(args) == 2 and args[0] == "type":
+            types[args[1]] = description
+        elif len(args) in [1, 2] and args[0] == "rtype":
+            return_types[None if len(args) == 1 else args[1]] = description
+        elif args[0] in PARAM_KEYWORDS:
+            docstring.meta.append(build_rest_param(args, description))
+        elif args[0] in RETURNS_KEYWORDS | YIELDS_KEYWORDS | RAISES_KEYWORDS:
+            if len(args) > 2:
+                raise ParseError(
+                    f"Expected one or no arguments for a {args[0]} keyword."
+                )
+            if args[0] not in RAISES_KEYWORDS:
+                docstring.meta.append(
+                    DocstringReturns(
+                        args=args,
+                        description=description,
+                        type_name=args[1] if len(args) == 2 else None,
+                        is_generator=args[0] in YIELDS_KEYWORDS,
+                    )
+                )
+
+    for meta in docstring.meta:
+        if isinstance(meta, DocstringParam):
+            meta.type_name = meta.type_name or types.get(meta.arg_name)
+        elif isinstance(meta, DocstringReturns):
+            meta.type_name = meta.type_name or return_types.get(
+                meta.return_name
+            )
+    if docstring.returns is None:
+        for return_name, type_name in return_types.items():
+            docstring.meta.append(
+                DocstringReturns(
+                    args=[],
+                    type_name=type_name,
+                    description=None,
+                    is_generator=False,
+                    return_name=return_name,
+                )
+            )
+    return docstring
+
+
+def build_rest_param(args: List[str], description: str) -> DocstringParam:
+    if len(args) == 3:
+        _, type_name, arg_name = args
+        is_optional = type_name.endswith("?")
+        type_name = type_name[:-1] if is_optional else type_name
+    elif len(args) == 2:
+        _, arg_name = args
+        type_name, is_optional = None, None
+    else:
+        raise ParseError(
+            f"Expected one or two arguments for a {args[0]} keyword."
+        )
+    return DocstringParam(
+        args=args,
+        description=description,
+        arg_name=arg_name,
+        type_name=type_name,
+        is_optional=is_optional,
+        default=None,
+    )
+
+
+def fast_parse_google(text: str) -> Docstring:
+    docstring = Docstring(style=DocstringStyle.GOOGLE)
+    if not text:
+        return docstring
+
+    text = inspect.cleandoc(text)
+    titles_regex = GOOGLE_PARSER.titles_re
+    match = titles_regex.search(text)
+    if match:
+        set_descriptions(docstring, text[: match.start()])
+        meta_chunk = text[match.start() :]
+    else:
+        set_descriptions(docstring, text)
+        return docstring
+
+    matches = list(titles_regex.finditer(meta_chunk))
+    chunks: Dict[str, str] = {}
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        end = next_match.start() if next_match else len(meta_chunk)
+        meta_details = meta_chunk[match.end() : end]
+        unknown_meta = re.search(r"\n\S", meta_details)
+        if unknown_meta is not None:
+            meta_details = meta_details[: unknown_meta.start()]
+        chunks[match.group(1)] = meta_details.strip("\n")
+
+    for title, chunk in chunks.items():
+        section = GOOGLE_PARSER.sections[title]
+        if section.type != SectionType.MULTIPLE:
+            if section.key in RETURNS_KEYWORDS | YIELDS_KEYWORDS:
+                docstring.meta.append(
+                    build_google_returns(section.key, inspect.cleandoc(chunk))
+                )
+            continue
+
+        indent = re.search(r"^\s*", chunk).group()  # type: ignore
+        item_matches = list(
+            re.finditer("^" + indent + r"(?=\S)", chunk, flags=re.M)
+        )
+        if not item_matches:
+            raise ParseError(f'No specification for "{title}": "{chunk}"')
+        for item_match, next_item_match in zip(
+            item_matches, item_matches[1:] + [None]
+        ):
+            end = next_item_match.start() if next_item_match else len(chunk)
+            item = chunk[item_match.end() : end].strip("\n")
+            before, description = split_google_item(item)
+            if section.key in PARAM_KEYWORDS:
+                docstring.meta.append(
+                    build_google_param(section.key, before, description)
+                )
+    return docstring
+
+
+def split_google_item(item: str) -> List[str]:
+    if ":" not in item:
+        raise ParseError(f"Expected a colon in {item!r}.")
+    before, description = item.split(":", 1)
+    if before and "\n" in before:
+        first_line, rest = before.split("\n", 1)
+        before = first_line + inspect.cleandoc(rest)
+    if description:
+        if description[0] == " ":
+            description = description[1:]
+        description = clean_description(description).strip("\n")
+    return [before, description]
+
+
+def build_google_param(
+    key: str,
+    before: str,
+    description: str,
+) -> DocstringParam:
+    match = GOOGLE_TYPED_ARG_REGEX.match(before)
+    if match:
+        arg_name, type_name = match.group(1, 2)
+        if type_name.endswith(", optional"):
+            is_optional, type_name = True, type_name[:-10]
+        elif type_name.endswith("?"):
+            is_optional, type_name = True, type_name[:-1]
+        else:
+            is_optional = False
+    else:
+        arg_name, type_name, is_optional = before, None, None
+    return DocstringParam(
+        args=[key, before],
+        description=description,
+        arg_name=arg_name,
+        type_name=type_name,
+        is_optional=is_optional,
+        default=None,
+    )
+
+
+def build_google_returns(key: str, item: str) -> DocstringReturns:
+    if MULTIPLE_PATTERN.match(item):
+        type_name, description = split_google_item(item)
+        args = [key, type_name]
+    else:
+        type_name, description = None, item
+        args = [key]
+    return DocstringReturns(
+        args=args,
+        description=description,
+        type_name=type_name,
+        is_generator=key in YIELDS_KEYWORDS,
+    )
+
+
+def fast_parse_numpydoc(text: str) -> Docstring:
+    docstring = Docstring(style=DocstringStyle.NUMPYDOC)
+    if not text:
+        return docstring
+
+    text = inspect.cleandoc(text)
+    titles_regex = NUMPYDOC_PARSER.titles_re
+    match = titles_regex.search(text)
+    if match:
+        set_descriptions(docstring, text[: match.start()])
+        meta_chunk = text[match.start() :]
+    else:
+        set_descriptions(docstring, text)
+        return docstring
+
+    matches = list(titles_regex.finditer(meta_chunk))
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        title = next(group for group in match.groups() if group is not None)
+        section = NUMPYDOC_PARSER.sections[title]
+        if isinstance(section, ParamSection):
+            build_item: Callable = build_numpydoc_param
+        elif isinstance(section, ReturnsSection):
+            build_item = build_numpydoc_returns
+        else:
+            continue
+
+        end = next_match.start() if next_match else None
+        section_chunk = meta_chunk[match.end() : end]
+        items = list(KV_REGEX.finditer(section_chunk))
+        for item, next_item in zip(items, items[1:] + [None]):
+            item_end = next_item.start() if next_item else None
+            value = inspect.cleandoc(section_chunk[item.end() : item_end])
+            docstring.meta.append(build_item(section, item.group(), value))
+    return docstring
+
+
+def build_numpydoc_param(
+    section: ParamSection,
+    key: str,
+    value: str,
+) -> DocstringParam:
+    # The key pattern matches any line, the name is at worst the whole key.
+    match = PARAM_KEY_REGEX.match(key)
+    arg_name = key
+    type_name: Optional[str] = None
+    is_optional: Optional[bool] = None
+    if match is not None:
+        arg_name, type_name = match.group("name", "type")
+        if type_name is not None:
+            optional_match = PARAM_OPTIONAL_REGEX.match(type_name)
+            is_optional = optional_match is not None
+            if optional_match is not None:
+                type_name = optional_match.group("type")
+            default_match = PARAM_DEFAULT_REGEX.match(type_name)
+            if default_match is not None:
+                is_optional = True
+                type_name = default_match.group("type")
+    return DocstringParam(
+        args=[section.key, arg_name],
+        description=value.strip() or None,
+        arg_name=arg_name,
+        type_name=type_name,
+        is_optional=is_optional,
+        default=None,
+    )
+
+
+def build_numpydoc_returns(
+    section: ReturnsSection,
+    key: str,
+    value: str,
+) -> DocstringReturns:
+    match = RETURN_KEY_REGEX.match(key)
+    return_name, type_name = (
+        match.group("name", "type") if match is not None else (None, None)
+    )
+    return DocstringReturns(
+        args=[section.key],
+        description=value.strip() or None,
+        type_name=type_name,
+        is_generator=isinstance(section, YieldsSection),
+        return_name=return_name,
+    )
+
+
+FAST_PARSERS: Dict[DocstringStyle, Callable[[str], Docstring]] = {
+    DocstringStyle.REST: fast_parse_rest,
+    DocstringStyle.GOOGLE: fast_parse_google,
+    DocstringStyle.NUMPYDOC: fast_parse_numpydoc,
+}
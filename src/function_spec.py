@@ -0,0 +1,323 @@
+import inspect
+import sys
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .docstring_parsing import parse_docstring
+from .get_function_calling_schema import (
+    DESCRIPTION_SEPARATOR,
+    FunctionDescriptionError,
+    create_property,
+)
+from .introspection import get_annotations, get_parameter_has_default
+from .schema_cache import (
+    copy_schema,
+    get_cache_target,
+    get_function_fingerprint,
+)
+from .serialization import dumps_canonical
+from .type_conversion import DEFS_KEY
+
+
+class FrozenSpec:
+    # Base of the spec classes: fixed slots, set once in `__init__`.
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, *values: Any):
+        for slot, value in zip(self.__slots__, values):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot)
+            for slot in self.__slots__
+        )
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{slot.lstrip('_')}={getattr(self, slot)!r}"
+            for slot in self.__slots__
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class ParamSpec(FrozenSpec):
+    # Most parameters are a bare JSON type, which is kept as an interned
+    #  tag instead of a dict of its own; only other types keep their schema.
+    __slots__ = ("name", "type", "description", "required", "_schema")
+
+    name: str
+    type: Optional[str]
+    description: Optional[str]
+    required: bool
+    _schema: Optional[Dict[str, Any]]
+
+    def __init__(
+        self,
+        name: str,
+        schema: Dict[str, Any],
+        description: Optional[str],
+        required: bool,
+    ):
+        json_type = schema.get("type")
+        if isinstance(json_type, str):
+            json_type = sys.intern(json_type)
+        super().__init__(
+            sys.intern(name),
+            json_type,
+            description,
+            required,
+            None if schema.keys() == {"type"} else schema,
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        # The JSON schema of the parameter type, without its description.
+        if self._schema is None:
+            return {"type": self.type}
+        return self._schema
+
+
+class ReturnSpec(FrozenSpec):
+    # Kept unconverted, as the return type is only rendered on request and
+    #  must not fail the functions that never include it.
+    __slots__ = ("type_name", "annotation", "description")
+
+    type_name: Optional[str]
+    annotation: Any
+    description: Optional[str]
+
+    def __init__(
+        self,
+        type_name: Optional[str],
+        annotation: Any,
+        description: Optional[str],
+    ):
+        super().__init__(type_name, annotation, description)
+
+
+class FunctionSpec(FrozenSpec):
+    # Everything the provider formats are rendered from, so a function's
+    #  docstring and signature are read once however many formats are
+    #  served. Much smaller than the schema dict, which is only built by
+    #  `to_dict` or `to_json` when the tool is sent. Specs are shared and
+    #  their `defs` must not be mutated.
+    __slots__ = (
+        "name",
+        "short_description",
+        "long_description",
+        "parameters",
+        "defs",
+        "returns",
+    )
+
+    name: str
+    short_description: Optional[str]
+    long_description: Optional[str]
+    parameters: Tuple[ParamSpec, ...]
+    defs: Dict[str, Dict[str, Any]]
+    returns: Optional[ReturnSpec]
+
+    def __init__(
+        self,
+        name: str,
+        short_description: Optional[str],
+        long_description: Optional[str],
+        parameters: Tuple[ParamSpec, ...],
+        defs: Dict[str, Dict[str, Any]],
+        returns: Optional[ReturnSpec],
+    ):
+        super().__init__(
+            sys.intern(name),
+            short_description,
+            long_description,
+            parameters,
+            defs or EMPTY_DEFS,
+            returns,
+        )
+
+    def to_dict(
+        self,
+        include_long_description: bool = False,
+        include_return_in_parameters: bool = False,
+    ) -> Dict[str, Any]:
+        # The schema `get_function_calling_schema` returns for the function.
+        return render_openai(
+            self,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        )
+
+    def to_json(
+        self,
+        include_long_description: bool = False,
+        include_return_in_parameters: bool = False,
+    ) -> bytes:
+        return dumps_canonical(
+            self.to_dict(
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+            )
+        )
+
+
+# Shared by the specs of every function without named types.
+EMPTY_DEFS: Dict[str, Dict[str, Any]] = {}
+
+
+def render_description(
+    spec: FunctionSpec,
+    include_long_description: bool,
+) -> str:
+    description = spec.short_description
+    if include_long_description:
+        if spec.long_description:
+            description = DESCRIPTION_SEPARATOR.join(
+                [description or "", spec.long_description]
+            )
+        else:
+            description = None
+    if not description:
+        raise FunctionDescriptionError(
+            f"Failed to create a description for function {spec.name},"
+            " either due to empty description or missing long description."
+        )
+    return description
+
+
+def render_parameters(
+    spec: FunctionSpec,
+    include_return_in_parameters: bool,
+) -> Dict[str, Any]:
+    # The `parameters` object of `get_function_calling_schema`.
+    properties = {
+        param.name: {
+            **copy_schema(param.schema),
+            "description": param.description,
+        }
+        for param in spec.parameters
+    }
+    required = [param.name for param in spec.parameters if param.required]
+    defs = dict(spec.defs)
+    if include_return_in_parameters:
+        if spec.returns is None:
+            raise FunctionDescriptionError(
+                f"Function {spec.name} has no return description."
+            )
+        properties["return"] = create_property(
+            spec.name,
+            docstring_type=spec.returns.type_name,
+            annotation=spec.returns.annotation,
+            description=spec.returns.description,
+            defs=defs,
+        )
+        required.append("return")
+
+    parameters = {
+        "type": "object",
+        "properties": properties,
+        "required": required,
+    }
+    if defs:
+        parameters[DEFS_KEY] = copy_schema(defs)
+    return parameters
+
+
+def render_openai(
+    spec: FunctionSpec,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> Dict[str, Any]:
+    # The same schema as `get_function_calling_schema`.
+    return {
+        "name": spec.name,
+        "description": render_description(spec, include_long_description),
+        "parameters": render_parameters(spec, include_return_in_parameters),
+    }
+
+
+FUNCTION_SPECS: "weakref.WeakKeyDictionary[Callable, Tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+FUNCTION_SPECS_LOCK = threading.Lock()
+
+
+def build_function_spec(func: Callable) -> FunctionSpec:
+    name = func.__name__
+    if func.__doc__ is None:
+        raise FunctionDescriptionError(f"Function {name} has no docstring.")
+    parsed_docstring = parse_docstring(
+        func.__doc__, module_name=getattr(func, "__module__", None)
+    )
+    parameter_has_default = get_parameter_has_default(func)
+    annotations = get_annotations(func)
+
+    defs: Dict[str, Dict[str, Any]] = {}
+    parameters = []
+    for param in parsed_docstring.params:
+        param_has_default = parameter_has_default.get(param.arg_name)
+        if param_has_default is None:
+            raise FunctionDescriptionError(
+                f"Function {name} documents parameter {param.arg_name},"
+                " which is not in its signature."
+            )
+        property_schema = create_property(
+            name,
+            docstring_type=param.type_name,
+            annotation=annotations.get(param.arg_name, None),
+            description=param.description,
+            defs=defs,
+        )
+        del property_schema["description"]
+        parameters.append(
+            ParamSpec(
+                name=param.arg_name,
+                schema=property_schema,
+                description=param.description,
+                required=not param.is_optional and not param_has_default,
+            )
+        )
+
+    returns = parsed_docstring.returns
+    return FunctionSpec(
+        name=name,
+        short_description=parsed_docstring.short_description,
+        long_description=parsed_docstring.long_description,
+        parameters=tuple(parameters),
+        defs=defs,
+        returns=(
+            ReturnSpec(
+                type_name=returns.type_name,
+                annotation=annotations.get("return", None),
+                description=returns.description,
+            )
+            if returns
+            else None
+        ),
+    )
+
+
+def get_function_spec(func: Callable) -> FunctionSpec:
+    # Cached per function like the argument validators. Bound methods and
+    #  their functions share the code but not the parameters (`self`).
+    target = get_cache_target(func)
+    fingerprint = get_function_fingerprint(func) + (inspect.ismethod(func),)
+    cached = FUNCTION_SPECS.get(target)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    spec = build_function_spec(func)
+    with FUNCTION_SPECS_LOCK:
+        FUNCTION_SPECS[target] = (fingerprint, spec)
+    return spec
@@ -1,8 +1,47 @@
 import inspect
-from typing import Any, Callable, Dict, _LiteralGenericAlias
+import threading
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+)
 
-from docstring_parser import Docstring, parse
+from docstring_parser import Docstring, DocstringStyle
 
+from .disk_cache import DEFAULT_DISK_CACHE_SIZE, DiskSchemaCache
+from .docstring_parsing import DocstringStyleOption, parse_docstring
+from .instrumentation import (
+    CACHE_HIT,
+    CACHE_MISS,
+    DESCRIPTION_PHASE,
+    ERROR,
+    PARAMETERS_PHASE,
+    PARSE_PHASE,
+    TYPE_PHASE,
+    call_timed,
+    get_active_collector,
+)
+from .introspection import get_annotations, get_parameter_has_default
+from .schema_cache import (
+    DEFAULT_SCHEMA_CACHE_SIZE,
+    CacheInfo,
+    SchemaCache,
+    copy_schema,
+    get_cache_target,
+    get_function_fingerprint,
+)
+from .serialization import dumps_canonical
+from .type_conversion import (
+    DEFS_KEY,
+    UNKNOWN_TYPE,
+    TypeConversionError,
+    convert_type,
+    merge_type_schema,
+)
 
 DESCRIPTION_SEPARATOR = "\n\n"
 
@@ -21,31 +60,226 @@ class FunctionDescriptionError(ValueError):
     pass
 
 
+# Shared by every call to `get_function_calling_schema` with `use_cache=True`.
+#  Entries hold weak references to the functions and are invalidated whenever
+#  the code object, docstring or annotations of a function change.
+SCHEMA_CACHE = SchemaCache(maxsize=DEFAULT_SCHEMA_CACHE_SIZE)
+
+# Consulted on misses of `SCHEMA_CACHE` once enabled, so that new worker
+#  processes start with the schemas generated by earlier ones.
+DISK_CACHE: Optional[DiskSchemaCache] = None
+
+# Serialized schemas per function and options. Kept apart from the LRU of
+#  `SCHEMA_CACHE`, so that catalogs larger than that cache still encode each
+#  schema only once; entries live as long as their function.
+SchemaBytes = Tuple[Tuple, Dict[Hashable, bytes]]
+SCHEMA_BYTES: "weakref.WeakKeyDictionary[Callable, SchemaBytes]" = (
+    weakref.WeakKeyDictionary()
+)
+SCHEMA_BYTES_LOCK = threading.Lock()
+
+
 def get_function_calling_schema(
     func: Callable,
     include_long_description: bool = False,
     include_return_in_parameters: bool = False,
+    use_cache: bool = True,
+    style: DocstringStyleOption = DocstringStyle.AUTO,
+    fast_parse: bool = False,
+    canonical: bool = False,
+) -> Dict[str, Any]:
+
+    if not use_cache:
+        return generate_function_calling_schema(
+            func,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+            style=style,
+            fast_parse=fast_parse,
+            canonical=canonical,
+        )
+
+    options = get_schema_options(
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+        style=style,
+        fast_parse=fast_parse,
+        canonical=canonical,
+    )
+    function_calling_schema = SCHEMA_CACHE.get(func, options)
+    collector = get_active_collector()
+    if collector is not None:
+        collector.increment(
+            CACHE_MISS if function_calling_schema is None else CACHE_HIT
+        )
+    if function_calling_schema is None:
+        disk_cache = DISK_CACHE
+        if disk_cache is not None:
+            function_calling_schema = disk_cache.get(func, options)
+        if function_calling_schema is None:
+            function_calling_schema = generate_function_calling_schema(
+                func,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+                style=style,
+                fast_parse=fast_parse,
+                canonical=canonical,
+            )
+            if disk_cache is not None:
+                disk_cache.put(func, options, function_calling_schema)
+        SCHEMA_CACHE.put(func, options, function_calling_schema)
+    return function_calling_schema
+
+
+def get_function_calling_schema_bytes(
+    func: Callable,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    use_cache: bool = True,
+    style: DocstringStyleOption = DocstringStyle.AUTO,
+    fast_parse: bool = False,
+    canonical: bool = False,
+) -> bytes:
+    # Canonical JSON of the schema, encoded once per function rather than
+    #  once per request.
+    options = get_schema_options(
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+        style=style,
+        fast_parse=fast_parse,
+        canonical=canonical,
+    )
+    if use_cache:
+        target = get_cache_target(func)
+        fingerprint = get_function_fingerprint(func) + (
+            inspect.ismethod(func),
+        )
+        try:
+            cached = SCHEMA_BYTES.get(target)
+        except TypeError:
+            # Callables that cannot be weakly referenced are not cached.
+            cached, use_cache = None, False
+        if cached is not None and cached[0] == fingerprint:
+            schema_bytes = cached[1].get(options)
+            if schema_bytes is not None:
+                return schema_bytes
+
+    schema_bytes = dumps_canonical(
+        get_function_calling_schema(
+            func,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+            use_cache=use_cache,
+            style=style,
+            fast_parse=fast_parse,
+            canonical=canonical,
+        )
+    )
+    if use_cache:
+        with SCHEMA_BYTES_LOCK:
+            cached = SCHEMA_BYTES.get(target)
+            if cached is None or cached[0] != fingerprint:
+                cached = (fingerprint, {})
+                SCHEMA_BYTES[target] = cached
+            cached[1][options] = schema_bytes
+    return schema_bytes
+
+
+def get_schema_options(
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    style: DocstringStyleOption = DocstringStyle.AUTO,
+    fast_parse: bool = False,
+    canonical: bool = False,
+) -> Tuple[Any, ...]:
+    return (
+        include_long_description,
+        include_return_in_parameters,
+        style,
+        fast_parse,
+        canonical,
+    )
+
+
+def schema_cache_info() -> CacheInfo:
+    return SCHEMA_CACHE.info()
+
+
+def invalidate_schema_cache(func: Optional[Callable] = None) -> None:
+    SCHEMA_CACHE.invalidate(func)
+    with SCHEMA_BYTES_LOCK:
+        if func is None:
+            SCHEMA_BYTES.clear()
+        else:
+            try:
+                SCHEMA_BYTES.pop(get_cache_target(func), None)
+            except TypeError:
+                pass
+
+
+def enable_disk_cache(
+    directory: Optional[str] = None,
+    max_size: int = DEFAULT_DISK_CACHE_SIZE,
+) -> DiskSchemaCache:
+    # `directory` defaults to $OPENAI_FUNC_PARSER_CACHE_DIR, or to
+    #  openai-func-parser under the user cache directory.
+    global DISK_CACHE
+    DISK_CACHE = DiskSchemaCache(directory, max_size=max_size)
+    return DISK_CACHE
+
+
+def disable_disk_cache() -> None:
+    global DISK_CACHE
+    DISK_CACHE = None
+
+
+def generate_function_calling_schema(
+    func: Callable,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    style: DocstringStyleOption = DocstringStyle.AUTO,
+    fast_parse: bool = False,
+    canonical: bool = False,
 ) -> Dict[str, Any]:
 
+    collector = get_active_collector()
     if func.__doc__ is not None:
-        parsed_docstring = parse(func.__doc__)
+        parsed_docstring = call_timed(
+            collector,
+            PARSE_PHASE,
+            parse_docstring,
+            func.__doc__,
+            style=style,
+            module_name=getattr(func, "__module__", None),
+            fast=fast_parse,
+        )
     else:
+        if collector is not None:
+            collector.increment(ERROR)
         raise FunctionDescriptionError(
             f"Function {func.__name__} has no docstring."
         )
 
     name = getattr(func, "__name__")
-    description = create_description(
+    description = call_timed(
+        collector,
+        DESCRIPTION_PHASE,
+        create_description,
         parsed_docstring,
         include_long_description=include_long_description,
     )
     if not description:
+        if collector is not None:
+            collector.increment(ERROR)
         raise FunctionDescriptionError(
             f"Failed to create a description for function {name},"
             " either due to empty description or missing long description."
         )
 
-    parameters = create_parameters(
+    parameters = call_timed(
+        collector,
+        PARAMETERS_PHASE,
+        create_parameters,
         func=func,
         parsed_docstring=parsed_docstring,
         include_return_in_parameters=include_return_in_parameters,
@@ -56,9 +290,20 @@ def get_function_calling_schema(
         "description": description,
         "parameters": parameters,
     }
+    if canonical:
+        canonicalize_schema(function_calling_schema)
     return function_calling_schema
 
 
+def canonicalize_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    # Sorts properties and required names, so that the serialized schema no
+    #  longer depends on the order of the parameters in the docstring.
+    parameters = schema["parameters"]
+    parameters["properties"] = dict(sorted(parameters["properties"].items()))
+    parameters["required"] = sorted(parameters["required"])
+    return schema
+
+
 def create_description(
     parsed_docstring: Docstring,
     include_long_description: bool,
@@ -79,61 +324,123 @@ def create_parameters(
     parsed_docstring: Docstring,
     include_return_in_parameters: bool,
 ):
-    signature = inspect.signature(func)
+    parameter_has_default = get_parameter_has_default(func)
+    return build_parameters(
+        func_name=func.__name__,
+        parsed_docstring=parsed_docstring,
+        annotations=get_annotations(func),
+        parameter_has_default=parameter_has_default,
+        include_return_in_parameters=include_return_in_parameters,
+    )
 
+
+def build_parameters(
+    func_name: str,
+    parsed_docstring: Docstring,
+    annotations: Dict[str, Any],
+    parameter_has_default: Dict[str, bool],
+    include_return_in_parameters: bool,
+):
+    collector = get_active_collector()
     parameter_properties = {}
     required_parameters = []
+    defs: Dict[str, Dict[str, Any]] = {}
     # We also approach the parameter by accessing the function's signature,
     #  especially the type annotations.
     for param in parsed_docstring.params:
-        param_docstring_type = param.type_name
-        param_annotation = func.__annotations__.get(param.arg_name, None)
-        param_annotated_type = (
-            param_annotation.__name__ if param_annotation else None
+        param_has_default = parameter_has_default.get(param.arg_name)
+        if param_has_default is None:
+            if collector is not None:
+                collector.increment(ERROR)
+            raise FunctionDescriptionError(
+                f"Function {func_name} documents parameter {param.arg_name},"
+                " which is not in its signature."
+            )
+        parameter_properties[param.arg_name] = create_property(
+            func_name,
+            docstring_type=param.type_name,
+            annotation=annotations.get(param.arg_name, None),
+            description=param.description,
+            defs=defs,
         )
-        param_signature = signature.parameters[param.arg_name]
-        param_type = param_docstring_type or param_annotated_type
-        param_type = transform_py_type_to_json_type(param_type)
-        parameter_properties[param.arg_name] = {
-            "type": param_type,
-            "description": param.description,
-        }
-
-        # If the parameter has Literal type annotation, infer the enum values.
-        if isinstance(param_annotation, _LiteralGenericAlias):
-            param_enum = param_annotation.__args__
-            parameter_properties[param.arg_name]["enum"] = list(param_enum)
-
-        if (
-            (not param.is_optional)
-            and (param_signature.default is param_signature.empty)
-        ):
+
+        if (not param.is_optional) and (not param_has_default):
             required_parameters.append(param.arg_name)
 
     if include_return_in_parameters:
-        print(f"Collecting return type for function {func.__name__}")
+        if collector is not None:
+            collector.on_event("collect_return_type", func_name=func_name)
         if not parsed_docstring.returns:
+            if collector is not None:
+                collector.increment(ERROR)
             raise FunctionDescriptionError(
-                f"Function {func.__name__} has no return description."
+                f"Function {func_name} has no return description."
             )
-        return_docstring_type = parsed_docstring.returns.type_name
-        return_annotation = func.__annotations__.get("return", None)
-        return_annotated_type = (
-            return_annotation.__name__ if return_annotation else None
+        parameter_properties["return"] = create_property(
+            func_name,
+            docstring_type=parsed_docstring.returns.type_name,
+            annotation=annotations.get("return", None),
+            description=parsed_docstring.returns.description,
+            defs=defs,
         )
-        return_type = return_docstring_type or return_annotated_type
-        return_type = transform_py_type_to_json_type(return_type)
-        parameter_properties["return"] = {
-            "type": return_type,
-            "description": parsed_docstring.returns.description,
-        }
         required_parameters.append("return")
 
-    return {
+    parameters = {
         "type": "object",
         "properties": parameter_properties,
         "required": required_parameters,
     }
+    if defs:
+        parameters[DEFS_KEY] = copy_schema(defs)
+    return parameters
+
+
+def create_property(
+    func_name: str,
+    docstring_type: Optional[str],
+    annotation: Any,
+    description: Optional[str],
+    defs: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    # Annotations the converter understands (generics, unions, literals,
+    #  dataclasses, ...) are converted recursively, with named types added to
+    #  `defs`. Otherwise a type from the docstring takes precedence over the
+    #  name of the annotation, as in the flat mapping.
+    collector = get_active_collector()
+    if annotation is not None and not is_builtin_annotation(annotation):
+        try:
+            type_schema = call_timed(
+                collector, TYPE_PHASE, convert_type, annotation
+            )
+            schema = merge_type_schema(defs, type_schema)
+        except TypeConversionError as error:
+            if collector is not None:
+                collector.increment(ERROR)
+            raise FunctionDescriptionError(
+                "Failed to convert the annotations of function"
+                f" {func_name}: {error}"
+            ) from error
+        if type_schema is not UNKNOWN_TYPE:
+            # Converted types are shared, so the schema gets its own copy.
+            return {
+                **copy_schema(schema),
+                "description": description,
+            }
+
+    annotated_type = getattr(annotation, "__name__", None)
+    json_type = call_timed(
+        collector,
+        TYPE_PHASE,
+        transform_py_type_to_json_type,
+        docstring_type or annotated_type,
+    )
+    return {"type": json_type, "description": description}
+
+
+def is_builtin_annotation(annotation: Any) -> bool:
+    return not hasattr(annotation, "__origin__") and (
+        getattr(annotation, "__name__", None) in PY_TO_JSON_TYPES
+    )
 
 
 def transform_py_type_to_json_type(py_type: str) -> str:
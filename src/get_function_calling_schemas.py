@@ -0,0 +1,131 @@
+import pickle
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .get_function_calling_schema import (
+    SCHEMA_CACHE,
+    FunctionDescriptionError,
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+    get_schema_options,
+)
+from .serialization import get_tool_definition_bytes, join_json_array
+
+DEFAULT_CHUNK_SIZE = 64
+
+SchemaOrError = Union[Dict[str, Any], FunctionDescriptionError]
+
+
+def get_function_calling_schemas(
+    funcs: Iterable[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[SchemaOrError]:
+
+    funcs = list(funcs)
+    if executor is None:
+        return generate_schemas(
+            funcs,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        )
+
+    # Process pools can only receive functions that pickle by reference,
+    #  the rest (lambdas, closures, ...) are generated in this process.
+    in_process_pool = isinstance(executor, ProcessPoolExecutor)
+    remote_indices, local_indices = [], []
+    for index, func in enumerate(funcs):
+        if in_process_pool and not is_picklable(func):
+            local_indices.append(index)
+        else:
+            remote_indices.append(index)
+
+    futures: List[Tuple[List[int], Future]] = []
+    for start in range(0, len(remote_indices), chunk_size):
+        chunk = remote_indices[start : start + chunk_size]
+        future = executor.submit(
+            generate_schemas,
+            [funcs[index] for index in chunk],
+            include_long_description,
+            include_return_in_parameters,
+        )
+        futures.append((chunk, future))
+
+    schemas: List[SchemaOrError] = [None] * len(funcs)  # type: ignore
+    local_schemas = generate_schemas(
+        [funcs[index] for index in local_indices],
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+    )
+    for index, schema in zip(local_indices, local_schemas):
+        schemas[index] = schema
+
+    options = get_schema_options(
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+    )
+    for chunk, future in futures:
+        for index, schema in zip(chunk, future.result()):
+            schemas[index] = schema
+            # Schemas built in worker processes never reach our own cache.
+            if in_process_pool and isinstance(schema, dict):
+                SCHEMA_CACHE.put(funcs[index], options, schema)
+    return schemas
+
+
+def get_tools_json(
+    funcs: Iterable[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> bytes:
+    # The `tools` array of a chat completion request, assembled from the
+    #  cached bytes of each schema.
+    return join_json_array(
+        get_tool_definition_bytes(
+            get_function_calling_schema_bytes(
+                func,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+            )
+        )
+        for func in funcs
+    )
+
+
+def generate_schemas(
+    funcs: List[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> List[SchemaOrError]:
+    schemas: List[SchemaOrError] = []
+    for func in funcs:
+        try:
+            schema = get_function_calling_schema(
+                func,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+            )
+        except FunctionDescriptionError as error:
+            schemas.append(error)
+        else:
+            schemas.append(schema)
+    return schemas
+
+
+def is_picklable(func: Callable) -> bool:
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
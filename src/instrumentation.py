@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PARSE_PHASE = "parse"
+DESCRIPTION_PHASE = "create_description"
+PARAMETERS_PHASE = "create_parameters"
+TYPE_PHASE = "transform_py_type_to_json_type"
+
+CACHE_HIT = "cache_hit"
+CACHE_MISS = "cache_miss"
+ERROR = "error"
+
+
+class MetricsCollector:
+    # Subclass and override `record_timing`, `increment` and `on_event` to
+    #  forward measurements to an external metrics system.
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.calls: Counter = Counter()
+        self.counters: Counter = Counter()
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def record_timing(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.timings[phase] += seconds
+            self.calls[phase] += 1
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+
+    def on_event(self, event: str, **details: Any) -> None:
+        with self._lock:
+            self.events.append((event, details))
+
+
+_ACTIVE_COLLECTOR: ContextVar[Optional[MetricsCollector]] = ContextVar(
+    "active_metrics_collector", default=None
+)
+# Number of open `collect_metrics` scopes in any context. While it is zero,
+#  `get_active_collector` does not even look at the context variable.
+_ACTIVE_SCOPES = 0
+_ACTIVE_SCOPES_LOCK = threading.Lock()
+
+
+def get_active_collector() -> Optional[MetricsCollector]:
+    if not _ACTIVE_SCOPES:
+        return None
+    return _ACTIVE_COLLECTOR.get()
+
+
+@contextmanager
+def collect_metrics(
+    collector: Optional[MetricsCollector] = None,
+) -> Iterator[MetricsCollector]:
+    global _ACTIVE_SCOPES
+    collector = collector if collector is not None else MetricsCollector()
+    token = _ACTIVE_COLLECTOR.set(collector)
+    with _ACTIVE_SCOPES_LOCK:
+        _ACTIVE_SCOPES += 1
+    try:
+        yield collector
+    finally:
+        with _ACTIVE_SCOPES_LOCK:
+            _ACTIVE_SCOPES -= 1
+        _ACTIVE_COLLECTOR.reset(token)
+
+
+def call_timed(
+    collector: Optional[MetricsCollector],
+    phase: str,
+    function: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    if collector is None:
+        return function(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        collector.record_timing(phase, time.perf_counter() - start)
@@ -0,0 +1,95 @@
+import inspect
+import typing
+import weakref
+from types import CodeType, FunctionType
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+
+class CodeLayout(NamedTuple):
+    positional_names: Tuple[str, ...]
+    keyword_only_names: Tuple[str, ...]
+    variadic_names: Tuple[str, ...]
+
+
+# The parameter layout only depends on the code object, which is shared by
+#  every closure created from the same `def` statement.
+CODE_LAYOUTS: "weakref.WeakKeyDictionary[CodeType, CodeLayout]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_code_layout(code: CodeType) -> CodeLayout:
+    layout = CODE_LAYOUTS.get(code)
+    if layout is None:
+        positional_count = code.co_argcount
+        keyword_only_count = code.co_kwonlyargcount
+        variadic_count = bool(code.co_flags & inspect.CO_VARARGS) + bool(
+            code.co_flags & inspect.CO_VARKEYWORDS
+        )
+        names = code.co_varnames
+        keyword_only_end = positional_count + keyword_only_count
+        layout = CodeLayout(
+            positional_names=names[:positional_count],
+            keyword_only_names=names[positional_count:keyword_only_end],
+            variadic_names=names[
+                keyword_only_end : keyword_only_end + variadic_count
+            ],
+        )
+        CODE_LAYOUTS[code] = layout
+    return layout
+
+
+def get_parameter_has_default(func: Callable) -> Dict[str, bool]:
+    # Reads defaults straight from the function object instead of going
+    #  through `inspect.signature`, which is only needed for callables whose
+    #  signature is not described by their own code object.
+    bound = inspect.ismethod(func)
+    target = func.__func__ if bound else func  # type: ignore
+    if (
+        type(target) is not FunctionType
+        or hasattr(target, "__signature__")
+        or hasattr(target, "__wrapped__")
+    ):
+        return get_signature_parameter_has_default(func)
+
+    layout = get_code_layout(target.__code__)
+    positional_names = layout.positional_names
+    defaults = target.__defaults__ or ()
+    first_default = len(positional_names) - len(defaults)
+    keyword_defaults = target.__kwdefaults__ or {}
+
+    parameter_has_default = {
+        name: index >= first_default
+        for index, name in enumerate(positional_names)
+    }
+    for name in layout.keyword_only_names:
+        parameter_has_default[name] = name in keyword_defaults
+    for name in layout.variadic_names:
+        parameter_has_default[name] = False
+
+    # Bound methods (including class methods) do not expose their first
+    #  positional parameter, i.e. `self` or `cls`.
+    if bound and positional_names:
+        del parameter_has_default[positional_names[0]]
+    return parameter_has_default
+
+
+def get_signature_parameter_has_default(func: Callable) -> Dict[str, bool]:
+    signature = inspect.signature(func)
+    return {
+        param_name: param_signature.default is not param_signature.empty
+        for param_name, param_signature in signature.parameters.items()
+    }
+
+
+def get_annotations(func: Callable) -> Dict[str, Any]:
+    # Annotations postponed by `from __future__ import annotations` are
+    #  strings, and are resolved against the module of the function. They
+    #  are left as they are when a name cannot be resolved.
+    annotations = getattr(func, "__annotations__", None) or {}
+    if not any(isinstance(value, str) for value in annotations.values()):
+        return annotations
+    try:
+        return typing.get_type_hints(func, include_extras=True)
+    except (AttributeError, NameError, TypeError):
+        return annotations
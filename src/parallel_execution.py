@@ -0,0 +1,442 @@
+import asyncio
+import inspect
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .async_api import ToolTimeoutError, is_async_callable, run_tool_async
+from .tool_registry import RegisteredTool, ToolRegistry, parse_tool_call
+
+THREAD_BACKEND = "thread"
+PROCESS_BACKEND = "process"
+ASYNCIO_BACKEND = "asyncio"
+BACKENDS = (THREAD_BACKEND, PROCESS_BACKEND, ASYNCIO_BACKEND)
+
+
+class ToolCallResult(NamedTuple):
+    name: Optional[str]
+    id: Optional[str]
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BoundCall(NamedTuple):
+    position: int
+    tool: RegisteredTool
+    arguments: Dict[str, Any]
+    id: Optional[str]
+
+
+def call_tool(func: Callable, arguments: Dict[str, Any]) -> Any:
+    # Runs in the worker, so `async def` tools get an event loop of their own
+    #  on the thread and process backends.
+    result = func(**arguments)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+class ParallelToolExecutor:
+    # Runs the tool calls of one model response at the same time. Calls are
+    #  bound and validated up front, so invalid calls fail without running
+    #  anything, and every call gets its own result or error in call order.
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        backend: str = THREAD_BACKEND,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        executor: Optional[Executor] = None,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend {backend}, expected one of"
+                f" {', '.join(BACKENDS)}."
+            )
+        self.registry = registry
+        self.backend = backend
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def __enter__(self) -> "ParallelToolExecutor":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_timeout(self, name: str) -> Optional[float]:
+        return self.timeouts.get(name, self.timeout)
+
+    def run(self, payloads: Iterable[Any]) -> List[ToolCallResult]:
+        if self.backend == ASYNCIO_BACKEND:
+            return asyncio.run(self.run_async(payloads))
+
+        results, calls = self._bind(payloads)
+        queues: Dict[str, Deque[BoundCall]] = {}
+        for call in calls:
+            queues.setdefault(call.tool.name, deque()).append(call)
+        running: Dict[str, int] = dict.fromkeys(queues, 0)
+        futures: Dict[Future, BoundCall] = {}
+        deadlines: Dict[Future, float] = {}
+        # The executor futures of the calls holding a worker, by the future
+        #  of the call that started them. Calls given up on after their
+        #  timeout keep their worker until they return. No more calls are
+        #  submitted than there are free workers, so that every deadline
+        #  starts when its call starts running.
+        runs: Dict[Future, Future] = {}
+        busy: Set[Future] = set()
+        abandoned: Set[Future] = set()
+        # Deadlines of queued calls, by call index, once every worker is
+        #  held by an abandoned call that may never return.
+        queued_deadlines: Dict[int, float] = {}
+        worker_count = get_worker_count(self._get_executor())
+
+        def has_free_worker() -> bool:
+            return worker_count is None or len(busy) < worker_count
+
+        def submit_ready() -> None:
+            for name, queue in queues.items():
+                limit = self.concurrency_limits.get(name)
+                while queue and (limit is None or running[name] < limit):
+                    if not has_free_worker():
+                        return
+                    call = queue.popleft()
+                    queued_deadlines.pop(call.position, None)
+                    future, run = self._submit(call)
+                    if run is not None and not run.done():
+                        runs[future] = run
+                        busy.add(run)
+                    running[name] += 1
+                    futures[future] = call
+                    timeout = self.get_timeout(name)
+                    if timeout is not None:
+                        deadlines[future] = time.monotonic() + timeout
+
+        def finish(future: Future, result: ToolCallResult) -> None:
+            call = futures.pop(future)
+            deadlines.pop(future, None)
+            runs.pop(future, None)
+            results[call.position] = result
+            running[call.tool.name] -= 1
+
+        submit_ready()
+        while futures or any(queues.values()):
+            now = time.monotonic()
+            if not has_free_worker() and busy <= abandoned:
+                for queue in queues.values():
+                    for call in queue:
+                        timeout = self.get_timeout(call.tool.name)
+                        if timeout is not None:
+                            queued_deadlines.setdefault(
+                                call.position, now + timeout
+                            )
+            wait_timeout = None
+            if deadlines or queued_deadlines:
+                wait_timeout = max(
+                    0.0,
+                    min([*deadlines.values(), *queued_deadlines.values()])
+                    - now,
+                )
+            done, _ = wait(
+                {*futures, *busy},
+                timeout=wait_timeout,
+                return_when=FIRST_COMPLETED,
+            )
+            busy -= done
+            abandoned -= done
+            for future in done:
+                if future not in futures:
+                    continue
+                call = futures[future]
+                error = future.exception()
+                finish(
+                    future,
+                    ToolCallResult(
+                        name=call.tool.name,
+                        id=call.id,
+                        value=None if error else future.result(),
+                        error=error,
+                    ),
+                )
+            now = time.monotonic()
+            for future, deadline in list(deadlines.items()):
+                if deadline <= now and future not in done:
+                    # A call that is already running cannot be stopped; it
+                    #  keeps its worker but no longer counts against the
+                    #  concurrency limit.
+                    future.cancel()
+                    run = runs.get(future)
+                    if run is not None:
+                        if run.done():
+                            busy.discard(run)
+                        else:
+                            abandoned.add(run)
+                    call = futures[future]
+                    finish(
+                        future,
+                        ToolCallResult(
+                            name=call.tool.name,
+                            id=call.id,
+                            error=self._timeout_error(call),
+                        ),
+                    )
+            for queue in queues.values():
+                for call in list(queue):
+                    queued_deadline = queued_deadlines.get(call.position)
+                    if queued_deadline is not None and queued_deadline <= now:
+                        queue.remove(call)
+                        del queued_deadlines[call.position]
+                        results[call.position] = ToolCallResult(
+                            name=call.tool.name,
+                            id=call.id,
+                            error=self._timeout_error(call),
+                        )
+            submit_ready()
+        return results  # type: ignore
+
+    async def run_async(self, payloads: Iterable[Any]) -> List[ToolCallResult]:
+        results, calls = self._bind(payloads)
+        semaphores = {
+            name: asyncio.Semaphore(limit)
+            for name, limit in self.concurrency_limits.items()
+        }
+        # Sync tools on the asyncio backend run in our own thread pool rather
+        #  than the loop's default one, which `asyncio.run` waits for even
+        #  when a call timed out.
+        executor = self._get_executor()
+        worker_count = get_worker_count(executor)
+        workers = (
+            WorkerSlots(worker_count) if worker_count is not None else None
+        )
+
+        async def run_call(call: BoundCall) -> None:
+            semaphore = semaphores.get(call.tool.name)
+            try:
+                if semaphore is None:
+                    value = await self._run_call_async(call, executor, workers)
+                else:
+                    async with semaphore:
+                        value = await self._run_call_async(
+                            call, executor, workers
+                        )
+            except Exception as error:
+                results[call.position] = ToolCallResult(
+                    name=call.tool.name, id=call.id, error=error
+                )
+            else:
+                results[call.position] = ToolCallResult(
+                    name=call.tool.name, id=call.id, value=value
+                )
+
+        await asyncio.gather(*(run_call(call) for call in calls))
+        return results  # type: ignore
+
+    async def _run_call_async(
+        self,
+        call: BoundCall,
+        executor: Executor,
+        workers: Optional["WorkerSlots"],
+    ) -> Any:
+        def run() -> Awaitable[Any]:
+            if workers is None or is_async_callable(call.tool.func):
+                return run_tool_async(
+                    call.tool.func,
+                    call.arguments,
+                    timeout=self.get_timeout(call.tool.name),
+                    executor=executor,
+                )
+            return self._run_sync_call(call, executor, workers)
+
+        result_cache = self.registry.result_cache
+        if result_cache is None:
+            return await run()
+        return await result_cache.call_async(
+            call.tool.name,
+            run,
+            call.tool.func,
+            call.arguments,
+            properties=call.tool.schema["parameters"]["properties"],
+        )
+
+    async def _run_sync_call(
+        self,
+        call: BoundCall,
+        executor: Executor,
+        workers: "WorkerSlots",
+    ) -> Any:
+        # A sync tool is only handed to the executor once a worker is free,
+        #  and the worker is counted as busy until the tool returns, so that
+        #  the deadline starts when the call starts running.
+        timeout = self.get_timeout(call.tool.name)
+        if not await workers.acquire(timeout):
+            raise self._timeout_error(call)
+        loop = asyncio.get_running_loop()
+
+        def release(future: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(workers.release, future)
+            except RuntimeError:
+                # The loop closed while a timed out call was still running.
+                pass
+
+        try:
+            future = executor.submit(call_tool, call.tool.func, call.arguments)
+        except BaseException:
+            workers.release(None)
+            raise
+        future.add_done_callback(release)
+        result = asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(result, timeout)
+        except asyncio.TimeoutError as error:
+            if not result.cancelled():
+                # Raised by the tool itself.
+                raise
+            workers.abandon(future)
+            raise self._timeout_error(call) from error
+
+    def _submit(self, call: BoundCall) -> Tuple[Future, Optional[Future]]:
+        # Returns the future of the call and the executor future holding a
+        #  worker for it, which is None when the call shares another run.
+        #  Identical calls share one run when the registry caches results.
+        def submit() -> Future:
+            return self._get_executor().submit(
+                call_tool, call.tool.func, call.arguments
+            )
+
+        result_cache = self.registry.result_cache
+        if result_cache is None:
+            future = submit()
+            return future, future
+        return result_cache.submit(
+            call.tool.name,
+            submit,
+            call.tool.func,
+            call.arguments,
+            properties=call.tool.schema["parameters"]["properties"],
+        )
+
+    def _bind(
+        self,
+        payloads: Iterable[Any],
+    ) -> Tuple[List[Optional[ToolCallResult]], List[BoundCall]]:
+        results: List[Optional[ToolCallResult]] = []
+        calls: List[BoundCall] = []
+        for index, payload in enumerate(payloads):
+            name = call_id = None
+            try:
+                tool_call = parse_tool_call(payload)
+                name, call_id = tool_call.name, tool_call.id
+                tool = self.registry[name]
+                arguments = tool.validator(tool_call.arguments)
+            except ValueError as error:
+                results.append(
+                    ToolCallResult(name=name, id=call_id, error=error)
+                )
+                continue
+            results.append(None)
+            calls.append(BoundCall(index, tool, arguments, call_id))
+        return results, calls
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.backend == PROCESS_BACKEND:
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+        return self._executor
+
+    def _timeout_error(self, call: BoundCall) -> ToolTimeoutError:
+        return ToolTimeoutError(
+            f"Tool {call.tool.name} did not finish within"
+            f" {self.get_timeout(call.tool.name)} seconds."
+        )
+
+
+class WorkerSlots:
+    # The workers of the executor held by sync tools on the asyncio backend.
+    #  Only once every worker is held by a call that timed out, and may
+    #  never return, does waiting for one count against the timeout.
+    def __init__(self, count: int):
+        self.count = count
+        self.busy = 0
+        self.abandoned: Set[Future] = set()
+        self._changed = asyncio.Event()
+
+    async def acquire(self, timeout: Optional[float]) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = None
+        while self.busy >= self.count:
+            if (
+                deadline is None
+                and timeout is not None
+                and len(self.abandoned) >= self.busy
+            ):
+                deadline = loop.time() + timeout
+            changed = self._changed.wait()
+            if deadline is None:
+                await changed
+                continue
+            try:
+                await asyncio.wait_for(changed, deadline - loop.time())
+            except asyncio.TimeoutError:
+                return False
+        self.busy += 1
+        return True
+
+    def release(self, future: Optional[Future]) -> None:
+        self.busy -= 1
+        if future is not None:
+            self.abandoned.discard(future)
+        self._notify()
+
+    def abandon(self, future: Future) -> None:
+        if not future.done():
+            self.abandoned.add(future)
+            self._notify()
+
+    def _notify(self) -> None:
+        # Every waiter wakes up and checks again.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+def get_worker_count(executor: Executor) -> Optional[int]:
+    # The standard pools keep their size in a private attribute; calls to
+    #  other executors are not held back.
+    return getattr(executor, "_max_workers", None)
@@ -0,0 +1,210 @@
+import inspect
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from .function_spec import (
+    FunctionSpec,
+    get_function_spec,
+    render_description,
+    render_openai,
+    render_parameters,
+)
+from .schema_cache import (
+    copy_schema,
+    get_cache_target,
+    get_function_fingerprint,
+)
+from .serialization import dumps_json
+from .type_conversion import DEFS_KEY, REF_PREFIX
+
+OPENAI_PROVIDER = "openai"
+ANTHROPIC_PROVIDER = "anthropic"
+GEMINI_PROVIDER = "gemini"
+
+# Keywords of the OpenAPI subset accepted in Gemini function declarations;
+#  everything else is dropped.
+GEMINI_SCHEMA_KEYS = frozenset(
+    [
+        "type",
+        "description",
+        "enum",
+        "items",
+        "properties",
+        "required",
+        "nullable",
+        "anyOf",
+        "minItems",
+        "maxItems",
+    ]
+)
+
+
+def render_anthropic(
+    spec: FunctionSpec,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> Dict[str, Any]:
+    return {
+        "name": spec.name,
+        "description": render_description(spec, include_long_description),
+        "input_schema": render_parameters(spec, include_return_in_parameters),
+    }
+
+
+def render_gemini(
+    spec: FunctionSpec,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> Dict[str, Any]:
+    declaration: Dict[str, Any] = {
+        "name": spec.name,
+        "description": render_description(spec, include_long_description),
+    }
+    parameters = render_parameters(spec, include_return_in_parameters)
+    if parameters["properties"]:
+        # Functions without parameters leave them out altogether.
+        defs = parameters.pop(DEFS_KEY, {})
+        declaration["parameters"] = to_gemini_schema(parameters, defs, ())
+    return declaration
+
+
+def to_gemini_schema(
+    schema: Dict[str, Any],
+    defs: Dict[str, Dict[str, Any]],
+    expanding: Tuple[str, ...],
+) -> Dict[str, Any]:
+    # Gemini has no `$ref`, so definitions are inlined; a recursive type is
+    #  cut off as a plain object where it refers to itself. Optional types
+    #  become `nullable` instead of a union with null. Enums of anything but
+    #  strings and `additionalProperties` cannot be declared, so they are
+    #  spelled out in the description instead.
+    ref = schema.get("$ref")
+    if ref is not None:
+        name = ref[len(REF_PREFIX) :]
+        if name in expanding or name not in defs:
+            converted: Dict[str, Any] = {"type": "object"}
+        else:
+            converted = to_gemini_schema(defs[name], defs, expanding + (name,))
+        if "description" in schema:
+            converted["description"] = schema["description"]
+        return converted
+
+    options = schema.get("anyOf")
+    if options is not None:
+        non_null = [option for option in options if option != {"type": "null"}]
+        if len(non_null) == 1:
+            converted = to_gemini_schema(non_null[0], defs, expanding)
+        else:
+            converted = {
+                "anyOf": [
+                    to_gemini_schema(option, defs, expanding)
+                    for option in non_null
+                ]
+            }
+        if len(non_null) < len(options):
+            converted["nullable"] = True
+        if "description" in schema:
+            converted["description"] = schema["description"]
+        return converted
+
+    converted = {}
+    notes = []
+    for key, value in schema.items():
+        if key == "enum" and not all(isinstance(v, str) for v in value):
+            notes.append(
+                "One of " + ", ".join(dumps_json(v).decode() for v in value)
+            )
+            continue
+        if key == "additionalProperties" and isinstance(value, dict):
+            value = to_gemini_schema(value, defs, expanding)
+            notes.append(
+                "Values follow the JSON schema " + dumps_json(value).decode()
+            )
+            continue
+        if key not in GEMINI_SCHEMA_KEYS:
+            continue
+        if key == "items":
+            value = to_gemini_schema(value, defs, expanding)
+        elif key == "properties":
+            value = {
+                name: to_gemini_schema(property_schema, defs, expanding)
+                for name, property_schema in value.items()
+            }
+        converted[key] = copy_schema(value)
+    if notes:
+        notes = [f"{note}." for note in notes]
+        if "description" in converted:
+            notes.insert(0, converted["description"])
+        converted["description"] = " ".join(notes)
+    return converted
+
+
+Renderer = Callable[..., Dict[str, Any]]
+
+RENDERERS: Dict[str, Renderer] = {
+    OPENAI_PROVIDER: render_openai,
+    ANTHROPIC_PROVIDER: render_anthropic,
+    GEMINI_PROVIDER: render_gemini,
+}
+
+# Rendered tools per function, provider and options; the entries of one
+#  function are dropped together when its fingerprint changes.
+RenderedTools = Tuple[Tuple, Dict[Hashable, Any]]
+RENDERED_TOOLS: "weakref.WeakKeyDictionary[Callable, RenderedTools]" = (
+    weakref.WeakKeyDictionary()
+)
+RENDERED_TOOLS_LOCK = threading.Lock()
+
+
+def render_tool(
+    func: Callable,
+    provider: str = OPENAI_PROVIDER,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> Dict[str, Any]:
+    renderer = RENDERERS.get(provider)
+    if renderer is None:
+        raise ValueError(
+            f"Unknown provider {provider}, expected one of"
+            f" {', '.join(RENDERERS)}."
+        )
+
+    target = get_cache_target(func)
+    fingerprint = get_function_fingerprint(func) + (inspect.ismethod(func),)
+    key = (provider, include_long_description, include_return_in_parameters)
+    cached = RENDERED_TOOLS.get(target)
+    if cached is not None and cached[0] == fingerprint:
+        rendered = cached[1].get(key)
+        if rendered is not None:
+            return copy_schema(rendered)
+
+    rendered = renderer(
+        get_function_spec(func),
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+    )
+    with RENDERED_TOOLS_LOCK:
+        cached = RENDERED_TOOLS.get(target)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, {})
+            RENDERED_TOOLS[target] = cached
+        cached[1][key] = rendered
+    return copy_schema(rendered)
+
+
+def render_tools(
+    funcs: Iterable[Callable],
+    provider: str = OPENAI_PROVIDER,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> List[Dict[str, Any]]:
+    return [
+        render_tool(
+            func,
+            provider=provider,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        )
+        for func in funcs
+    ]
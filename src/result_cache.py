@@ -0,0 +1,364 @@
+import asyncio
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .schema_cache import get_cache_target, get_function_fingerprint
+from .serialization import dumps_canonical
+
+DEFAULT_RESULT_CACHE_SIZE = 1024
+
+
+class CachePolicy(NamedTuple):
+    # `ttl` in seconds; None keeps results until they are evicted.
+    ttl: Optional[float] = None
+    maxsize: int = DEFAULT_RESULT_CACHE_SIZE
+
+
+class MemoryResultBackend:
+    # An LRU map from keys to (expiry, result). Any object with the same
+    #  `get`, `set`, `delete` and `clear` methods can be used instead, e.g.
+    #  to share results between processes.
+    def __init__(self, maxsize: int = DEFAULT_RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Optional[float], Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self, key: Hashable, expires_at: Optional[float], value: Any
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+BackendFactory = Callable[[str, CachePolicy], Any]
+
+
+def create_memory_backend(
+    name: str, policy: CachePolicy
+) -> MemoryResultBackend:
+    return MemoryResultBackend(maxsize=policy.maxsize)
+
+
+# Argument defaults per function, which the schema does not record.
+DEFAULT_ARGUMENTS: "weakref.WeakKeyDictionary[Callable, Tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+DEFAULT_ARGUMENTS_LOCK = threading.Lock()
+
+
+def get_default_arguments(func: Callable) -> Dict[str, Any]:
+    target = get_cache_target(func)
+    fingerprint = get_function_fingerprint(func) + (
+        getattr(target, "__defaults__", None),
+        getattr(target, "__kwdefaults__", None),
+        inspect.ismethod(func),
+    )
+    cached = DEFAULT_ARGUMENTS.get(target)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    defaults = {
+        name: parameter.default
+        for name, parameter in inspect.signature(func).parameters.items()
+        if parameter.default is not parameter.empty
+    }
+    with DEFAULT_ARGUMENTS_LOCK:
+        DEFAULT_ARGUMENTS[target] = (fingerprint, defaults)
+    return defaults
+
+
+def normalize_value(value: Any) -> Any:
+    # Integral floats become ints, so that `2` and `2.0` share an entry.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: normalize_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(item) for item in value]
+    return value
+
+
+def get_result_key(
+    func: Callable,
+    arguments: Dict[str, Any],
+    properties: Optional[Dict[str, Any]] = None,
+) -> Optional[bytes]:
+    # Canonical JSON of the arguments with defaults filled in, restricted to
+    #  the schema `properties` when given. None when an argument has no JSON
+    #  form, in which case the call is not cached.
+    defaults = get_default_arguments(func)
+    if properties is not None:
+        defaults = {
+            name: value
+            for name, value in defaults.items()
+            if name in properties
+        }
+    try:
+        return dumps_canonical(normalize_value({**defaults, **arguments}))
+    except TypeError:
+        return None
+
+
+def copy_future_state(source: Future, target: Future) -> None:
+    # `target` may have been cancelled by its caller in the meantime.
+    if not target.set_running_or_notify_cancel():
+        return
+    if source.cancelled():
+        target.set_exception(CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class ToolResultCache:
+    # Memoizes tool results per tool name and canonical arguments. Only the
+    #  tools given a policy, or every tool when there is a default policy,
+    #  are cached, so it is safe to leave out tools with side effects.
+    #  Concurrent identical calls run the tool once and share the result;
+    #  errors are passed on but never cached. Cached results are returned
+    #  as they are, not copied.
+    def __init__(
+        self,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        default_policy: Optional[CachePolicy] = None,
+        backend_factory: BackendFactory = create_memory_backend,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy
+        self.backend_factory = backend_factory
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._backends: Dict[str, Any] = {}
+        self._in_flight: Dict[Tuple[str, bytes], Future] = {}
+        self._in_flight_async: Dict[Tuple[int, str, bytes], asyncio.Future] = (
+            {}
+        )
+        self._lock = threading.Lock()
+
+    def get_policy(self, name: str) -> Optional[CachePolicy]:
+        return self.policies.get(name, self.default_policy)
+
+    def call(
+        self,
+        name: str,
+        func: Callable,
+        arguments: Dict[str, Any],
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        policy = self.get_policy(name)
+        key = get_result_key(func, arguments, properties) if policy else None
+        if policy is None or key is None:
+            return func(**arguments)
+
+        with self._lock:
+            found, value = self._lookup(name, policy, key)
+            if found:
+                return value
+            future = self._in_flight.get((name, key))
+            owner = future is None
+            if owner:
+                future = self._in_flight[(name, key)] = Future()
+        if not owner:
+            return future.result()  # type: ignore
+
+        try:
+            value = func(**arguments)
+        except BaseException as error:
+            future.set_exception(error)  # type: ignore
+            raise
+        else:
+            self._store(name, policy, key, value)
+            future.set_result(value)  # type: ignore
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[(name, key)]
+
+    def submit(
+        self,
+        name: str,
+        submit: Callable[[], Future],
+        func: Callable,
+        arguments: Dict[str, Any],
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Future, Optional[Future]]:
+        # Like `call`, for callers that run tools in an executor: `submit`
+        #  starts the tool and returns its future. Every caller gets a future
+        #  of its own, so cancelling one does not affect the others. The
+        #  future `submit` returned is passed back as well when this call
+        #  started the tool, and is None when it reused a result or a run.
+        policy = self.get_policy(name)
+        key = get_result_key(func, arguments, properties) if policy else None
+        if policy is None or key is None:
+            future = submit()
+            return future, future
+
+        waiter: Future = Future()
+        with self._lock:
+            found, value = self._lookup(name, policy, key)
+            if found:
+                waiter.set_result(value)
+                return waiter, None
+            shared = self._in_flight.get((name, key))
+            owner = shared is None
+            if owner:
+                shared = self._in_flight[(name, key)] = Future()
+        shared.add_done_callback(  # type: ignore
+            lambda shared: copy_future_state(shared, waiter)
+        )
+        if not owner:
+            return waiter, None
+
+        def finish(future: Future) -> None:
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled():
+                shared.cancel()  # type: ignore
+            elif error is not None:
+                shared.set_exception(error)  # type: ignore
+            else:
+                self._store(name, policy, key, future.result())  # type: ignore
+                shared.set_result(future.result())  # type: ignore
+            with self._lock:
+                del self._in_flight[(name, key)]
+
+        try:
+            future = submit()
+        except BaseException as error:
+            shared.set_exception(error)  # type: ignore
+            with self._lock:
+                del self._in_flight[(name, key)]
+            raise
+        future.add_done_callback(finish)
+        return waiter, future
+
+    async def call_async(
+        self,
+        name: str,
+        call: Callable[[], Awaitable[Any]],
+        func: Callable,
+        arguments: Dict[str, Any],
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        # `call` runs the tool, e.g. with a timeout; `func` and `arguments`
+        #  only make the key. In-flight calls are shared within each loop.
+        policy = self.get_policy(name)
+        key = get_result_key(func, arguments, properties) if policy else None
+        if policy is None or key is None:
+            return await call()
+
+        loop = asyncio.get_running_loop()
+        in_flight_key = (id(loop), name, key)
+        with self._lock:
+            found, value = self._lookup(name, policy, key)
+            if found:
+                return value
+            future = self._in_flight_async.get(in_flight_key)
+            owner = future is None
+            if owner:
+                future = loop.create_future()
+                self._in_flight_async[in_flight_key] = future
+        if not owner:
+            # Shielded, so that a cancelled waiter does not cancel the call
+            #  the other waiters depend on.
+            return await asyncio.shield(future)  # type: ignore
+
+        try:
+            value = await call()
+        except BaseException as error:
+            future.set_exception(error)  # type: ignore
+            # Retrieved here, so a call nobody else waited for does not log
+            #  "exception was never retrieved".
+            future.exception()  # type: ignore
+            raise
+        else:
+            self._store(name, policy, key, value)
+            future.set_result(value)  # type: ignore
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight_async[in_flight_key]
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            backends = (
+                list(self._backends.values())
+                if name is None
+                else [self._backends.get(name)]
+            )
+        for backend in backends:
+            if backend is not None:
+                backend.clear()
+
+    def _lookup(
+        self,
+        name: str,
+        policy: CachePolicy,
+        key: bytes,
+    ) -> Tuple[bool, Any]:
+        entry = self._get_backend(name, policy).get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > self.clock():
+                self.hits += 1
+                return True, value
+            self._get_backend(name, policy).delete(key)
+        self.misses += 1
+        return False, None
+
+    def _store(
+        self,
+        name: str,
+        policy: CachePolicy,
+        key: bytes,
+        value: Any,
+    ) -> None:
+        expires_at = None if policy.ttl is None else self.clock() + policy.ttl
+        with self._lock:
+            backend = self._get_backend(name, policy)
+        backend.set(key, expires_at, value)
+
+    def _get_backend(self, name: str, policy: CachePolicy) -> Any:
+        backend = self._backends.get(name)
+        if backend is None:
+            backend = self._backends[name] = self.backend_factory(name, policy)
+        return backend
@@ -0,0 +1,321 @@
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import mmap
+import os
+import pkgutil
+import struct
+import sys
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .disk_cache import get_annotation_key
+from .get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+)
+from .get_function_calling_schemas import get_function_calling_schemas
+from .introspection import get_annotations, get_parameter_has_default
+from .schema_cache import copy_schema, get_cache_target
+from .serialization import dumps_canonical
+
+# Layout: magic, version, index length, JSON index, concatenated schemas.
+#  The index maps every function name to the offset and length of its JSON
+#  encoded schema (relative to the end of the index) and its source hash.
+BUNDLE_MAGIC = b"OFPB"
+BUNDLE_VERSION = 3
+BUNDLE_HEADER = struct.Struct("<4sHQ")
+
+
+class SchemaBundleError(ValueError):
+    pass
+
+
+def compute_function_hash(
+    func: Callable,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> str:
+    # Everything here is read from the live objects; reading the source
+    #  with `inspect.getsource` cost more than regenerating the schema.
+    target = get_cache_target(func)
+    code = getattr(target, "__code__", None)
+    annotations = get_annotations(func)
+    digest = hashlib.sha256()
+    for part in [
+        getattr(func, "__name__", ""),
+        get_code_key(code) if code is not None else "",
+        func.__doc__ or "",
+        ";".join(
+            f"{name}:{get_annotation_key(annotation)}"
+            for name, annotation in sorted(annotations.items())
+        ),
+        repr(sorted(get_parameter_has_default(func).items())),
+        repr((include_long_description, include_return_in_parameters)),
+    ]:
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_code_key(code: CodeType) -> str:
+    return "|".join(
+        [
+            code.co_code.hex(),
+            repr(code.co_names),
+            ",".join(
+                get_constant_key(constant) for constant in code.co_consts
+            ),
+        ]
+    )
+
+
+def get_constant_key(constant: Any) -> str:
+    # The key has to be the same in every process: the repr of nested code
+    #  objects holds their address, and the order of frozenset constants
+    #  (compiled from `x in {...}`) changes with the hash seed.
+    if isinstance(constant, CodeType):
+        return get_code_key(constant)
+    if isinstance(constant, frozenset):
+        elements = sorted(get_constant_key(element) for element in constant)
+        return f"frozenset({{{','.join(elements)}}})"
+    if isinstance(constant, tuple):
+        elements = [get_constant_key(element) for element in constant]
+        return f"({','.join(elements)})"
+    return repr(constant)
+
+
+def iter_package_tools(package_name: str) -> Iterator[Callable]:
+    for module in iter_package_modules(package_name):
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if (
+                not name.startswith("_")
+                and func.__module__ == module.__name__
+                and func.__doc__ is not None
+            ):
+                yield func
+
+
+def iter_package_modules(package_name: str) -> Iterator[ModuleType]:
+    package = importlib.import_module(package_name)
+    yield package
+    if not hasattr(package, "__path__"):
+        return
+    for module_info in pkgutil.walk_packages(
+        package.__path__, prefix=f"{package_name}."
+    ):
+        yield importlib.import_module(module_info.name)
+
+
+def build_schema_bundle(
+    funcs: Sequence[Callable],
+    path: str,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> List[FunctionDescriptionError]:
+    schemas = get_function_calling_schemas(
+        funcs,
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+    )
+
+    entries: Dict[str, List[Any]] = {}
+    payloads: List[bytes] = []
+    errors: List[FunctionDescriptionError] = []
+    offset = 0
+    for func, schema in zip(funcs, schemas):
+        if isinstance(schema, FunctionDescriptionError):
+            errors.append(schema)
+            continue
+        if schema["name"] in entries:
+            raise SchemaBundleError(
+                f"Function name {schema['name']} appears more than once."
+            )
+        payload = dumps_canonical(schema)
+        function_hash = compute_function_hash(
+            func,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        )
+        entries[schema["name"]] = [offset, len(payload), function_hash]
+        payloads.append(payload)
+        offset += len(payload)
+
+    index = json.dumps(
+        {
+            "options": [
+                include_long_description,
+                include_return_in_parameters,
+            ],
+            "entries": entries,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    # Write next to the destination and rename, so that running workers
+    #  never map a half written bundle.
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(
+            BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index))
+        )
+        file.write(index)
+        for payload in payloads:
+            file.write(payload)
+    os.replace(temporary_path, path)
+    return errors
+
+
+class SchemaBundle:
+    def __init__(self, path: str):
+        self.path = path
+        self.stale_names: set = set()
+        self._decoded: Dict[str, Dict[str, Any]] = {}
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_length = BUNDLE_HEADER.unpack_from(
+            self._buffer, 0
+        )
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise SchemaBundleError(f"{path} is not a valid schema bundle.")
+        index_start = BUNDLE_HEADER.size
+        self._payload_start = index_start + index_length
+        index = json.loads(self._buffer[index_start : self._payload_start])
+        (
+            self.include_long_description,
+            self.include_return_in_parameters,
+        ) = index["options"]
+        self._entries: Dict[str, List[Any]] = index["entries"]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self) -> "SchemaBundle":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def is_stale(self, func: Callable) -> bool:
+        entry = self._entries.get(func.__name__)
+        return entry is None or entry[2] != compute_function_hash(
+            func,
+            include_long_description=self.include_long_description,
+            include_return_in_parameters=self.include_return_in_parameters,
+        )
+
+    def get(
+        self,
+        name: str,
+        func: Optional[Callable] = None,
+    ) -> Dict[str, Any]:
+        # With the function at hand, an outdated entry is never served: the
+        #  schema is regenerated and the name is recorded for a rebuild.
+        if func is not None and self.is_stale(func):
+            self.stale_names.add(name)
+            return get_function_calling_schema(
+                func,
+                include_long_description=self.include_long_description,
+                include_return_in_parameters=self.include_return_in_parameters,
+            )
+
+        schema = self._decoded.get(name)
+        if schema is None:
+            try:
+                offset, length, _ = self._entries[name]
+            except KeyError:
+                raise KeyError(f"Function {name} is not in {self.path}.")
+            start = self._payload_start + offset
+            schema = json.loads(self._buffer[start : start + length])
+            self._decoded[name] = schema
+        return copy_schema(schema)
+
+    def get_bytes(self, name: str, func: Optional[Callable] = None) -> bytes:
+        # Payloads are canonical JSON, so they are served without decoding.
+        if func is not None and self.is_stale(func):
+            self.stale_names.add(name)
+            return get_function_calling_schema_bytes(
+                func,
+                include_long_description=self.include_long_description,
+                include_return_in_parameters=self.include_return_in_parameters,
+            )
+
+        try:
+            offset, length, _ = self._entries[name]
+        except KeyError:
+            raise KeyError(f"Function {name} is not in {self.path}.")
+        start = self._payload_start + offset
+        return self._buffer[start : start + length]
+
+
+def load_schema_bundle(
+    path: str,
+    funcs: Sequence[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> SchemaBundle:
+    # Rebuilds the bundle in place when it is missing, was built with other
+    #  options, or any of the given functions changed since it was written.
+    if os.path.exists(path):
+        bundle = SchemaBundle(path)
+        if (
+            bundle.include_long_description == include_long_description
+            and bundle.include_return_in_parameters
+            == include_return_in_parameters
+            and not any(bundle.is_stale(func) for func in funcs)
+        ):
+            return bundle
+        bundle.close()
+
+    build_schema_bundle(
+        funcs,
+        path,
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+    )
+    return SchemaBundle(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompile function calling schemas into a bundle."
+    )
+    parser.add_argument("packages", nargs="+", help="Packages to scan.")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--include-long-description", action="store_true")
+    parser.add_argument("--include-return-in-parameters", action="store_true")
+    args = parser.parse_args(argv)
+
+    funcs = [
+        func
+        for package_name in args.packages
+        for func in iter_package_tools(package_name)
+    ]
+    errors = build_schema_bundle(
+        funcs,
+        args.output,
+        include_long_description=args.include_long_description,
+        include_return_in_parameters=args.include_return_in_parameters,
+    )
+    for error in errors:
+        print(f"Skipped: {error}", file=sys.stderr)
+    print(f"Wrote {len(funcs) - len(errors)} schemas to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
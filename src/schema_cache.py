@@ -0,0 +1,125 @@
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+DEFAULT_SCHEMA_CACHE_SIZE = 1024
+
+# The id of the cached function, the schema options and whether the function
+#  was passed as a bound method.
+CacheKey = Tuple[int, Hashable, bool]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _CacheEntry(NamedTuple):
+    fingerprint: Tuple[Any, ...]
+    schema: Any
+    func_ref: weakref.ref
+
+
+def copy_schema(schema: Any) -> Any:
+    # Schemas only nest dicts and lists around immutable leaves, so a
+    #  structural copy is enough and much cheaper than `copy.deepcopy`.
+    if isinstance(schema, dict):
+        return {key: copy_schema(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [copy_schema(value) for value in schema]
+    return schema
+
+
+def get_cache_target(func: Callable) -> Callable:
+    # Bound methods are recreated on every attribute access, so we key on
+    #  the underlying function to keep the entry alive between calls.
+    return getattr(func, "__func__", func) if inspect.ismethod(func) else func
+
+
+def get_function_fingerprint(func: Callable) -> Tuple[Any, ...]:
+    annotations = getattr(func, "__annotations__", None) or {}
+    return (
+        getattr(get_cache_target(func), "__code__", None),
+        getattr(func, "__doc__", None),
+        tuple(annotations.items()),
+    )
+
+
+class SchemaCache:
+    def __init__(self, maxsize: int = DEFAULT_SCHEMA_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, func: Callable, options: Hashable) -> Optional[Any]:
+        key = (id(get_cache_target(func)), options, inspect.ismethod(func))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.fingerprint != get_function_fingerprint(
+                func
+            ):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_schema(entry.schema)
+
+    def put(self, func: Callable, options: Hashable, schema: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        target = get_cache_target(func)
+        target_id = id(target)
+        key = (target_id, options, inspect.ismethod(func))
+        try:
+            func_ref = weakref.ref(
+                target, lambda _: self._discard_target(target_id)
+            )
+        except TypeError:
+            # Callables that cannot be weakly referenced are never cached,
+            #  otherwise their ids could be reused by unrelated objects.
+            return
+        entry = _CacheEntry(
+            fingerprint=get_function_fingerprint(func),
+            schema=copy_schema(schema),
+            func_ref=func_ref,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, func: Optional[Callable] = None) -> None:
+        if func is None:
+            with self._lock:
+                self._entries.clear()
+            return
+        self._discard_target(id(get_cache_target(func)))
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            maxsize=self.maxsize,
+            currsize=len(self._entries),
+        )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _discard_target(self, target_id: int) -> None:
+        with self._lock:
+            stale_keys = [key for key in self._entries if key[0] == target_id]
+            for key in stale_keys:
+                del self._entries[key]
@@ -0,0 +1,197 @@
+import gc
+import struct
+import sys
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .get_function_calling_schema import get_function_calling_schema_bytes
+from .serialization import (
+    dumps_canonical,
+    get_tool_definition_bytes,
+    join_json_array,
+    loads_json,
+)
+
+# Magic, format version and index length, followed by the index (the names
+#  and end offsets of the schemas, as JSON) and the concatenated schemas.
+HEADER = struct.Struct("<4sIQ")
+MAGIC = b"OFPS"
+STORE_VERSION = 1
+
+Buffer = Union[bytes, memoryview]
+
+
+class SchemaStoreError(ValueError):
+    pass
+
+
+class SchemaStore:
+    # Read-only schemas packed into a single buffer: the canonical JSON of
+    #  every schema, back to back, plus a table of offsets. Built before the
+    #  server forks, the buffer is one object whose pages are never written
+    #  again, so copy-on-write keeps them shared between workers; schemas
+    #  are decoded only when a worker asks for one.
+    def __init__(self, buffer: Buffer):
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise SchemaStoreError("Schema store is truncated.")
+        magic, version, index_length = HEADER.unpack_from(view)
+        if magic != MAGIC or version != STORE_VERSION:
+            raise SchemaStoreError(
+                f"Not a version {STORE_VERSION} schema store."
+            )
+        index_end = HEADER.size + index_length
+        index = loads_json(bytes(view[HEADER.size : index_end]))
+        self._buffer = buffer
+        self._view = view
+        self._data_start = index_end
+        self._ends: List[int] = index["ends"]
+        self._positions: Dict[str, int] = {
+            name: position for position, name in enumerate(index["names"])
+        }
+        self._shared_memory: Optional[shared_memory.SharedMemory] = None
+
+    @classmethod
+    def from_schemas(cls, schemas: Iterable[Dict[str, Any]]) -> "SchemaStore":
+        return cls.from_bytes(dumps_canonical(schema) for schema in schemas)
+
+    @classmethod
+    def from_bytes(cls, schema_bytes: Iterable[bytes]) -> "SchemaStore":
+        names: List[str] = []
+        seen = set()
+        ends: List[int] = []
+        fragments: List[bytes] = []
+        end = 0
+        for fragment in schema_bytes:
+            name = loads_json(fragment)["name"]
+            if name in seen:
+                raise SchemaStoreError(f"Duplicate tool name {name}.")
+            seen.add(name)
+            names.append(name)
+            end += len(fragment)
+            ends.append(end)
+            fragments.append(fragment)
+        index = dumps_canonical({"names": names, "ends": ends})
+        return cls(
+            HEADER.pack(MAGIC, STORE_VERSION, len(index))
+            + index
+            + b"".join(fragments)
+        )
+
+    @classmethod
+    def attach(cls, name: str) -> "SchemaStore":
+        # Reads the store published by another process in place.
+        segment = open_shared_memory(name)
+        try:
+            store = cls(get_segment_buffer(segment))
+        except SchemaStoreError:
+            segment.close()
+            raise
+        store._shared_memory = segment
+        return store
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def nbytes(self) -> int:
+        # Shared memory segments are rounded up to whole pages.
+        return self._data_start + (self._ends[-1] if self._ends else 0)
+
+    def get_bytes(self, name: str) -> bytes:
+        try:
+            position = self._positions[name]
+        except KeyError:
+            raise KeyError(f"No schema named {name} in the store.") from None
+        start = self._ends[position - 1] if position else 0
+        return bytes(
+            self._view[
+                self._data_start
+                + start : self._data_start
+                + self._ends[position]
+            ]
+        )
+
+    def get(self, name: str) -> Dict[str, Any]:
+        # A new dict on every call, owned by the caller.
+        return loads_json(self.get_bytes(name))
+
+    def get_tools_json(self, names: Optional[Sequence[str]] = None) -> bytes:
+        return join_json_array(
+            get_tool_definition_bytes(self.get_bytes(name))
+            for name in (self._positions if names is None else names)
+        )
+
+    def publish(self) -> shared_memory.SharedMemory:
+        # Copies the store into a new shared memory segment for other
+        #  processes to `attach` by its name. The caller owns the segment
+        #  and must `close` and `unlink` it once the workers are done.
+        segment = shared_memory.SharedMemory(create=True, size=self.nbytes)
+        get_segment_buffer(segment)[: self.nbytes] = self._view[: self.nbytes]
+        return segment
+
+    def close(self) -> None:
+        if self._shared_memory is not None:
+            self._view.release()
+            self._buffer = self._view = memoryview(b"")
+            self._shared_memory.close()
+            self._shared_memory = None
+
+
+def open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # Python 3.13 can open a segment without registering it with the
+    #  resource tracker. Earlier versions always register it, which is
+    #  harmless in workers forked or spawned by the publisher, as they share
+    #  its tracker; an unrelated process would unlink the segment on exit.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def get_segment_buffer(segment: shared_memory.SharedMemory) -> memoryview:
+    # The buffer of a segment is only gone once the segment is closed.
+    if segment.buf is None:
+        raise SchemaStoreError(f"Shared memory {segment.name} is closed.")
+    return segment.buf
+
+
+def warmup(
+    funcs: Iterable[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    freeze: bool = True,
+) -> SchemaStore:
+    # Call in the master process before the workers fork. The schemas are
+    #  not kept in the schema caches, so that the store is the only copy
+    #  the workers inherit. With `freeze`, every object alive at this point
+    #  is moved out of the collector's generations, so collections in the
+    #  workers do not touch (and thereby copy) the pages holding them.
+    store = SchemaStore.from_bytes(
+        get_function_calling_schema_bytes(
+            func,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+            use_cache=False,
+        )
+        for func in funcs
+    )
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return store
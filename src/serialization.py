@@ -0,0 +1,52 @@
+import json
+from types import ModuleType
+from typing import Any, Iterable, Optional
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Tool definitions in the chat completions format only add these two keys
+#  around the schema, so they are written as fixed byte strings.
+TOOL_DEFINITION_PREFIX = b'{"function":'
+TOOL_DEFINITION_SUFFIX = b',"type":"function"}'
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    # Sorted keys, no whitespace and UTF-8 output, so that equal schemas
+    #  always serialize to the same bytes whichever backend is installed.
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        obj,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def dumps_json(obj: Any) -> bytes:
+    # Like `dumps_canonical`, but keys keep their insertion order.
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(
+        obj,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_tool_definition_bytes(schema_bytes: bytes) -> bytes:
+    return TOOL_DEFINITION_PREFIX + schema_bytes + TOOL_DEFINITION_SUFFIX
+
+
+def join_json_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
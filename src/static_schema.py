@@ -0,0 +1,565 @@
+import ast
+import builtins
+import dataclasses
+import enum
+import os
+import types
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from docstring_parser import parse
+
+from .get_function_calling_schema import (
+    FunctionDescriptionError,
+    build_parameters,
+    create_description,
+)
+
+SchemaOrError = Union[Dict[str, Any], FunctionDescriptionError]
+FileSchemasOrError = Union[Dict[str, SchemaOrError], FunctionDescriptionError]
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+# Names an annotation can use without anything from the analyzed module.
+STATIC_ANNOTATION_NAMES = {
+    **{
+        name: getattr(builtins, name)
+        for name in [
+            "bool",
+            "bytes",
+            "dict",
+            "float",
+            "frozenset",
+            "int",
+            "list",
+            "set",
+            "str",
+            "tuple",
+        ]
+    },
+    **{
+        name: getattr(typing, name)
+        for name in [
+            "Annotated",
+            "Any",
+            "Dict",
+            "FrozenSet",
+            "Iterable",
+            "List",
+            "Literal",
+            "Mapping",
+            "MutableMapping",
+            "MutableSequence",
+            "Optional",
+            "Sequence",
+            "Set",
+            "Tuple",
+            "Union",
+        ]
+    },
+    "None": None,
+}
+
+# Bases that make a class of the analyzed module an enum or a `TypedDict`.
+STATIC_BASE_NAMES = {
+    "Enum": enum.Enum,
+    "IntEnum": enum.IntEnum,
+    "TypedDict": typing.TypedDict,
+}
+
+# The module the classes rebuilt from the syntax tree claim to come from.
+STATIC_MODULE_NAME = "<static>"
+
+
+class StaticNamespace:
+    # The names an annotation can use from the analyzed module. Dataclasses,
+    #  enums and `TypedDict`s are rebuilt from their class definitions, other
+    #  classes become empty classes of the same name and module-level
+    #  assignments are type aliases. Anything else, such as an imported name,
+    #  cannot be known without importing the module and is an error.
+    def __init__(self, module: Optional[ast.Module] = None) -> None:
+        self._nodes: Dict[str, ast.stmt] = {}
+        self._values: Dict[str, Any] = {}
+        self._resolving: Set[str] = set()
+        for node in module.body if module is not None else []:
+            if isinstance(node, ast.ClassDef):
+                self._nodes[node.name] = node
+            elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+                target = node.targets[0]
+                if isinstance(target, ast.Name):
+                    self._nodes[target.id] = node
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                if isinstance(node.target, ast.Name):
+                    self._nodes[node.target.id] = node
+
+    def resolve(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        node = self._nodes.get(name)
+        if node is None:
+            if name in STATIC_ANNOTATION_NAMES:
+                return STATIC_ANNOTATION_NAMES[name]
+            raise FunctionDescriptionError(
+                f"{name} cannot be resolved without importing the module."
+            )
+        if name in self._resolving:
+            raise FunctionDescriptionError(f"{name} refers to itself.")
+
+        self._resolving.add(name)
+        try:
+            if isinstance(node, ast.ClassDef):
+                return self._build_class(node)
+            assert isinstance(node, (ast.Assign, ast.AnnAssign))
+            assert node.value is not None
+            self._values[name] = self.evaluate(node.value)
+            return self._values[name]
+        except (SyntaxError, TypeError, ValueError) as error:
+            # A half-built class must not be handed out later.
+            self._values.pop(name, None)
+            if isinstance(error, FunctionDescriptionError):
+                raise
+            raise FunctionDescriptionError(
+                f"Failed to rebuild {name}: {error}"
+            ) from error
+        finally:
+            self._resolving.discard(name)
+
+    def evaluate(self, node: ast.expr) -> Any:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            node = ast.parse(node.value, mode="eval").body
+        return evaluate_static_expression(node, self)
+
+    def _build_class(self, node: ast.ClassDef) -> Any:
+        bases = [self._resolve_base(base) for base in node.bases]
+        if any(is_static_dataclass_decorator(d) for d in node.decorator_list):
+            return self._build_dataclass(node, bases)
+        if any(
+            isinstance(base, type) and issubclass(base, enum.Enum)
+            for base in bases
+        ):
+            return self._build_enum(node)
+        if any(
+            base is typing.TypedDict or typing.is_typeddict(base)
+            for base in bases
+        ):
+            return self._build_typeddict(node, bases)
+        # Like at runtime, a class of no known kind converts to a string.
+        cls = type(node.name, (), {"__module__": STATIC_MODULE_NAME})
+        self._values[node.name] = cls
+        return cls
+
+    def _resolve_base(self, node: ast.expr) -> Any:
+        if isinstance(node, ast.Attribute):
+            return STATIC_BASE_NAMES.get(node.attr)
+        if not isinstance(node, ast.Name):
+            return None
+        if node.id in STATIC_BASE_NAMES and node.id not in self._nodes:
+            return STATIC_BASE_NAMES[node.id]
+        try:
+            return self.resolve(node.id)
+        except FunctionDescriptionError:
+            return None
+
+    def _build_dataclass(self, node: ast.ClassDef, bases: List[Any]) -> type:
+        # The class exists before its fields, which may refer back to it.
+        cls = type(
+            node.name,
+            tuple(
+                base
+                for base in bases
+                if isinstance(base, type) and dataclasses.is_dataclass(base)
+            ),
+            {"__module__": STATIC_MODULE_NAME},
+        )
+        self._values[node.name] = cls
+        annotations = {}
+        for field_name, annotation, value in iter_static_fields(node):
+            annotations[field_name] = self.evaluate(annotation)
+            if value is not None:
+                setattr(cls, field_name, get_static_field(value))
+        cls.__annotations__ = annotations
+        return dataclasses.dataclass(cls)
+
+    def _build_enum(self, node: ast.ClassDef) -> type:
+        members: Dict[str, Any] = {"__module__": STATIC_MODULE_NAME}
+        for statement in node.body:
+            if not (
+                isinstance(statement, ast.Assign)
+                and len(statement.targets) == 1
+                and isinstance(statement.targets[0], ast.Name)
+                and not statement.targets[0].id.startswith("_")
+            ):
+                continue
+            try:
+                value = ast.literal_eval(statement.value)
+            except ValueError:
+                raise FunctionDescriptionError(
+                    f"Members of enum {node.name} must be constants."
+                )
+            members[statement.targets[0].id] = value
+
+        def add_members(namespace: Dict[str, Any]) -> None:
+            # Enum namespaces only register members through item assignment.
+            for member_name, value in members.items():
+                namespace[member_name] = value
+
+        cls = types.new_class(node.name, (enum.Enum,), exec_body=add_members)
+        self._values[node.name] = cls
+        return cls
+
+    def _build_typeddict(self, node: ast.ClassDef, bases: List[Any]) -> type:
+        total = True
+        for keyword in node.keywords:
+            if keyword.arg == "total":
+                total = ast.literal_eval(keyword.value)
+        # The class exists before its fields, which may refer back to it.
+        cls: Any = types.new_class(
+            node.name,
+            (typing.TypedDict,),
+            {"total": total},
+            lambda namespace: namespace.update(__module__=STATIC_MODULE_NAME),
+        )
+        self._values[node.name] = cls
+
+        annotations: Dict[str, Any] = {}
+        required_keys: Set[str] = set()
+        for base in bases:
+            if typing.is_typeddict(base):
+                annotations.update(base.__annotations__)
+                required_keys.update(base.__required_keys__)
+        for field_name, annotation, _ in iter_static_fields(node):
+            annotations[field_name] = self.evaluate(annotation)
+            if total:
+                required_keys.add(field_name)
+        cls.__annotations__ = annotations
+        cls.__required_keys__ = frozenset(required_keys)
+        cls.__optional_keys__ = frozenset(annotations) - required_keys
+        return cls
+
+
+def get_static_function_calling_schemas(
+    source: str,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    filename: str = "<unknown>",
+) -> Dict[str, SchemaOrError]:
+    module = ast.parse(source, filename=filename)
+    namespace = StaticNamespace(module)
+    schemas: Dict[str, SchemaOrError] = {}
+    for node in iter_function_nodes(module):
+        try:
+            schemas[node.name] = get_static_function_calling_schema(
+                node,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+                namespace=namespace,
+            )
+        except FunctionDescriptionError as error:
+            schemas[node.name] = error
+    return schemas
+
+
+def get_static_function_calling_schema(
+    node: FunctionNode,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    namespace: Optional[StaticNamespace] = None,
+) -> Dict[str, Any]:
+    # Mirrors `generate_function_calling_schema`, with the docstring,
+    #  annotations and defaults read from the syntax tree instead.
+    docstring = ast.get_docstring(node, clean=False)
+    if docstring is not None:
+        parsed_docstring = parse(docstring)
+    else:
+        raise FunctionDescriptionError(
+            f"Function {node.name} has no docstring."
+        )
+
+    name = node.name
+    description = create_description(
+        parsed_docstring,
+        include_long_description=include_long_description,
+    )
+    if not description:
+        raise FunctionDescriptionError(
+            f"Failed to create a description for function {name},"
+            " either due to empty description or missing long description."
+        )
+
+    try:
+        annotations = get_static_annotations(
+            node, namespace if namespace is not None else StaticNamespace()
+        )
+    except FunctionDescriptionError as error:
+        raise FunctionDescriptionError(
+            f"Failed to resolve the annotations of function {name}: {error}"
+        ) from error
+
+    parameters = build_parameters(
+        func_name=name,
+        parsed_docstring=parsed_docstring,
+        annotations=annotations,
+        parameter_has_default=get_static_parameter_has_default(node),
+        include_return_in_parameters=include_return_in_parameters,
+    )
+
+    function_calling_schema = {
+        "name": name,
+        "description": description,
+        "parameters": parameters,
+    }
+    return function_calling_schema
+
+
+def get_function_calling_schemas_from_file(
+    path: str,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> Dict[str, SchemaOrError]:
+    with open(path, encoding="utf-8") as file:
+        source = file.read()
+    return get_static_function_calling_schemas(
+        source,
+        include_long_description=include_long_description,
+        include_return_in_parameters=include_return_in_parameters,
+        filename=path,
+    )
+
+
+def get_function_calling_schemas_from_directory(
+    directory: str,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    max_workers: Optional[int] = None,
+) -> Dict[str, FileSchemasOrError]:
+    # A file that cannot be read or parsed is reported in place of its
+    #  schemas, so that one broken file does not abort the whole scan.
+    paths = sorted(iter_python_files(directory))
+    if max_workers == 1 or len(paths) <= 1:
+        return {
+            path: get_file_schemas_or_error(
+                path,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+            )
+            for path in paths
+        }
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            get_file_schemas_or_error,
+            paths,
+            [include_long_description] * len(paths),
+            [include_return_in_parameters] * len(paths),
+        )
+        return dict(zip(paths, results))
+
+
+def get_file_schemas_or_error(
+    path: str,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> FileSchemasOrError:
+    try:
+        return get_function_calling_schemas_from_file(
+            path,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        )
+    except (OSError, SyntaxError, ValueError) as error:
+        return FunctionDescriptionError(f"Failed to parse {path}: {error}")
+
+
+def iter_python_files(directory: str) -> Iterator[str]:
+    for dir_path, dir_names, file_names in os.walk(directory):
+        dir_names[:] = [
+            dir_name
+            for dir_name in dir_names
+            if not dir_name.startswith(".") and dir_name != "__pycache__"
+        ]
+        for file_name in file_names:
+            if file_name.endswith(".py"):
+                yield os.path.join(dir_path, file_name)
+
+
+def iter_function_nodes(module: ast.Module) -> Iterator[FunctionNode]:
+    for node in module.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node
+
+
+def get_static_parameter_has_default(node: FunctionNode) -> Dict[str, bool]:
+    arguments = node.args
+    positional_args = arguments.posonlyargs + arguments.args
+    first_default = len(positional_args) - len(arguments.defaults)
+    parameter_has_default = {
+        arg.arg: index >= first_default
+        for index, arg in enumerate(positional_args)
+    }
+    for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        parameter_has_default[arg.arg] = default is not None
+    for variadic_arg in (arguments.vararg, arguments.kwarg):
+        if variadic_arg is not None:
+            parameter_has_default[variadic_arg.arg] = False
+    return parameter_has_default
+
+
+def get_static_annotations(
+    node: FunctionNode, namespace: StaticNamespace
+) -> Dict[str, Any]:
+    arguments = node.args
+    args = arguments.posonlyargs + arguments.args + arguments.kwonlyargs
+    args += [arg for arg in (arguments.vararg, arguments.kwarg) if arg]
+
+    annotations = {
+        arg.arg: evaluate_static_annotation(arg.annotation, namespace)
+        for arg in args
+        if arg.annotation is not None
+    }
+    if node.returns is not None:
+        annotations["return"] = evaluate_static_annotation(
+            node.returns, namespace
+        )
+    return annotations
+
+
+def evaluate_static_annotation(
+    annotation: ast.expr, namespace: StaticNamespace
+) -> Any:
+    # Annotations built from builtins, `typing` and the types of the analyzed
+    #  module are reconstructed as real objects, so that they convert exactly
+    #  like at runtime. Names that cannot be resolved are an error, and any
+    #  other expression is reduced to the `__name__` of its outermost type.
+    try:
+        return namespace.evaluate(annotation)
+    except FunctionDescriptionError:
+        raise
+    except (SyntaxError, TypeError, ValueError):
+        annotation_name = get_static_annotation_name(annotation)
+        if annotation_name is None:
+            return None
+        return SimpleNamespace(__name__=annotation_name)
+
+
+def evaluate_static_expression(
+    node: ast.expr, namespace: StaticNamespace
+) -> Any:
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str):
+            # A nested forward reference, such as `List["Node"]`.
+            return namespace.evaluate(node)
+        return node.value
+    if isinstance(node, ast.Name):
+        return namespace.resolve(node.id)
+    if isinstance(node, ast.Attribute):
+        if node.attr not in STATIC_ANNOTATION_NAMES:
+            raise FunctionDescriptionError(
+                f"{ast.unparse(node)} cannot be resolved without importing"
+                " the module."
+            )
+        return STATIC_ANNOTATION_NAMES[node.attr]
+    if isinstance(node, ast.Tuple):
+        return tuple(
+            evaluate_static_expression(element, namespace)
+            for element in node.elts
+        )
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return Union[
+            evaluate_static_expression(node.left, namespace),
+            evaluate_static_expression(node.right, namespace),
+        ]
+    if isinstance(node, ast.Subscript):
+        origin = evaluate_static_expression(node.value, namespace)
+        if origin is Literal:
+            literal_values = get_static_literal_values(node)
+            if literal_values is None:
+                raise ValueError("Literal values must be constants.")
+            return Literal[tuple(literal_values)]
+        if origin is typing.Annotated and isinstance(node.slice, ast.Tuple):
+            # Only the annotated type is a type, the metadata is kept as is.
+            annotated, *metadata = node.slice.elts
+            return typing.Annotated[
+                (
+                    evaluate_static_expression(annotated, namespace),
+                    *(ast.literal_eval(element) for element in metadata),
+                )
+            ]
+        return origin[evaluate_static_expression(node.slice, namespace)]
+    raise ValueError(f"Unsupported annotation {ast.dump(node)}.")
+
+
+def get_static_annotation_name(annotation: ast.expr) -> Optional[str]:
+    if isinstance(annotation, ast.Subscript):
+        return get_static_annotation_name(annotation.value)
+    if isinstance(annotation, ast.Name):
+        return annotation.id
+    if isinstance(annotation, ast.Attribute):
+        return annotation.attr
+    return None
+
+
+def get_static_literal_values(annotation: ast.expr) -> Optional[List[Any]]:
+    if not isinstance(annotation, ast.Subscript):
+        return None
+    elements = (
+        annotation.slice.elts
+        if isinstance(annotation.slice, ast.Tuple)
+        else [annotation.slice]
+    )
+    try:
+        return [ast.literal_eval(element) for element in elements]
+    except ValueError:
+        return None
+
+
+def is_static_dataclass_decorator(decorator: ast.expr) -> bool:
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    if isinstance(decorator, ast.Attribute):
+        return decorator.attr == "dataclass"
+    return isinstance(decorator, ast.Name) and decorator.id == "dataclass"
+
+
+def iter_static_fields(
+    node: ast.ClassDef,
+) -> Iterator[Tuple[str, ast.expr, Optional[ast.expr]]]:
+    for statement in node.body:
+        if not (
+            isinstance(statement, ast.AnnAssign)
+            and isinstance(statement.target, ast.Name)
+        ):
+            continue
+        if get_static_annotation_name(statement.annotation) == "ClassVar":
+            continue
+        yield statement.target.id, statement.annotation, statement.value
+
+
+def get_static_field(value: ast.expr) -> Any:
+    # Only whether a field has a default and is an `__init__` parameter
+    #  matters for the schema, so the default itself is never evaluated.
+    if not (
+        isinstance(value, ast.Call)
+        and get_static_annotation_name(value.func) == "field"
+    ):
+        return None
+    options: Dict[str, Any] = {}
+    for keyword in value.keywords:
+        if keyword.arg == "default":
+            options["default"] = None
+        elif keyword.arg == "default_factory":
+            options["default_factory"] = dict
+        elif keyword.arg == "init":
+            options["init"] = ast.literal_eval(keyword.value)
+    return dataclasses.field(**options)
@@ -0,0 +1,294 @@
+import json
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .argument_validation import (
+    ArgumentValidationError,
+    compile_property_validators,
+)
+from .get_function_calling_schema import get_function_calling_schema
+from .introspection import get_annotations
+from .schema_cache import get_cache_target, get_function_fingerprint
+
+PropertyValidators = Dict[str, Callable[[Any], Any]]
+
+WHITESPACE = " \t\n\r"
+
+# The JSON type of a value is known from its first character.
+VALUE_START_TYPES = {
+    '"': "string",
+    "{": "object",
+    "[": "array",
+    "t": "boolean",
+    "f": "boolean",
+    "n": "null",
+    "-": "number",
+    **{digit: "number" for digit in "0123456789"},
+}
+JSON_TYPES = frozenset(VALUE_START_TYPES.values())
+
+START = "start"
+KEY_OR_END = "key_or_end"
+KEY = "key"
+COLON = "colon"
+VALUE_START = "value_start"
+STRING_VALUE = "string_value"
+CONTAINER_VALUE = "container_value"
+SCALAR_VALUE = "scalar_value"
+AFTER_VALUE = "after_value"
+DONE = "done"
+
+PROPERTY_VALIDATORS: "weakref.WeakKeyDictionary[Callable, Tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+PROPERTY_VALIDATORS_LOCK = threading.Lock()
+
+
+def get_property_validators(func: Callable) -> PropertyValidators:
+    target = get_cache_target(func)
+    fingerprint = get_function_fingerprint(func)
+    cached = PROPERTY_VALIDATORS.get(target)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    property_validators = compile_property_validators(
+        get_function_calling_schema(func),
+        annotations=get_annotations(func),
+    )
+    with PROPERTY_VALIDATORS_LOCK:
+        PROPERTY_VALIDATORS[target] = (fingerprint, property_validators)
+    return property_validators
+
+
+class StreamingArgumentsParser:
+    # Consumes the `arguments` deltas of a streamed tool call. Every delta is
+    #  checked against the schema as far as it goes, so that invalid output
+    #  fails on the first offending character, and each top-level argument
+    #  is returned by `feed` as soon as its value is complete.
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        property_validators: Optional[PropertyValidators] = None,
+        annotations: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = schema["name"]
+        self.properties = schema["parameters"]["properties"]
+        self.required = schema["parameters"]["required"]
+        self.property_validators = (
+            property_validators
+            if property_validators is not None
+            else compile_property_validators(schema, annotations)
+        )
+        self.arguments: Dict[str, Any] = {}
+        self.error: Optional[ArgumentValidationError] = None
+        self.position = 0
+
+        self._state = START
+        self._after_comma = False
+        self._token: List[str] = []
+        self._key: Optional[str] = None
+        # Argument names or enum values the string read so far is still a
+        #  prefix of, or None when it is not checked.
+        self._candidates: Optional[List[Any]] = None
+        self._prefix_length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @classmethod
+    def for_function(cls, func: Callable) -> "StreamingArgumentsParser":
+        return cls(
+            get_function_calling_schema(func),
+            property_validators=get_property_validators(func),
+        )
+
+    @property
+    def done(self) -> bool:
+        return self._state == DONE
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        if self.error is not None:
+            raise self.error
+        completed: List[Tuple[str, Any]] = []
+        try:
+            for char in delta:
+                self._consume(char, completed)
+                self.position += 1
+        except ArgumentValidationError as error:
+            self.error = error
+            raise
+        return completed
+
+    def close(self) -> Dict[str, Any]:
+        if self.error is not None:
+            raise self.error
+        if self._state != DONE:
+            self._fail("the arguments object is incomplete")
+        missing = [
+            name for name in self.required if name not in self.arguments
+        ]
+        if missing:
+            self._fail(f"missing required arguments {', '.join(missing)}")
+        return dict(self.arguments)
+
+    def _fail(self, reason: str) -> None:
+        self.error = ArgumentValidationError(
+            f"Invalid arguments for {self.name} at position"
+            f" {self.position}: {reason}."
+        )
+        raise self.error
+
+    def _consume(self, char: str, completed: List[Tuple[str, Any]]) -> None:
+        state = self._state
+        if state == STRING_VALUE or state == KEY:
+            self._consume_string(char, completed)
+        elif state == CONTAINER_VALUE:
+            self._consume_container(char, completed)
+        elif state == SCALAR_VALUE:
+            if char in WHITESPACE or char in ",}":
+                self._complete_value(completed)
+                self._consume(char, completed)
+            else:
+                self._token.append(char)
+        elif char in WHITESPACE:
+            return
+        elif state == START:
+            if char != "{":
+                self._fail("expected a JSON object")
+            self._state = KEY_OR_END
+        elif state == KEY_OR_END:
+            self._consume_key_or_end(char)
+        elif state == COLON:
+            if char != ":":
+                self._fail(f"expected ':' after {self._key!r}")
+            self._state = VALUE_START
+        elif state == VALUE_START:
+            self._start_value(char)
+        elif state == AFTER_VALUE:
+            if char == ",":
+                self._state = KEY_OR_END
+                self._after_comma = True
+            elif char == "}":
+                self._state = DONE
+            else:
+                self._fail("expected ',' or '}'")
+        else:
+            self._fail("unexpected data after the arguments object")
+
+    def _consume_key_or_end(self, char: str) -> None:
+        if char == '"':
+            self._state = KEY
+            self._token = []
+            self._candidates = list(self.properties)
+            self._prefix_length = 0
+        elif char == "}" and not self._after_comma:
+            self._state = DONE
+        else:
+            self._fail("expected an argument name")
+
+    def _consume_string(
+        self,
+        char: str,
+        completed: List[Tuple[str, Any]],
+    ) -> None:
+        if self._escaped:
+            self._escaped = False
+        elif char == "\\":
+            self._escaped = True
+            # Only plain prefixes can be compared; escapes are checked once
+            #  the string is complete.
+            self._candidates = None
+        elif char == '"':
+            if self._state == KEY:
+                self._complete_key()
+            else:
+                self._token.append(char)
+                self._complete_value(completed)
+            return
+        self._token.append(char)
+        if self._candidates is not None:
+            self._check_string_prefix(char)
+
+    def _check_string_prefix(self, char: str) -> None:
+        # Narrows the candidates by one character at a time, so that long
+        #  strings are not rescanned on every character.
+        position = self._prefix_length
+        self._candidates = [
+            candidate
+            for candidate in self._candidates  # type: ignore
+            if isinstance(candidate, str)
+            and candidate[position : position + 1] == char
+        ]
+        self._prefix_length = position + 1
+        if not self._candidates:
+            if self._state == KEY:
+                prefix = "".join(self._token)
+                self._fail(f"unexpected argument starting with {prefix!r}")
+            prefix = "".join(self._token[1:])
+            self._fail(f"{self._key!r} cannot start with {prefix!r}")
+
+    def _complete_key(self) -> None:
+        key = json.loads('"' + "".join(self._token) + '"')
+        if key not in self.properties:
+            self._fail(f"unexpected argument {key!r}")
+        if key in self.arguments:
+            self._fail(f"duplicate argument {key!r}")
+        self._key = key
+        self._token = []
+        self._state = COLON
+        self._after_comma = False
+
+    def _start_value(self, char: str) -> None:
+        value_type = VALUE_START_TYPES.get(char)
+        if value_type is None:
+            self._fail(f"invalid value for {self._key!r}")
+        expected_type = self.properties[self._key].get("type")
+        if expected_type in JSON_TYPES and value_type != expected_type:
+            self._fail(f"{self._key!r} must be of type {expected_type}")
+
+        self._token = [char]
+        if value_type == "string":
+            self._state = STRING_VALUE
+            self._candidates = self.properties[self._key].get("enum")
+            self._prefix_length = 0
+        elif value_type in ("object", "array"):
+            self._state = CONTAINER_VALUE
+            self._depth = 1
+            self._in_string = False
+        else:
+            self._state = SCALAR_VALUE
+
+    def _consume_container(
+        self,
+        char: str,
+        completed: List[Tuple[str, Any]],
+    ) -> None:
+        self._token.append(char)
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+        elif char == '"':
+            self._in_string = True
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._complete_value(completed)
+
+    def _complete_value(self, completed: List[Tuple[str, Any]]) -> None:
+        key = self._key
+        try:
+            value = json.loads("".join(self._token))
+        except ValueError:
+            self._fail(f"invalid JSON value for {key!r}")
+        value = self.property_validators[key](value)  # type: ignore
+        self.arguments[key] = value  # type: ignore
+        completed.append((key, value))  # type: ignore
+        self._token = []
+        self._state = AFTER_VALUE
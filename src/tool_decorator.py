@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, NamedTuple, Optional
+
+from .get_function_calling_schema import get_function_calling_schema
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .tool_registry import ToolRegistry
+
+TOOL_OPTIONS_ATTRIBUTE = "__tool_options__"
+
+
+class ToolOptions(NamedTuple):
+    name: Optional[str] = None
+    include_long_description: bool = False
+    include_return_in_parameters: bool = False
+
+
+def tool(
+    func: Optional[Callable] = None,
+    name: Optional[str] = None,
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+    registry: Optional["ToolRegistry"] = None,
+) -> Callable:
+    # Marks a function as a tool without generating its schema, so that
+    #  importing a module of tools costs next to nothing. The function is
+    #  returned unchanged; `get_tool_schema` generates the schema on first
+    #  use. With `registry`, the tool is also registered lazily.
+    if func is None:
+        return lambda func: tool(
+            func,
+            name=name,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+            registry=registry,
+        )
+
+    setattr(
+        func,
+        TOOL_OPTIONS_ATTRIBUTE,
+        ToolOptions(
+            name=name,
+            include_long_description=include_long_description,
+            include_return_in_parameters=include_return_in_parameters,
+        ),
+    )
+    if registry is not None:
+        registry.register(func, name=name, lazy=True)
+    return func
+
+
+def get_tool_options(func: Callable) -> Optional[ToolOptions]:
+    return getattr(func, TOOL_OPTIONS_ATTRIBUTE, None)
+
+
+def is_tool(func: Any) -> bool:
+    return isinstance(get_tool_options(func), ToolOptions)
+
+
+def get_tool_schema(func: Callable) -> Dict[str, Any]:
+    # Generated with the options given to `@tool` and cached like any other
+    #  schema, so only the first call per function pays for parsing.
+    options = get_tool_options(func) or ToolOptions()
+    schema = get_function_calling_schema(
+        func,
+        include_long_description=options.include_long_description,
+        include_return_in_parameters=options.include_return_in_parameters,
+    )
+    if options.name is not None:
+        schema["name"] = options.name
+    return schema
@@ -0,0 +1,152 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Tuple
+
+from .get_function_calling_schema import get_function_calling_schema
+
+# Splits snake_case, camelCase and plain text alike.
+TOKEN_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from if in into is it its of on or that"
+    " the this to was when which will with".split()
+)
+
+# Terms in the tool name count as many times as this in the document.
+NAME_WEIGHT = 3
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        token = token.lower()
+        if token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def get_schema_terms(schema: Dict[str, Any]) -> Counter:
+    terms = Counter(tokenize(schema.get("description") or ""))
+    for property_schema in schema["parameters"]["properties"].values():
+        terms.update(tokenize(property_schema.get("description") or ""))
+    for term in tokenize(schema["name"]):
+        terms[term] += NAME_WEIGHT
+    return terms
+
+
+class ToolIndex:
+    # A BM25 index over the names and descriptions of tool schemas. Only the
+    #  postings of the query terms are visited, and the per-document weights
+    #  of a term are computed once and reused until the index changes.
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.k1 = k1
+        self.b = b
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._schemas
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def add(self, schema: Dict[str, Any]) -> None:
+        name = schema["name"]
+        terms = get_schema_terms(schema)
+        with self._lock:
+            self._remove(name)
+            self._schemas[name] = schema
+            self._terms[name] = terms
+            length = sum(terms.values())
+            self._lengths[name] = length
+            self._total_length += length
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[name] = frequency
+            self._weights = {}
+
+    def add_function(
+        self,
+        func: Callable,
+        include_long_description: bool = False,
+    ) -> Dict[str, Any]:
+        schema = get_function_calling_schema(
+            func, include_long_description=include_long_description
+        )
+        self.add(schema)
+        return schema
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._remove(name)
+            self._weights = {}
+
+    def rank(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        term_weights = []
+        for term in set(tokenize(query)):
+            weights = self._weights.get(term)
+            if weights is None:
+                weights = self._get_weights(term)
+            term_weights.append(weights)
+        if not term_weights:
+            return []
+
+        # Start from a copy of the longest postings, so only the shorter ones
+        #  are merged in Python.
+        term_weights.sort(key=len, reverse=True)
+        scores = dict(term_weights[0])
+        for weights in term_weights[1:]:
+            for name, weight in weights.items():
+                scores[name] = scores.get(name, 0.0) + weight
+        return heapq.nlargest(k, scores.items(), key=itemgetter(1))
+
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        # The indexed schemas are returned as they are, so callers must treat
+        #  them as read-only.
+        return [self._schemas[name] for name, _ in self.rank(query, k)]
+
+    def _get_weights(self, term: str) -> Dict[str, float]:
+        with self._lock:
+            postings = self._postings.get(term, {})
+            count = len(self._schemas)
+            average_length = self._total_length / count if count else 0.0
+            idf = math.log(
+                1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            length_weight = self.b / average_length if count else 0.0
+            weights = {}
+            for name, frequency in postings.items():
+                normalization = self.k1 * (
+                    1.0 - self.b + length_weight * self._lengths[name]
+                )
+                weights[name] = (
+                    idf
+                    * frequency
+                    * (self.k1 + 1.0)
+                    / (frequency + normalization)
+                )
+            self._weights[term] = weights
+        return weights
+
+    def _remove(self, name: str) -> None:
+        terms = self._terms.pop(name, None)
+        if terms is None:
+            return
+        del self._schemas[name]
+        self._total_length -= self._lengths.pop(name)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[name]
+            if not postings:
+                del self._postings[term]
@@ -0,0 +1,364 @@
+import json
+import threading
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .argument_validation import (
+    ArgumentValidator,
+    compile_argument_validator,
+    compile_property_validators,
+)
+from .async_api import run_tool_async
+from .compaction import CompactionResult, compact_schemas
+from .get_function_calling_schema import get_function_calling_schema
+from .introspection import get_annotations
+from .result_cache import ToolResultCache
+from .serialization import (
+    dumps_canonical,
+    get_tool_definition_bytes,
+    join_json_array,
+)
+from .streaming import PropertyValidators, StreamingArgumentsParser
+from .tool_decorator import ToolOptions, get_tool_options
+from .tool_index import ToolIndex
+from .tool_set import get_prefix_hash
+
+
+class ToolCallError(ValueError):
+    pass
+
+
+class RegisteredTool(NamedTuple):
+    name: str
+    func: Callable
+    schema: Dict[str, Any]
+    validator: ArgumentValidator
+    tool_definition_bytes: bytes
+
+
+class PendingTool(NamedTuple):
+    # Registered with `lazy=True`; compiled into a `RegisteredTool` when it
+    #  is first looked up or listed.
+    name: str
+    func: Callable
+
+
+class ToolCall(NamedTuple):
+    name: str
+    arguments: Any
+    id: Optional[str] = None
+
+
+def parse_tool_call(payload: Any) -> ToolCall:
+    # Accepts the `tool_calls[i]` entries of a chat completion (as dicts or
+    #  SDK objects), their inner `function` part, or the JSON text of either.
+    if isinstance(payload, (str, bytes, bytearray)):
+        try:
+            payload = json.loads(payload)
+        except ValueError as error:
+            raise ToolCallError(
+                f"Tool call is not valid JSON: {error}"
+            ) from error
+
+    if isinstance(payload, dict):
+        call_id = payload.get("id")
+        function = payload.get("function", payload)
+        if isinstance(function, dict):
+            name = function.get("name")
+            arguments = function.get("arguments", "{}")
+        else:
+            name = getattr(function, "name", None)
+            arguments = getattr(function, "arguments", "{}")
+    else:
+        call_id = getattr(payload, "id", None)
+        function = getattr(payload, "function", payload)
+        name = getattr(function, "name", None)
+        arguments = getattr(function, "arguments", "{}")
+
+    if not isinstance(name, str):
+        raise ToolCallError("Tool call has no function name.")
+    return ToolCall(name=name, arguments=arguments, id=call_id)
+
+
+def drop_return_argument(validator: ArgumentValidator) -> ArgumentValidator:
+    # With the return value among the parameters, the model fills it in
+    #  like any argument, but the function does not take it.
+    def validate_arguments(arguments: Any) -> Dict[str, Any]:
+        result = validator(arguments)
+        result.pop("return", None)
+        return result
+
+    return validate_arguments
+
+
+class ToolRegistry:
+    def __init__(
+        self,
+        include_long_description: bool = False,
+        canonical: bool = False,
+        result_cache: Optional[ToolResultCache] = None,
+    ):
+        # In canonical mode, schemas are canonicalized and tools are listed
+        #  by name, so that the `tools` prefix of every request is stable.
+        #  Dispatched calls go through `result_cache` when one is given.
+        self.include_long_description = include_long_description
+        self.canonical = canonical
+        self.result_cache = result_cache
+        self._tools: Dict[str, Union[RegisteredTool, PendingTool]] = {}
+        self._tool_definitions: Optional[List[Dict[str, Any]]] = None
+        self._tools_json: Optional[bytes] = None
+        self._compacted: Dict[int, CompactionResult] = {}
+        self._property_validators: Dict[str, PropertyValidators] = {}
+        self._index: Optional[ToolIndex] = None
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def __iter__(self) -> Iterator[RegisteredTool]:
+        return iter(self._compiled_tools())
+
+    def __getitem__(self, name: str) -> RegisteredTool:
+        try:
+            tool = self._tools[name]
+        except KeyError:
+            raise ToolCallError(f"Unknown tool {name}.") from None
+        if isinstance(tool, PendingTool):
+            tool = self._compile(tool)
+        return tool
+
+    def register(
+        self,
+        func: Optional[Callable] = None,
+        name: Optional[str] = None,
+        lazy: bool = False,
+    ) -> Callable:
+        # Usable as `registry.register(func)`, `@registry.register` and
+        #  `@registry.register(name=...)`. The name defaults to the one given
+        #  to `@tool`, then to the function name. With `lazy`, the schema is
+        #  only generated when the tool is first looked up or listed.
+        if func is None:
+            return lambda func: self.register(func, name=name, lazy=lazy)
+
+        if name is None:
+            options = get_tool_options(func)
+            name = options.name if options is not None else None
+        if lazy:
+            pending = PendingTool(name=name or func.__name__, func=func)
+            with self._lock:
+                self._tools[pending.name] = pending
+                self._invalidate(pending.name)
+                self._index = None
+            return func
+
+        tool = self._build_tool(func, name)
+        with self._lock:
+            self._tools[tool.name] = tool
+            self._invalidate(tool.name)
+            if self._index is not None:
+                self._index.add(tool.schema)
+        return func
+
+    def compile(self) -> None:
+        # Generates the schemas of every lazily registered tool, e.g. while
+        #  warming up a server before it takes requests.
+        self._compiled_tools()
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._tools.pop(name, None)
+            self._invalidate(name)
+            if self._index is not None:
+                self._index.remove(name)
+
+    def get_schema(self, name: str) -> Dict[str, Any]:
+        return self[name].schema
+
+    @property
+    def schemas(self) -> List[Dict[str, Any]]:
+        return [tool.schema for tool in self._ordered_tools()]
+
+    @property
+    def tools(self) -> List[Dict[str, Any]]:
+        # Built once per registry change and shared by every request, so
+        #  callers must treat the returned list as read-only.
+        tool_definitions = self._tool_definitions
+        if tool_definitions is None:
+            with self._lock:
+                tool_definitions = [
+                    {"type": "function", "function": tool.schema}
+                    for tool in self._ordered_tools()
+                ]
+                self._tool_definitions = tool_definitions
+        return tool_definitions
+
+    @property
+    def tools_json(self) -> bytes:
+        # `tools` as canonical JSON, joined from the bytes encoded for each
+        #  tool at registration.
+        tools_json = self._tools_json
+        if tools_json is None:
+            with self._lock:
+                tools_json = join_json_array(
+                    tool.tool_definition_bytes
+                    for tool in self._ordered_tools()
+                )
+                self._tools_json = tools_json
+        return tools_json
+
+    def compact_schemas(self, budget: int) -> CompactionResult:
+        # Cached per budget until the registry changes; the compacted
+        #  schemas are shared and must be treated as read-only.
+        result = self._compacted.get(budget)
+        if result is None:
+            result = compact_schemas(self.schemas, budget)
+            with self._lock:
+                self._compacted[budget] = result
+        return result
+
+    def select_tools(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        # The k tools most relevant to the query, in the `tools` format. The
+        #  index is built on first use and kept up to date afterwards.
+        index = self._index
+        if index is None:
+            with self._lock:
+                index = ToolIndex()
+                for tool in self._compiled_tools():
+                    index.add(tool.schema)
+                self._index = index
+        return [
+            {"type": "function", "function": schema}
+            for schema in index.search(query, k)
+        ]
+
+    @property
+    def prefix_hash(self) -> str:
+        return get_prefix_hash(self.tools_json)
+
+    def _ordered_tools(self) -> List[RegisteredTool]:
+        tools = self._compiled_tools()
+        if self.canonical:
+            tools.sort(key=lambda tool: tool.name)
+        return tools
+
+    def _compiled_tools(self) -> List[RegisteredTool]:
+        return [
+            self._compile(tool) if isinstance(tool, PendingTool) else tool
+            for tool in list(self._tools.values())
+        ]
+
+    def _compile(self, pending: PendingTool) -> RegisteredTool:
+        tool = self._build_tool(pending.func, pending.name)
+        with self._lock:
+            # Unless the name was registered again in the meantime.
+            if self._tools.get(pending.name) is pending:
+                self._tools[pending.name] = tool
+        return tool
+
+    def _build_tool(
+        self,
+        func: Callable,
+        name: Optional[str],
+    ) -> RegisteredTool:
+        # Functions marked with `@tool` keep the options given there, so
+        #  that their schema matches `get_tool_schema`.
+        options = get_tool_options(func)
+        if options is None:
+            options = ToolOptions(
+                include_long_description=self.include_long_description
+            )
+        schema = get_function_calling_schema(
+            func,
+            include_long_description=options.include_long_description,
+            include_return_in_parameters=(
+                options.include_return_in_parameters
+            ),
+            canonical=self.canonical,
+        )
+        if name is not None:
+            schema["name"] = name
+        validator = compile_argument_validator(
+            schema, annotations=get_annotations(func)
+        )
+        if options.include_return_in_parameters:
+            validator = drop_return_argument(validator)
+        return RegisteredTool(
+            name=schema["name"],
+            func=func,
+            schema=schema,
+            validator=validator,
+            tool_definition_bytes=get_tool_definition_bytes(
+                dumps_canonical(schema)
+            ),
+        )
+
+    def _invalidate(self, name: str) -> None:
+        self._tool_definitions = None
+        self._tools_json = None
+        self._compacted = {}
+        self._property_validators.pop(name, None)
+
+    def bind(self, payload: Any) -> Tuple[RegisteredTool, Dict[str, Any]]:
+        tool_call = parse_tool_call(payload)
+        tool = self[tool_call.name]
+        return tool, tool.validator(tool_call.arguments)
+
+    def dispatch(self, payload: Any) -> Any:
+        tool, arguments = self.bind(payload)
+        if self.result_cache is not None:
+            return self.result_cache.call(
+                tool.name,
+                tool.func,
+                arguments,
+                properties=tool.schema["parameters"]["properties"],
+            )
+        return tool.func(**arguments)
+
+    async def dispatch_async(
+        self,
+        payload: Any,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> Any:
+        # `async def` tools are awaited on the running loop, sync tools run
+        #  in `executor` (the loop's default thread pool when not given).
+        tool, arguments = self.bind(payload)
+        if self.result_cache is not None:
+            return await self.result_cache.call_async(
+                tool.name,
+                lambda: run_tool_async(
+                    tool.func, arguments, timeout=timeout, executor=executor
+                ),
+                tool.func,
+                arguments,
+                properties=tool.schema["parameters"]["properties"],
+            )
+        return await run_tool_async(
+            tool.func, arguments, timeout=timeout, executor=executor
+        )
+
+    def stream_arguments(self, name: str) -> StreamingArgumentsParser:
+        tool = self[name]
+        property_validators = self._property_validators.get(name)
+        if property_validators is None:
+            property_validators = compile_property_validators(
+                tool.schema,
+                annotations=get_annotations(tool.func),
+            )
+            self._property_validators[name] = property_validators
+        return StreamingArgumentsParser(
+            tool.schema, property_validators=property_validators
+        )
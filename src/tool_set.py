@@ -0,0 +1,50 @@
+import hashlib
+from typing import Callable, Iterable, NamedTuple, Tuple
+
+from .get_function_calling_schema import get_function_calling_schema_bytes
+from .serialization import get_tool_definition_bytes, join_json_array
+
+
+class ToolSetError(ValueError):
+    pass
+
+
+class ToolSet(NamedTuple):
+    names: Tuple[str, ...]
+    tools_json: bytes
+    prefix_hash: str
+
+
+def get_prefix_hash(tools_json: bytes) -> str:
+    return hashlib.sha256(tools_json).hexdigest()
+
+
+def build_tool_set(
+    funcs: Iterable[Callable],
+    include_long_description: bool = False,
+    include_return_in_parameters: bool = False,
+) -> ToolSet:
+    # Providers only reuse a cached prompt prefix when the tool definitions
+    #  are byte-identical, so tools are ordered by name and serialized from
+    #  canonical schemas regardless of the order they were given in.
+    fragments = {}
+    for func in funcs:
+        name = func.__name__
+        if name in fragments:
+            raise ToolSetError(f"Function name {name} appears more than once.")
+        fragments[name] = get_tool_definition_bytes(
+            get_function_calling_schema_bytes(
+                func,
+                include_long_description=include_long_description,
+                include_return_in_parameters=include_return_in_parameters,
+                canonical=True,
+            )
+        )
+
+    names = tuple(sorted(fragments))
+    tools_json = join_json_array(fragments[name] for name in names)
+    return ToolSet(
+        names=names,
+        tools_json=tools_json,
+        prefix_hash=get_prefix_hash(tools_json),
+    )
@@ -0,0 +1,343 @@
+import collections.abc
+import dataclasses
+import enum
+import types
+import typing
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+DEFS_KEY = "$defs"
+REF_PREFIX = f"#/{DEFS_KEY}/"
+
+# Integers are "number" like everywhere else in the generated schemas.
+CLASS_JSON_TYPES = {
+    bool: "boolean",
+    int: "number",
+    float: "number",
+    str: "string",
+    bytes: "string",
+    list: "array",
+    tuple: "array",
+    set: "array",
+    frozenset: "array",
+    dict: "object",
+    type(None): "null",
+}
+# String annotations, e.g. under `from __future__ import annotations`, that
+#  could not be resolved are matched by name.
+NAME_JSON_TYPES = {
+    **{cls.__name__: json_type for cls, json_type in CLASS_JSON_TYPES.items()},
+    "None": "null",
+}
+
+ARRAY_ORIGINS = (
+    list,
+    set,
+    frozenset,
+    collections.abc.Sequence,
+    collections.abc.MutableSequence,
+    collections.abc.Set,
+    collections.abc.MutableSet,
+    collections.abc.Iterable,
+)
+OBJECT_ORIGINS = (
+    dict,
+    collections.abc.Mapping,
+    collections.abc.MutableMapping,
+)
+UNION_ORIGINS = (Union, types.UnionType)
+
+
+class TypeConversionError(ValueError):
+    pass
+
+
+class TypeSchema(NamedTuple):
+    schema: Dict[str, Any]
+    defs: Dict[str, Dict[str, Any]]
+
+
+# Returned for types the converter does not know, which keep the historical
+#  "string" fallback. Callers with a better guess, such as a type name from
+#  the docstring, compare against this instance.
+UNKNOWN_TYPE = TypeSchema({"type": "string"}, {})
+
+
+# Converted types, shared by every function. Named types (dataclasses,
+#  TypedDicts and enums) map to a `$ref` plus the definitions it needs, so a
+#  type shared by many tools is converted only once. Entries are never
+#  mutated; callers copy the fragments they put into a schema. Types are
+#  weakly referenced, so that classes defined in closures or reloaded
+#  modules are not kept alive, and those that cannot be are not memoized.
+TYPE_SCHEMAS: "weakref.WeakKeyDictionary[Any, TypeSchema]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def convert_type(annotation: Any) -> TypeSchema:
+    return TypeConverter().convert(annotation)
+
+
+def clear_type_schemas() -> None:
+    TYPE_SCHEMAS.clear()
+
+
+def is_named_type(annotation: Any) -> bool:
+    return isinstance(annotation, type) and (
+        dataclasses.is_dataclass(annotation)
+        or typing.is_typeddict(annotation)
+        or issubclass(annotation, enum.Enum)
+    )
+
+
+def merge_defs(
+    defs: Dict[str, Dict[str, Any]],
+    other_defs: Dict[str, Dict[str, Any]],
+) -> None:
+    for name, definition in other_defs.items():
+        existing = defs.setdefault(name, definition)
+        if existing is not definition and existing != definition:
+            raise TypeConversionError(
+                f"Different types are both named {name}."
+            )
+
+
+def merge_type_schema(
+    defs: Dict[str, Dict[str, Any]],
+    type_schema: TypeSchema,
+) -> Dict[str, Any]:
+    # Adds the definitions a converted type needs to `defs` and returns its
+    #  schema. A different type with a name already in `defs` gets the name
+    #  with the first free numeric suffix, e.g. `Address2`, and references
+    #  to it are renamed to match.
+    renames: Dict[str, str] = {}
+    changed = True
+    while changed:
+        changed = False
+        for name, definition in type_schema.defs.items():
+            if name in renames:
+                continue
+            existing = defs.get(name)
+            if existing is None or existing is definition:
+                continue
+            if existing == rename_refs(definition, renames):
+                continue
+            index = 2
+            while (
+                f"{name}{index}" in defs
+                or f"{name}{index}" in type_schema.defs
+                or f"{name}{index}" in renames.values()
+            ):
+                index += 1
+            renames[name] = f"{name}{index}"
+            changed = True
+
+    for name, definition in type_schema.defs.items():
+        defs.setdefault(
+            renames.get(name, name), rename_refs(definition, renames)
+        )
+    return rename_refs(type_schema.schema, renames)
+
+
+def rename_refs(schema: Any, renames: Dict[str, str]) -> Any:
+    # Returns `schema` itself when nothing is renamed, and a copy otherwise.
+    if not renames:
+        return schema
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        renamed = {
+            key: rename_refs(value, renames) for key, value in schema.items()
+        }
+        if isinstance(ref, str) and ref.startswith(REF_PREFIX):
+            name = ref[len(REF_PREFIX) :]
+            renamed["$ref"] = REF_PREFIX + renames.get(name, name)
+        return renamed
+    if isinstance(schema, list):
+        return [rename_refs(value, renames) for value in schema]
+    return schema
+
+
+class TypeConverter:
+    # Converts one annotation at a time. The converter tracks the named
+    #  types whose definitions are still being built, so that recursive
+    #  types become `$ref`s and partial results are never memoized.
+    def __init__(self) -> None:
+        self._stack: List[Any] = []
+        self._lowest_reference = 0
+
+    def convert(self, annotation: Any) -> TypeSchema:
+        try:
+            cached = TYPE_SCHEMAS.get(annotation)
+        except TypeError:
+            return self._convert(annotation)
+        if cached is not None:
+            return cached
+
+        if annotation in self._stack:
+            self._lowest_reference = min(
+                self._lowest_reference, self._stack.index(annotation)
+            )
+            return TypeSchema({"$ref": REF_PREFIX + annotation.__name__}, {})
+
+        depth = len(self._stack)
+        lowest_reference = self._lowest_reference
+        self._lowest_reference = depth
+        type_schema = self._convert(annotation)
+        # Results that refer to a type still under construction lack its
+        #  definition, and are only complete within that type.
+        if self._lowest_reference >= depth:
+            TYPE_SCHEMAS[annotation] = type_schema
+        self._lowest_reference = min(lowest_reference, self._lowest_reference)
+        return type_schema
+
+    def _convert(self, annotation: Any) -> TypeSchema:
+        if annotation is None or annotation is type(None):
+            return TypeSchema({"type": "null"}, {})
+        if is_named_type(annotation):
+            return self._convert_named_type(annotation)
+        if isinstance(annotation, type):
+            json_type = CLASS_JSON_TYPES.get(annotation)
+            if json_type is None:
+                json_type = next(
+                    (
+                        json_type
+                        for cls, json_type in CLASS_JSON_TYPES.items()
+                        if issubclass(annotation, cls)
+                    ),
+                    None,
+                )
+            if json_type is None:
+                return UNKNOWN_TYPE
+            return TypeSchema({"type": json_type}, {})
+        return self._convert_generic(annotation)
+
+    def _convert_generic(self, annotation: Any) -> TypeSchema:
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin is typing.Literal:
+            return TypeSchema(get_literal_schema(args), {})
+        if origin is typing.Annotated:
+            return self.convert(args[0])
+        if origin in UNION_ORIGINS:
+            return self._convert_union(args)
+        if origin is tuple:
+            return self._convert_tuple(args)
+        if origin in ARRAY_ORIGINS:
+            if not args:
+                return TypeSchema({"type": "array"}, {})
+            items = self.convert(args[0])
+            return TypeSchema(
+                {"type": "array", "items": items.schema}, items.defs
+            )
+        if origin in OBJECT_ORIGINS:
+            if len(args) < 2:
+                return TypeSchema({"type": "object"}, {})
+            values = self.convert(args[1])
+            return TypeSchema(
+                {"type": "object", "additionalProperties": values.schema},
+                values.defs,
+            )
+        if annotation is Any:
+            return TypeSchema({}, {})
+        if isinstance(annotation, str) and annotation in NAME_JSON_TYPES:
+            return TypeSchema({"type": NAME_JSON_TYPES[annotation]}, {})
+        return UNKNOWN_TYPE
+
+    def _convert_union(self, args: tuple) -> TypeSchema:
+        defs: Dict[str, Dict[str, Any]] = {}
+        options = []
+        for arg in args:
+            option = merge_type_schema(defs, self.convert(arg))
+            if option not in options:
+                options.append(option)
+        if len(options) == 1:
+            return TypeSchema(options[0], defs)
+        return TypeSchema({"anyOf": options}, defs)
+
+    def _convert_tuple(self, args: tuple) -> TypeSchema:
+        if not args or args == ((),):
+            return TypeSchema({"type": "array"}, {})
+        if len(args) == 2 and args[1] is Ellipsis:
+            items = self.convert(args[0])
+            return TypeSchema(
+                {"type": "array", "items": items.schema}, items.defs
+            )
+        defs: Dict[str, Dict[str, Any]] = {}
+        prefix_items = []
+        for arg in args:
+            prefix_items.append(merge_type_schema(defs, self.convert(arg)))
+        return TypeSchema(
+            {
+                "type": "array",
+                "prefixItems": prefix_items,
+                "minItems": len(args),
+                "maxItems": len(args),
+            },
+            defs,
+        )
+
+    def _convert_named_type(self, cls: type) -> TypeSchema:
+        name = cls.__name__
+        if issubclass(cls, enum.Enum):
+            definition = get_literal_schema(
+                tuple(member.value for member in cls)
+            )
+            return TypeSchema({"$ref": REF_PREFIX + name}, {name: definition})
+
+        self._stack.append(cls)
+        try:
+            field_types, required = get_field_types(cls)
+            defs: Dict[str, Dict[str, Any]] = {}
+            properties = {}
+            for field_name, field_type in field_types.items():
+                properties[field_name] = merge_type_schema(
+                    defs, self.convert(field_type)
+                )
+        finally:
+            self._stack.pop()
+
+        definition = {
+            "type": "object",
+            "properties": properties,
+            "required": required,
+        }
+        # References in the fields cannot tell this type apart from another
+        #  one of the same name, so such a clash is an error.
+        merge_defs(defs, {name: definition})
+        return TypeSchema({"$ref": REF_PREFIX + name}, defs)
+
+
+def get_field_types(cls: type) -> Tuple[Dict[str, Any], List[str]]:
+    try:
+        hints = typing.get_type_hints(cls)
+    except (NameError, TypeError):
+        # Unresolvable forward references fall back to the raw annotations.
+        hints = dict(getattr(cls, "__annotations__", {}))
+
+    if dataclasses.is_dataclass(cls):
+        fields = [field for field in dataclasses.fields(cls) if field.init]
+        return (
+            {field.name: hints.get(field.name, Any) for field in fields},
+            [
+                field.name
+                for field in fields
+                if field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING
+            ],
+        )
+
+    required_keys = getattr(cls, "__required_keys__", frozenset(hints))
+    return (
+        hints,
+        [field_name for field_name in hints if field_name in required_keys],
+    )
+
+
+def get_literal_schema(values: tuple) -> Dict[str, Any]:
+    json_types = {CLASS_JSON_TYPES.get(type(value)) for value in values}
+    schema: Dict[str, Any] = {"enum": list(values)}
+    if len(json_types) == 1:
+        json_type: Optional[str] = json_types.pop()
+        if json_type is not None:
+            schema = {"type": json_type, **schema}
+    return schema
@@ -0,0 +1,159 @@
+import unittest
+from typing import Literal, Optional, Union
+
+from src.argument_validation import (
+    ArgumentValidationError,
+    compile_argument_validator,
+    compile_property_validators,
+    get_argument_validator,
+    validate_arguments,
+)
+from src.get_function_calling_schema import get_function_calling_schema
+from src.introspection import get_annotations
+
+
+def func(
+    i: int,
+    f: float,
+    e: Literal["a", "b"],
+    b: bool = False,
+    s: str = "",
+    l: list = None,
+    d: dict = None,
+):
+    """
+    Short description.
+
+    Args:
+        i: Integer parameter.
+        f: Float parameter.
+        e: Enum parameter.
+        b: Boolean parameter.
+        s: String parameter.
+        l: List parameter.
+        d: Dictionary parameter.
+    """
+    pass
+
+
+def postponed(i: "int", f: "float"):
+    """
+    Short description.
+
+    Args:
+        i: Integer parameter.
+        f: Float parameter.
+    """
+    pass
+
+
+def optional(
+    i: Optional[int] = None,
+    f: Union[float, str, None] = None,
+    e: Optional[Literal["a", "b"]] = None,
+):
+    """
+    Short description.
+
+    Args:
+        i: Optional integer parameter.
+        f: Float or string parameter.
+        e: Optional enum parameter.
+    """
+    pass
+
+
+class TestArgumentValidation(unittest.TestCase):
+    def test_coercion(self):
+        arguments = validate_arguments(
+            func,
+            '{"i": 1.0, "f": 2, "e": "a", "b": true, "l": [1], "d": {}}',
+        )
+        self.assertEqual(
+            arguments,
+            {"i": 1, "f": 2.0, "e": "a", "b": True, "l": [1], "d": {}},
+        )
+        self.assertIs(type(arguments["i"]), int)
+        self.assertIs(type(arguments["f"]), float)
+
+    def test_coercion_with_postponed_annotations(self):
+        arguments = validate_arguments(postponed, '{"i": 1.0, "f": 2}')
+        self.assertIs(type(arguments["i"]), int)
+        self.assertIs(type(arguments["f"]), float)
+
+    def test_invalid_arguments(self):
+        for arguments in [
+            "not json",
+            "[1, 2]",
+            {"f": 1, "e": "a"},
+            {"i": 1, "f": 1, "e": "a", "x": 1},
+            {"i": 1.5, "f": 1, "e": "a"},
+            {"i": True, "f": 1, "e": "a"},
+            {"i": 1, "f": "1", "e": "a"},
+            {"i": 1, "f": 1, "e": "c"},
+            {"i": 1, "f": 1, "e": "a", "b": 1},
+            {"i": 1, "f": 1, "e": "a", "s": 1},
+            {"i": 1, "f": 1, "e": "a", "l": {}},
+            {"i": 1, "f": 1, "e": "a", "d": []},
+        ]:
+            with self.subTest(arguments=arguments):
+                with self.assertRaises(ArgumentValidationError):
+                    validate_arguments(func, arguments)
+
+    def test_unions(self):
+        arguments = validate_arguments(optional, {"i": 1.0, "f": 2, "e": "a"})
+        self.assertEqual(arguments, {"i": 1, "f": 2.0, "e": "a"})
+        self.assertIs(type(arguments["i"]), int)
+        self.assertIs(type(arguments["f"]), float)
+        for arguments in [
+            {"i": None, "f": None, "e": None},
+            {"f": "text"},
+        ]:
+            with self.subTest(arguments=arguments):
+                self.assertEqual(
+                    validate_arguments(optional, arguments), arguments
+                )
+        for arguments in [
+            {"i": 1.5},
+            {"i": "1"},
+            {"f": True},
+            {"f": []},
+            {"e": "c"},
+        ]:
+            with self.subTest(arguments=arguments):
+                with self.assertRaises(ArgumentValidationError):
+                    validate_arguments(optional, arguments)
+
+        validators = compile_property_validators(
+            get_function_calling_schema(optional), get_annotations(optional)
+        )
+        self.assertIs(type(validators["f"](2)), float)
+        with self.assertRaises(ArgumentValidationError):
+            validators["e"]("c")
+
+    def test_validator_is_cached(self):
+        self.assertIs(
+            get_argument_validator(func), get_argument_validator(func)
+        )
+
+    def test_compile_from_schema(self):
+        validator = compile_argument_validator(
+            {
+                "name": "tool",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "n": {"type": "number", "description": ""},
+                        "quoted'name": {"type": "string", "description": ""},
+                    },
+                    "required": ["n"],
+                },
+            }
+        )
+        self.assertEqual(validator({"n": 1.5}), {"n": 1.5})
+        self.assertEqual(
+            validator(b'{"n": 1, "quoted\'name": "x"}'),
+            {"n": 1, "quoted'name": "x"},
+        )
+        with self.assertRaises(ArgumentValidationError):
+            validator({})
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.async_api import ToolTimeoutError, get_function_calling_schemas_async
+from src.get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+)
+from src.tool_registry import ToolRegistry
+
+
+def lookup(key: str, retries: int = 0):
+    """
+    Look up a key.
+
+    Args:
+        key: Key to look up.
+        retries: Number of retries.
+    """
+    return threading.current_thread() is threading.main_thread()
+
+
+async def lookup_async(key: str, retries: int = 0):
+    """
+    Look up a key.
+
+    Args:
+        key: Key to look up.
+        retries: Number of retries.
+    """
+    await asyncio.sleep(0)
+    return key
+
+
+async def hang(seconds: float):
+    """
+    Sleep for a while.
+
+    Args:
+        seconds: Time to sleep.
+    """
+    await asyncio.sleep(seconds)
+
+
+def block(seconds: float):
+    """
+    Block for a while.
+
+    Args:
+        seconds: Time to block.
+    """
+    time.sleep(seconds)
+
+
+async def fetch(url: str):
+    """
+    Fetch a URL.
+
+    Args:
+        url: URL to fetch.
+    """
+    raise asyncio.TimeoutError("connection timed out")
+
+
+def undocumented():
+    pass
+
+
+class TestAsyncApi(unittest.TestCase):
+    def setUp(self):
+        self.registry = ToolRegistry()
+        for func in [lookup, lookup_async, hang, block, fetch]:
+            self.registry.register(func)
+
+    def test_coroutine_functions_match_sync_schema(self):
+        schema = get_function_calling_schema(lookup_async)
+        self.assertEqual(schema["name"], "lookup_async")
+        schema["name"] = "lookup"
+        self.assertEqual(schema, get_function_calling_schema(lookup))
+
+    def test_schemas_async(self):
+        async def run():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                return await get_function_calling_schemas_async(
+                    [lookup, undocumented, lookup_async],
+                    executor=executor,
+                    chunk_size=1,
+                )
+
+        schemas = asyncio.run(run())
+        self.assertEqual(schemas[0], get_function_calling_schema(lookup))
+        self.assertIsInstance(schemas[1], FunctionDescriptionError)
+        self.assertEqual(schemas[2], get_function_calling_schema(lookup_async))
+
+    def test_dispatch_async(self):
+        async def run():
+            return await asyncio.gather(
+                self.registry.dispatch_async(
+                    {"name": "lookup_async", "arguments": '{"key": "a"}'}
+                ),
+                self.registry.dispatch_async(
+                    {"name": "lookup", "arguments": '{"key": "a"}'}
+                ),
+            )
+
+        # Async tools run on the loop, sync tools in a worker thread.
+        self.assertEqual(asyncio.run(run()), ["a", False])
+
+    def test_timeouts(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown, wait=False)
+
+        async def run(name, seconds):
+            await self.registry.dispatch_async(
+                {"name": name, "arguments": {"seconds": seconds}},
+                timeout=0.01,
+                executor=executor,
+            )
+
+        for name, seconds in [("hang", 5), ("block", 0.2)]:
+            with self.subTest(name=name):
+                started = time.perf_counter()
+                with self.assertRaises(ToolTimeoutError):
+                    asyncio.run(run(name, seconds))
+                self.assertLess(time.perf_counter() - started, 0.15)
+
+    def test_timeouts_raised_by_tools_are_passed_on(self):
+        for timeout in [None, 5]:
+            with self.subTest(timeout=timeout):
+                with self.assertRaises(asyncio.TimeoutError) as context:
+                    asyncio.run(
+                        self.registry.dispatch_async(
+                            {"name": "fetch", "arguments": {"url": "x"}},
+                            timeout=timeout,
+                        )
+                    )
+                self.assertNotIsInstance(context.exception, ToolTimeoutError)
+                self.assertEqual(
+                    str(context.exception), "connection timed out"
+                )
+
+    def test_cancellation(self):
+        async def run():
+            task = asyncio.ensure_future(
+                self.registry.dispatch_async(
+                    {"name": "hang", "arguments": '{"seconds": 5}'}
+                )
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
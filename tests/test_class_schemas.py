@@ -0,0 +1,154 @@
+import unittest
+from unittest import mock
+
+from src import class_schemas
+from src.class_schemas import (
+    get_class_function_calling_schemas,
+    invalidate_class_schemas,
+)
+from src.get_function_calling_schema import get_function_calling_schema
+
+
+class Service:
+    def __init__(self, region: str):
+        self.region = region
+
+    def get_weather(self, city: str, unit: str = "celsius"):
+        """
+        Get the current weather.
+
+        Args:
+            city: City to get the weather for.
+            unit: Temperature unit.
+        """
+        pass
+
+    @classmethod
+    def create(cls, region: str):
+        """
+        Create a service.
+
+        Args:
+            region: Region to serve.
+        """
+        return cls(region)
+
+    @staticmethod
+    def convert(value: float):
+        """
+        Convert a temperature to fahrenheit.
+
+        Args:
+            value: Temperature in celsius.
+        """
+        return value * 9 / 5 + 32
+
+    def helper(self):
+        pass
+
+    def _private(self, value: int):
+        """
+        Do something internal.
+
+        Args:
+            value: A value.
+        """
+        pass
+
+    @property
+    def name(self) -> str:
+        """The name of the service."""
+        return "service"
+
+
+class ExtendedService(Service):
+    def get_weather(self, city: str):
+        """
+        Get the current weather, in celsius.
+
+        Args:
+            city: City to get the weather for.
+        """
+        pass
+
+    def forecast(self, city: str, days: int = 3):
+        """
+        Get the forecast.
+
+        Args:
+            city: City to get the forecast for.
+            days: Number of days.
+        """
+        pass
+
+
+class TestClassSchemas(unittest.TestCase):
+    def setUp(self):
+        invalidate_class_schemas()
+
+    def test_methods_match_bound_method_schemas(self):
+        service = Service("eu")
+        schemas = get_class_function_calling_schemas(service)
+        self.assertEqual(sorted(schemas), ["convert", "create", "get_weather"])
+        for name in schemas:
+            with self.subTest(name=name):
+                self.assertEqual(
+                    schemas[name],
+                    get_function_calling_schema(getattr(service, name)),
+                )
+        self.assertNotIn(
+            "self", schemas["get_weather"]["parameters"]["properties"]
+        )
+        self.assertNotIn("cls", schemas["create"]["parameters"]["properties"])
+        self.assertEqual(
+            schemas["convert"]["parameters"]["required"], ["value"]
+        )
+
+    def test_private_methods(self):
+        schemas = get_class_function_calling_schemas(
+            Service, include_private=True
+        )
+        self.assertIn("_private", schemas)
+        self.assertNotIn("__init__", schemas)
+
+    def test_inherited_methods(self):
+        schemas = get_class_function_calling_schemas(ExtendedService)
+        self.assertEqual(
+            sorted(schemas), ["convert", "create", "forecast", "get_weather"]
+        )
+        self.assertEqual(
+            schemas["get_weather"]["parameters"]["required"], ["city"]
+        )
+        self.assertNotIn(
+            "unit", schemas["get_weather"]["parameters"]["properties"]
+        )
+
+    def test_instances_share_the_class_cache(self):
+        with mock.patch.object(
+            class_schemas,
+            "get_function_calling_schema",
+            wraps=class_schemas.get_function_calling_schema,
+        ) as generate:
+            first = get_class_function_calling_schemas(Service("eu"))
+            calls = generate.call_count
+            for region in ["us", "ap", "sa"]:
+                self.assertEqual(
+                    get_class_function_calling_schemas(Service(region)), first
+                )
+            self.assertEqual(generate.call_count, calls)
+
+            first["get_weather"]["name"] = "changed"
+            self.assertEqual(
+                get_class_function_calling_schemas(Service)["get_weather"][
+                    "name"
+                ],
+                "get_weather",
+            )
+
+            invalidate_class_schemas(Service)
+            get_class_function_calling_schemas(Service)
+            self.assertEqual(generate.call_count, calls * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
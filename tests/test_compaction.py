@@ -0,0 +1,137 @@
+import gc
+import unittest
+import weakref
+from dataclasses import dataclass
+from typing import Literal
+
+from src.compaction import (
+    COMPACTION_CACHE,
+    compact_function_calling_schemas,
+    compact_schemas,
+    estimate_tokens,
+    truncate_description,
+)
+from src.get_function_calling_schema import get_function_calling_schema
+from src.tool_registry import ToolRegistry
+
+
+@dataclass
+class Filter:
+    field: str
+
+
+def search(
+    query: str,
+    mode: Literal["fast", "exact"],
+    limit: int = 10,
+    filter: Filter = None,
+):
+    """
+    Search the record store.
+
+    Runs a full text search over every record in the store and returns the
+    matching records ordered by relevance, most relevant first.
+
+    Args:
+        query: Text to search for. Supports quoted phrases and boolean
+            operators, which are applied before ranking.
+        mode: Whether to favour speed or exact matches.
+        limit: Maximum number of records to return.
+        filter: Restricts the search to matching records.
+    """
+    pass
+
+
+class TestCompaction(unittest.TestCase):
+    def setUp(self):
+        COMPACTION_CACHE.clear()
+        self.schema = get_function_calling_schema(
+            search, include_long_description=True
+        )
+        self.tokens = estimate_tokens(self.schema)
+
+    def test_large_budget_is_untouched(self):
+        result = compact_schemas([self.schema], self.tokens)
+        self.assertEqual(result.schemas, [self.schema])
+        self.assertEqual(result.stages, [])
+        self.assertEqual(result.tokens_before, result.tokens_after)
+        self.assertTrue(result.within_budget)
+
+    def test_stages_apply_in_order(self):
+        result = compact_schemas([self.schema], self.tokens - 1)
+        self.assertEqual(result.stages, ["drop_long_descriptions"])
+        self.assertEqual(
+            result.schemas[0]["description"], "Search the record store."
+        )
+        self.assertLess(result.tokens_after, result.tokens_before)
+
+        result = compact_schemas([self.schema], 0)
+        self.assertFalse(result.within_budget)
+        self.assertEqual(
+            result.stages,
+            [
+                "drop_long_descriptions",
+                "truncate_parameter_descriptions",
+                "drop_optional_parameters",
+                "drop_string_types",
+            ],
+        )
+        parameters = result.schemas[0]["parameters"]
+        self.assertEqual(list(parameters["properties"]), ["query", "mode"])
+        self.assertNotIn("$defs", parameters)
+        self.assertEqual(
+            parameters["properties"]["query"],
+            {"description": "Text to search for."},
+        )
+        self.assertEqual(
+            parameters["properties"]["mode"]["enum"], ["fast", "exact"]
+        )
+        # The input schemas are left alone.
+        self.assertIn("$defs", self.schema["parameters"])
+
+    def test_truncate_description(self):
+        self.assertEqual(truncate_description("One. Two."), "One.")
+        truncated = truncate_description("word " * 40)
+        self.assertLessEqual(len(truncated), 80)
+        self.assertTrue(truncated.endswith("word"))
+
+    def test_cached_per_budget(self):
+        first = compact_function_calling_schemas(
+            [search], 10, include_long_description=True
+        )
+        second = compact_function_calling_schemas(
+            [search], 10, include_long_description=True
+        )
+        self.assertEqual(first, second)
+        self.assertIsNot(first.schemas, second.schemas)
+        other = compact_function_calling_schemas(
+            [search], 10**6, include_long_description=True
+        )
+        self.assertEqual(other.stages, [])
+
+    def test_cache_holds_no_references_to_functions(self):
+        namespace = {}
+        exec(
+            "def lookup(key: str):\n"
+            '    """\n'
+            "    Look a key up.\n\n"
+            "    Args:\n"
+            "        key: Key to look up.\n"
+            '    """\n',
+            namespace,
+        )
+        code = weakref.ref(namespace["lookup"].__code__)
+        result = compact_function_calling_schemas([namespace["lookup"]], 0)
+        namespace.clear()
+        gc.collect()
+        self.assertIsNone(code())
+        self.assertEqual(result.schemas[0]["name"], "lookup")
+
+    def test_registry(self):
+        registry = ToolRegistry(include_long_description=True)
+        registry.register(search)
+        result = registry.compact_schemas(self.tokens - 1)
+        self.assertIs(registry.compact_schemas(self.tokens - 1), result)
+        self.assertEqual(result.stages, ["drop_long_descriptions"])
+        registry.unregister("search")
+        self.assertEqual(registry.compact_schemas(self.tokens - 1).schemas, [])
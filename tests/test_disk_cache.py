@@ -0,0 +1,211 @@
+import errno
+import os
+import sys
+import tempfile
+import textwrap
+import types
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from unittest import mock
+
+from src.disk_cache import DiskSchemaCache, compute_cache_key
+from src.get_function_calling_schema import (
+    disable_disk_cache,
+    enable_disk_cache,
+    get_function_calling_schema,
+    get_schema_options,
+    invalidate_schema_cache,
+)
+
+
+@dataclass
+class Location:
+    city: str
+
+
+def get_weather(location: Location, unit: str = "celsius"):
+    """
+    Get the current weather.
+
+    Args:
+        location: Where to get the weather for.
+        unit: Temperature unit.
+    """
+    pass
+
+
+POSTPONED_SOURCE = textwrap.dedent('''
+    from __future__ import annotations
+
+    from dataclasses import dataclass
+
+
+    @dataclass
+    class Address:
+        zip: {zip_type}
+
+
+    def ship(address: Address):
+        """
+        Ship a parcel.
+
+        Args:
+            address: Where to ship to.
+        """
+        pass
+    ''')
+
+
+def load_postponed_ship(zip_type: str):
+    module = types.ModuleType("postponed_shipping")
+    sys.modules[module.__name__] = module
+    try:
+        exec(POSTPONED_SOURCE.format(zip_type=zip_type), module.__dict__)
+        return module.ship, compute_cache_key(module.ship, ())
+    finally:
+        del sys.modules[module.__name__]
+
+
+def generate_in_process(directory: str) -> bool:
+    cache = enable_disk_cache(directory)
+    invalidate_schema_cache()
+    get_function_calling_schema(get_weather)
+    return cache.hits == 1
+
+
+class TestDiskSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        invalidate_schema_cache()
+        self.addCleanup(disable_disk_cache)
+        self.addCleanup(invalidate_schema_cache)
+
+    def test_schema_is_read_back_after_the_memory_cache_is_cleared(self):
+        cache = enable_disk_cache(self.directory)
+        expected = get_function_calling_schema(get_weather)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        invalidate_schema_cache()
+        self.assertEqual(get_function_calling_schema(get_weather), expected)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_options_are_cached_separately(self):
+        cache = enable_disk_cache(self.directory)
+        get_function_calling_schema(get_weather)
+        invalidate_schema_cache()
+        get_function_calling_schema(get_weather, canonical=True)
+        self.assertEqual(cache.hits, 0)
+
+    def test_key_changes_with_the_source(self):
+        def func(a: int, b: str = "x"):
+            """Do something."""
+            pass
+
+        key = compute_cache_key(func, ())
+        func.__doc__ = "Do something else."
+        self.assertNotEqual(compute_cache_key(func, ()), key)
+
+        key = compute_cache_key(func, ())
+        func.__defaults__ = None
+        self.assertNotEqual(compute_cache_key(func, ()), key)
+
+        key = compute_cache_key(func, ())
+        func.__annotations__["a"] = float
+        self.assertNotEqual(compute_cache_key(func, ()), key)
+
+    def test_key_changes_with_dataclass_fields(self):
+        key = compute_cache_key(get_weather, ())
+        Location.__annotations__["country"] = str
+        try:
+            self.assertNotEqual(compute_cache_key(get_weather, ()), key)
+        finally:
+            del Location.__annotations__["country"]
+
+    def test_key_changes_with_postponed_dataclass_fields(self):
+        _, key = load_postponed_ship("float")
+        self.assertEqual(load_postponed_ship("float")[1], key)
+        self.assertNotEqual(load_postponed_ship("str")[1], key)
+
+    def test_schemas_read_back_keep_their_key_order(self):
+        enable_disk_cache(self.directory)
+        expected = get_function_calling_schema(get_weather)
+        invalidate_schema_cache()
+        schema = get_function_calling_schema(get_weather)
+        self.assertEqual(list(schema), list(expected))
+        self.assertEqual(
+            list(schema["parameters"]["properties"]),
+            list(expected["parameters"]["properties"]),
+        )
+
+    def test_corrupt_entries_are_regenerated(self):
+        cache = enable_disk_cache(self.directory)
+        expected = get_function_calling_schema(get_weather)
+        path = cache.get_path(
+            compute_cache_key(get_weather, get_schema_options())
+        )
+        with open(path, "wb") as file:
+            file.write(b'{"name": "get_wea')
+
+        invalidate_schema_cache()
+        self.assertEqual(get_function_calling_schema(get_weather), expected)
+        self.assertEqual(cache.hits, 0)
+        with open(path, "rb") as file:
+            self.assertTrue(file.read().endswith(b"}"))
+
+    def test_no_temporary_files_are_left_behind(self):
+        cache = enable_disk_cache(self.directory)
+        get_function_calling_schema(get_weather)
+        [(root, names)] = [
+            (root, names)
+            for root, _, names in os.walk(self.directory)
+            if names
+        ]
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].endswith(".json"))
+        self.assertEqual(
+            cache.size(), os.path.getsize(os.path.join(root, names[0]))
+        )
+
+    def test_failed_writes_leave_no_temporary_files(self):
+        cache = DiskSchemaCache(self.directory)
+        with mock.patch(
+            "os.replace", side_effect=OSError(errno.ENOSPC, "No space")
+        ):
+            cache.put(get_weather, get_schema_options(), {"name": "x"})
+        self.assertEqual(
+            [names for _, _, names in os.walk(self.directory) if names], []
+        )
+
+    def test_eviction_removes_the_oldest_entries(self):
+        cache = DiskSchemaCache(self.directory)
+        funcs = []
+        for index in range(10):
+            func = lambda: None  # noqa: E731
+            func.__doc__ = str(index)
+            cache.put(func, (), {"name": f"tool_{index}", "text": "x" * 90})
+            path = cache.get_path(compute_cache_key(func, ()))
+            os.utime(path, (index, index))
+            funcs.append(func)
+
+        cache.max_size = cache.size() // 2
+        cache.evict()
+        self.assertLessEqual(cache.size(), cache.max_size)
+        self.assertIsNone(cache.get(funcs[0], ()))
+        self.assertIsNotNone(cache.get(funcs[-1], ()))
+
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+    def test_processes_share_the_cache(self):
+        enable_disk_cache(self.directory)
+        get_function_calling_schema(get_weather)
+        with ProcessPoolExecutor(4) as executor:
+            hits = list(
+                executor.map(generate_in_process, [self.directory] * 8)
+            )
+        self.assertTrue(all(hits))
+
+
+if __name__ == "__main__":
+    unittest.main()
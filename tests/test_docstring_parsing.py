@@ -0,0 +1,161 @@
+import ast
+import os
+import unittest
+
+from docstring_parser import DocstringStyle, parse
+
+from src.docstring_parsing import (
+    MODULE_DOCSTRING_STYLES,
+    MODULE_STYLE,
+    clear_module_docstring_styles,
+    detect_docstring_style,
+    get_module_docstring_style,
+    parse_docstring,
+)
+from src.get_function_calling_schema import get_function_calling_schema
+
+TEST_MODULE_PATH = os.path.join(
+    os.path.dirname(__file__), "test_function_calling_schema.py"
+)
+
+EXTRA_DOCSTRINGS = [
+    "",
+    "Short description.",
+    """
+    Short description.
+
+    Long description
+    spanning lines.
+
+    Args:
+        a (int, optional): First
+            continued.
+        b: Second.
+
+    Raises:
+        ValueError: Never.
+
+    Yields:
+        Values.
+    """,
+    """
+    Short description.
+
+    :param str? a: First.
+    :param b: Second.
+    :type b: int
+    :raises ValueError: Never.
+    :rtype: bool
+    """,
+    """
+    Short description.
+
+    Parameters
+    ----------
+    a : int, default 1
+        First.
+    b
+        Second.
+
+    Returns
+    -------
+    value : int
+        Return value.
+    """,
+]
+
+
+def collect_docstrings():
+    with open(TEST_MODULE_PATH, encoding="utf-8") as file:
+        module = ast.parse(file.read())
+    docstrings = [
+        ast.get_docstring(node, clean=False)
+        for node in ast.walk(module)
+        if isinstance(node, ast.FunctionDef)
+    ]
+    return [docstring for docstring in docstrings if docstring is not None]
+
+
+def summarize(parsed_docstring):
+    returns = parsed_docstring.returns
+    return {
+        "short_description": parsed_docstring.short_description,
+        "long_description": parsed_docstring.long_description,
+        "params": [
+            (
+                param.arg_name,
+                param.type_name,
+                param.is_optional,
+                param.description,
+            )
+            for param in parsed_docstring.params
+        ],
+        "returns": (
+            (returns.type_name, returns.description) if returns else None
+        ),
+    }
+
+
+class TestDocstringParsing(unittest.TestCase):
+    def setUp(self):
+        clear_module_docstring_styles()
+        self.docstrings = collect_docstrings() + EXTRA_DOCSTRINGS
+
+    def test_fast_parser_matches_docstring_parser(self):
+        for docstring in self.docstrings:
+            expected = summarize(parse(docstring))
+            with self.subTest(docstring=docstring):
+                self.assertEqual(
+                    summarize(parse_docstring(docstring, fast=True)),
+                    expected,
+                )
+                style = parse(docstring).style
+                self.assertEqual(
+                    summarize(parse_docstring(docstring, style, fast=True)),
+                    expected,
+                )
+
+    def test_detect_docstring_style(self):
+        for docstring in self.docstrings:
+            style = detect_docstring_style(docstring)
+            if style is not None and parse(docstring).meta:
+                self.assertEqual(style, parse(docstring).style)
+
+    def test_module_style_is_cached(self):
+        self.assertEqual(
+            get_module_docstring_style("tools", "Short description."),
+            DocstringStyle.AUTO,
+        )
+        self.assertNotIn("tools", MODULE_DOCSTRING_STYLES)
+
+        google_docstring = EXTRA_DOCSTRINGS[2]
+        self.assertEqual(
+            get_module_docstring_style("tools", google_docstring),
+            DocstringStyle.GOOGLE,
+        )
+        self.assertEqual(
+            get_module_docstring_style("tools", EXTRA_DOCSTRINGS[3]),
+            DocstringStyle.GOOGLE,
+        )
+
+    def test_schema_with_style_options(self):
+        def func(i: int, s: str = ""):
+            """
+            Short description.
+
+            Args:
+                i: Integer parameter.
+                s: String parameter.
+            """
+            pass
+
+        expected = get_function_calling_schema(func, use_cache=False)
+        for options in [
+            {"style": DocstringStyle.GOOGLE},
+            {"style": MODULE_STYLE},
+            {"fast_parse": True},
+            {"style": DocstringStyle.GOOGLE, "fast_parse": True},
+        ]:
+            self.assertEqual(
+                get_function_calling_schema(func, **options), expected
+            )
@@ -0,0 +1,105 @@
+import unittest
+from typing import List, Literal
+
+from src.function_spec import (
+    FunctionSpec,
+    build_function_spec,
+    get_function_spec,
+)
+from src.get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+)
+
+
+def search(
+    query: str,
+    tags: List[str],
+    mode: Literal["fast", "exact"] = "fast",
+    limit: int = 10,
+) -> list:
+    """
+    Search the record store.
+
+    Runs a full text search over every record.
+
+    Args:
+        query: Text to search for.
+        tags: Tags the records must have.
+        mode: Whether to favour speed or exact matches.
+        limit: Maximum number of records to return.
+
+    Returns:
+        list: The matching records.
+    """
+    pass
+
+
+def forward(query: str, **kwargs):
+    """
+    Forward a query.
+
+    Args:
+        query: Query to forward.
+        timeout: Passed on through kwargs.
+    """
+    pass
+
+
+class TestFunctionSpec(unittest.TestCase):
+    def test_to_dict_and_to_json_match_the_schema(self):
+        spec = get_function_spec(search)
+        for options in [
+            {},
+            {"include_long_description": True},
+            {"include_return_in_parameters": True},
+        ]:
+            with self.subTest(options=options):
+                self.assertEqual(
+                    spec.to_dict(**options),
+                    get_function_calling_schema(search, **options),
+                )
+                self.assertEqual(
+                    spec.to_json(**options),
+                    get_function_calling_schema_bytes(search, **options),
+                )
+
+    def test_simple_types_are_interned_tags(self):
+        query, tags, mode, limit = get_function_spec(search).parameters
+        self.assertEqual(query.type, "string")
+        self.assertIsNone(query._schema)
+        self.assertEqual(query.schema, {"type": "string"})
+        self.assertIs(
+            limit.type, build_function_spec(search).parameters[3].type
+        )
+        self.assertEqual(
+            tags.schema, {"type": "array", "items": {"type": "string"}}
+        )
+        self.assertEqual(mode.schema["enum"], ["fast", "exact"])
+        self.assertEqual([query.required, limit.required], [True, False])
+
+    def test_specs_are_frozen(self):
+        spec = get_function_spec(search)
+        self.assertFalse(hasattr(spec, "__dict__"))
+        with self.assertRaises(AttributeError):
+            spec.name = "other"
+        with self.assertRaises(AttributeError):
+            spec.parameters[0].required = False
+        with self.assertRaises(TypeError):
+            hash(spec)
+
+    def test_equality_and_repr(self):
+        spec = get_function_spec(search)
+        self.assertEqual(build_function_spec(search), spec)
+        self.assertIs(get_function_spec(search), spec)
+        self.assertIsInstance(spec, FunctionSpec)
+        self.assertTrue(repr(spec).startswith("FunctionSpec(name='search'"))
+
+    def test_unknown_documented_parameter(self):
+        with self.assertRaises(FunctionDescriptionError):
+            build_function_spec(forward)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+    invalidate_schema_cache,
+)
+from src.get_function_calling_schemas import get_function_calling_schemas
+
+
+def module_level_func(i: int):
+    """
+    Module level description.
+
+    Args:
+        i: Integer parameter.
+    """
+    pass
+
+
+def module_level_func_without_docstring():
+    pass
+
+
+def forward(query: str, **kwargs):
+    """
+    Forward a query.
+
+    Args:
+        query: Query to forward.
+        timeout: Passed on through kwargs.
+    """
+    pass
+
+
+def make_local_func():
+    def local_func(s: str):
+        """
+        Local description.
+
+        Args:
+            s: String parameter.
+        """
+        pass
+
+    return local_func
+
+
+class TestFunctionCallingSchemas(unittest.TestCase):
+    def setUp(self):
+        invalidate_schema_cache()
+        self.funcs = [
+            module_level_func,
+            module_level_func_without_docstring,
+            make_local_func(),
+        ]
+
+    def assert_schemas(self, schemas):
+        self.assertEqual(len(schemas), 3)
+        self.assertEqual(
+            schemas[0],
+            get_function_calling_schema(module_level_func, use_cache=False),
+        )
+        self.assertIsInstance(schemas[1], FunctionDescriptionError)
+        self.assertEqual(schemas[2]["name"], "local_func")
+        self.assertEqual(schemas[2]["description"], "Local description.")
+
+    def test_unknown_documented_parameters_are_collected(self):
+        schemas = get_function_calling_schemas([forward, module_level_func])
+        self.assertIsInstance(schemas[0], FunctionDescriptionError)
+        self.assertIn("timeout", str(schemas[0]))
+        self.assertEqual(schemas[1]["name"], "module_level_func")
+
+    def test_in_process(self):
+        self.assert_schemas(get_function_calling_schemas(self.funcs))
+
+    def test_thread_pool(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            schemas = get_function_calling_schemas(
+                self.funcs, executor=executor, chunk_size=1
+            )
+        self.assert_schemas(schemas)
+
+    def test_process_pool_falls_back_for_unpicklable_functions(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            schemas = get_function_calling_schemas(
+                self.funcs, executor=executor, chunk_size=1
+            )
+        self.assert_schemas(schemas)
@@ -0,0 +1,91 @@
+import contextlib
+import io
+import unittest
+
+from src.get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+    invalidate_schema_cache,
+)
+from src.instrumentation import (
+    MetricsCollector,
+    collect_metrics,
+    get_active_collector,
+)
+
+
+def func(i: int, s: str):
+    """
+    Short description.
+
+    :param i: Integer parameter.
+    :param s: String parameter.
+    :return: Return value.
+    :rtype: int
+    """
+    pass
+
+
+def func_without_docstring():
+    pass
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        invalidate_schema_cache()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_active_collector())
+
+    def test_phases_and_counters(self):
+        with collect_metrics() as collector:
+            get_function_calling_schema(func)
+            get_function_calling_schema(func)
+            with self.assertRaises(FunctionDescriptionError):
+                get_function_calling_schema(func_without_docstring)
+
+        self.assertIsNone(get_active_collector())
+        for phase in [
+            "parse",
+            "create_description",
+            "create_parameters",
+        ]:
+            self.assertEqual(collector.calls[phase], 1)
+            self.assertGreaterEqual(collector.timings[phase], 0.0)
+        self.assertEqual(collector.calls["transform_py_type_to_json_type"], 2)
+        self.assertEqual(collector.counters["cache_hit"], 1)
+        self.assertEqual(collector.counters["cache_miss"], 2)
+        self.assertEqual(collector.counters["error"], 1)
+
+    def test_return_collection_goes_through_collector(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            get_function_calling_schema(
+                func, include_return_in_parameters=True
+            )
+            with collect_metrics() as collector:
+                get_function_calling_schema(
+                    func,
+                    include_return_in_parameters=True,
+                    use_cache=False,
+                )
+
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(
+            collector.events, [("collect_return_type", {"func_name": "func"})]
+        )
+
+    def test_custom_collector(self):
+        class RecordingCollector(MetricsCollector):
+            def __init__(self):
+                super().__init__()
+                self.phases = []
+
+            def record_timing(self, phase, seconds):
+                self.phases.append(phase)
+
+        with collect_metrics(RecordingCollector()) as collector:
+            get_function_calling_schema(func, use_cache=False)
+
+        self.assertEqual(collector.phases[0], "parse")
+        self.assertEqual(collector.phases[-1], "create_parameters")
@@ -0,0 +1,80 @@
+import functools
+import inspect
+import unittest
+
+from src.introspection import (
+    CODE_LAYOUTS,
+    get_parameter_has_default,
+    get_signature_parameter_has_default,
+)
+
+
+def func(a, b=1, /, c=2, *args, d, e=3, **kwargs):
+    pass
+
+
+def decorator(wrapped):
+    @functools.wraps(wrapped)
+    def wrapper(*args, **kwargs):
+        return wrapped(*args, **kwargs)
+
+    return wrapper
+
+
+class Service:
+    def method(self, a, b=1):
+        pass
+
+    @classmethod
+    def class_method(cls, a, *, b=1):
+        pass
+
+    @staticmethod
+    def static_method(a, b=1):
+        pass
+
+    @decorator
+    def decorated_method(self, a, b=1):
+        pass
+
+
+class TestIntrospection(unittest.TestCase):
+    def assert_matches_signature(self, callable_):
+        self.assertEqual(
+            get_parameter_has_default(callable_),
+            get_signature_parameter_has_default(callable_),
+        )
+
+    def test_functions(self):
+        self.assert_matches_signature(func)
+        self.assert_matches_signature(lambda x, y=1: None)
+        self.assert_matches_signature(decorator(func))
+        self.assertIn(func.__code__, CODE_LAYOUTS)
+
+    def test_methods(self):
+        service = Service()
+        for callable_ in [
+            service.method,
+            service.class_method,
+            service.static_method,
+            service.decorated_method,
+            Service.method,
+            Service.class_method,
+        ]:
+            self.assert_matches_signature(callable_)
+        self.assertEqual(
+            get_parameter_has_default(service.method),
+            {"a": False, "b": True},
+        )
+
+    def test_fallbacks(self):
+        self.assert_matches_signature(functools.partial(func, 1, d=0))
+        self.assert_matches_signature(divmod)
+
+        def with_signature(a, b=1):
+            pass
+
+        with_signature.__signature__ = inspect.signature(lambda a: None)
+        self.assertEqual(
+            get_parameter_has_default(with_signature), {"a": False}
+        )
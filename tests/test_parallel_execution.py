@@ -0,0 +1,255 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.argument_validation import ArgumentValidationError
+from src.async_api import ToolTimeoutError
+from src.parallel_execution import ParallelToolExecutor
+from src.result_cache import CachePolicy, ToolResultCache
+from src.tool_registry import ToolCallError, ToolRegistry
+
+ACTIVE = {"count": 0, "peak": 0}
+ACTIVE_LOCK = threading.Lock()
+
+
+def wait(seconds: float, value: str = ""):
+    """
+    Wait and return a value.
+
+    Args:
+        seconds: Time to wait.
+        value: Value to return.
+    """
+    with ACTIVE_LOCK:
+        ACTIVE["count"] += 1
+        ACTIVE["peak"] = max(ACTIVE["peak"], ACTIVE["count"])
+    time.sleep(seconds)
+    with ACTIVE_LOCK:
+        ACTIVE["count"] -= 1
+    return value
+
+
+async def wait_async(seconds: float, value: str = ""):
+    """
+    Wait and return a value.
+
+    Args:
+        seconds: Time to wait.
+        value: Value to return.
+    """
+    await asyncio.sleep(seconds)
+    return value
+
+
+def record(path: str):
+    """
+    Append a line to a file.
+
+    Args:
+        path: File to append to.
+    """
+    with open(path, "a") as file:
+        file.write("run\n")
+    time.sleep(0.1)
+    return path
+
+
+def fail():
+    """
+    Always fail.
+    """
+    raise RuntimeError("failed")
+
+
+def time_out():
+    """
+    Fail like a client that timed out.
+    """
+    raise TimeoutError("connection timed out")
+
+
+def make_call(name, call_id, **arguments):
+    return {"id": call_id, "function": {"name": name, "arguments": arguments}}
+
+
+class TestParallelToolExecutor(unittest.TestCase):
+    def setUp(self):
+        self.registry = ToolRegistry()
+        for func in [wait, wait_async, fail]:
+            self.registry.register(func)
+        ACTIVE.update(count=0, peak=0)
+
+    def test_results_in_call_order(self):
+        calls = [
+            make_call("wait", "a", seconds=0.1, value="slow"),
+            make_call("wait_async", "b", seconds=0.0, value="fast"),
+            make_call("fail", "c"),
+            make_call("missing", "d"),
+            make_call("wait", "e", seconds="x"),
+        ]
+        for backend in ["thread", "process", "asyncio"]:
+            with self.subTest(backend=backend):
+                with ParallelToolExecutor(
+                    self.registry, backend=backend, max_workers=4
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertEqual(
+                    [result.id for result in results], list("abcde")
+                )
+                self.assertEqual(
+                    [result.value for result in results[:2]], ["slow", "fast"]
+                )
+                self.assertTrue(results[0].ok)
+                self.assertIsInstance(results[2].error, RuntimeError)
+                self.assertIsInstance(results[3].error, ToolCallError)
+                self.assertIsInstance(
+                    results[4].error, ArgumentValidationError
+                )
+
+    def test_calls_run_concurrently(self):
+        calls = [make_call("wait", str(i), seconds=0.1) for i in range(4)]
+        for backend in ["thread", "asyncio"]:
+            with self.subTest(backend=backend):
+                started = time.perf_counter()
+                with ParallelToolExecutor(
+                    self.registry, backend=backend
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertLess(time.perf_counter() - started, 0.3)
+                self.assertTrue(all(result.ok for result in results))
+
+    def test_concurrency_limits(self):
+        calls = [make_call("wait", str(i), seconds=0.02) for i in range(6)]
+        for backend in ["thread", "asyncio"]:
+            with self.subTest(backend=backend):
+                ACTIVE.update(count=0, peak=0)
+                with ParallelToolExecutor(
+                    self.registry,
+                    backend=backend,
+                    max_workers=6,
+                    concurrency_limits={"wait": 2},
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertTrue(all(result.ok for result in results))
+                self.assertEqual(ACTIVE["peak"], 2)
+
+    def test_timeouts(self):
+        calls = [
+            make_call("wait_async", "a", seconds=5),
+            make_call("wait", "b", seconds=0.3),
+            make_call("wait_async", "c", seconds=0),
+        ]
+        for backend in ["thread", "asyncio"]:
+            with self.subTest(backend=backend):
+                started = time.perf_counter()
+                with ParallelToolExecutor(
+                    self.registry,
+                    backend=backend,
+                    timeout=0.05,
+                    timeouts={"wait": 0.01},
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertLess(time.perf_counter() - started, 0.25)
+                self.assertIsInstance(results[0].error, ToolTimeoutError)
+                self.assertIsInstance(results[1].error, ToolTimeoutError)
+                self.assertTrue(results[2].ok)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            ParallelToolExecutor(self.registry, backend="fiber")
+
+    def test_identical_calls_share_one_run(self):
+        registry = ToolRegistry(
+            result_cache=ToolResultCache(policies={"record": CachePolicy()})
+        )
+        registry.register(record)
+        for backend in ["thread", "process", "asyncio"]:
+            with self.subTest(backend=backend):
+                path = os.path.join(tempfile.mkdtemp(), "runs")
+                calls = [
+                    make_call("record", "a", path=path),
+                    make_call("record", "b", path=path),
+                ]
+                with ParallelToolExecutor(
+                    registry, backend=backend
+                ) as executor:
+                    results = executor.run(calls)
+                    self.assertEqual([r.value for r in results], [path] * 2)
+                    self.assertEqual([r.id for r in results], ["a", "b"])
+                    executor.run(calls[:1])
+                with open(path) as file:
+                    self.assertEqual(file.read(), "run\n")
+
+    def test_timeouts_start_when_calls_start(self):
+        calls = [make_call("wait", str(i), seconds=0.3) for i in range(3)]
+        for backend in ["thread", "process", "asyncio"]:
+            with self.subTest(backend=backend):
+                with ParallelToolExecutor(
+                    self.registry, backend=backend, max_workers=1, timeout=0.5
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertTrue(all(result.ok for result in results))
+
+    def test_timed_out_calls_keep_their_worker(self):
+        calls = [
+            make_call("wait", "a", seconds=0.6),
+            make_call("wait", "b", seconds=0.3),
+        ]
+        for backend in ["thread", "asyncio"]:
+            with self.subTest(backend=backend):
+                with ParallelToolExecutor(
+                    self.registry,
+                    backend=backend,
+                    max_workers=1,
+                    timeouts={"wait": 0.4},
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertIsInstance(results[0].error, ToolTimeoutError)
+                self.assertTrue(results[1].ok)
+
+    def test_cached_calls_that_time_out_keep_their_worker(self):
+        registry = ToolRegistry(
+            result_cache=ToolResultCache(policies={"wait": CachePolicy()})
+        )
+        registry.register(wait)
+        calls = [
+            make_call("wait", "a", seconds=0.6, value="a"),
+            make_call("wait", "b", seconds=0.3, value="b"),
+        ]
+        with ParallelToolExecutor(
+            registry, max_workers=1, timeouts={"wait": 0.4}
+        ) as executor:
+            results = executor.run(calls)
+        self.assertIsInstance(results[0].error, ToolTimeoutError)
+        self.assertEqual(results[1].value, "b")
+
+    def test_queued_calls_time_out_behind_hung_calls(self):
+        calls = [
+            make_call("wait", "a", seconds=1.0),
+            make_call("wait", "b", seconds=0.01),
+        ]
+        for backend in ["thread", "asyncio"]:
+            with self.subTest(backend=backend):
+                started = time.perf_counter()
+                with ParallelToolExecutor(
+                    self.registry, backend=backend, max_workers=1, timeout=0.2
+                ) as executor:
+                    results = executor.run(calls)
+                self.assertLess(time.perf_counter() - started, 0.8)
+                self.assertIsInstance(results[0].error, ToolTimeoutError)
+                self.assertIsInstance(results[1].error, ToolTimeoutError)
+
+    def test_timeouts_raised_by_tools_are_results(self):
+        registry = ToolRegistry()
+        registry.register(time_out)
+        for backend in ["thread", "asyncio"]:
+            with self.subTest(backend=backend):
+                with ParallelToolExecutor(
+                    registry, backend=backend, max_workers=1, timeout=5
+                ) as executor:
+                    [result] = executor.run([make_call("time_out", "a")])
+                self.assertIsInstance(result.error, TimeoutError)
+                self.assertNotIsInstance(result.error, ToolTimeoutError)
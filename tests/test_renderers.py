@@ -0,0 +1,223 @@
+import unittest
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Union
+from unittest import mock
+
+from src import function_spec
+from src.get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+)
+from src.renderers import render_tool, render_tools
+
+
+@dataclass
+class Location:
+    city: str
+    country: Optional[str] = None
+
+
+@dataclass
+class Node:
+    value: int
+    children: List["Node"]
+
+
+def get_weather(
+    location: Location,
+    unit: Literal["celsius", "fahrenheit"] = "celsius",
+    days: Optional[int] = None,
+) -> float:
+    """
+    Get the current weather.
+
+    Looks the location up in the weather service.
+
+    Args:
+        location: Where to get the weather for.
+        unit: Temperature unit.
+        days: Number of days to average over.
+
+    Returns:
+        float: The temperature.
+    """
+    pass
+
+
+def walk(tree: Node):
+    """
+    Walk a tree.
+
+    Args:
+        tree: Root of the tree.
+    """
+    pass
+
+
+def ping():
+    """Check that the service is up."""
+    pass
+
+
+class TestRenderers(unittest.TestCase):
+    def test_openai_matches_the_schema(self):
+        for func in [get_weather, walk, ping]:
+            for options in [
+                {},
+                {"include_long_description": True},
+                {"include_return_in_parameters": True},
+            ]:
+                with self.subTest(func=func.__name__, options=options):
+                    try:
+                        expected = get_function_calling_schema(func, **options)
+                    except FunctionDescriptionError:
+                        with self.assertRaises(FunctionDescriptionError):
+                            render_tool(func, **options)
+                        continue
+                    self.assertEqual(render_tool(func, **options), expected)
+
+    def test_anthropic(self):
+        schema = get_function_calling_schema(get_weather)
+        self.assertEqual(
+            render_tool(get_weather, "anthropic"),
+            {
+                "name": "get_weather",
+                "description": schema["description"],
+                "input_schema": schema["parameters"],
+            },
+        )
+
+    def test_gemini(self):
+        declaration = render_tool(get_weather, "gemini")
+        properties = declaration["parameters"]["properties"]
+        self.assertNotIn("$defs", declaration["parameters"])
+        self.assertEqual(
+            properties["location"],
+            {
+                "type": "object",
+                "properties": {
+                    "city": {"type": "string"},
+                    "country": {"type": "string", "nullable": True},
+                },
+                "required": ["city"],
+                "description": "Where to get the weather for.",
+            },
+        )
+        self.assertEqual(
+            properties["days"],
+            {
+                "type": "number",
+                "nullable": True,
+                "description": "Number of days to average over.",
+            },
+        )
+        self.assertEqual(properties["unit"]["enum"], ["celsius", "fahrenheit"])
+
+        children = render_tool(walk, "gemini")["parameters"]["properties"][
+            "tree"
+        ]["properties"]["children"]
+        self.assertEqual(
+            children, {"type": "array", "items": {"type": "object"}}
+        )
+        self.assertNotIn("parameters", render_tool(ping, "gemini"))
+
+    def test_gemini_nullable_unions(self):
+        def store(value: Union[int, str, None] = None):
+            """
+            Store a value.
+
+            Args:
+                value: Value to store.
+            """
+            pass
+
+        properties = render_tool(store, "gemini")["parameters"]["properties"]
+        self.assertEqual(
+            properties["value"],
+            {
+                "anyOf": [{"type": "number"}, {"type": "string"}],
+                "nullable": True,
+                "description": "Value to store.",
+            },
+        )
+
+    def test_gemini_non_string_enums(self):
+        def set_level(level: Literal[1, 2, 3], mode: Literal["a", 1]):
+            """
+            Set the level.
+
+            Args:
+                level: Level to set.
+                mode: Mode to set.
+            """
+            pass
+
+        properties = render_tool(set_level, "gemini")["parameters"][
+            "properties"
+        ]
+        self.assertEqual(
+            properties["level"],
+            {"type": "number", "description": "Level to set. One of 1, 2, 3."},
+        )
+        self.assertEqual(
+            properties["mode"],
+            {"description": 'Mode to set. One of "a", 1.'},
+        )
+
+    def test_gemini_additional_properties(self):
+        def count(counts: Dict[str, Location]):
+            """
+            Count the locations.
+
+            Args:
+                counts: Locations by name.
+            """
+            pass
+
+        properties = render_tool(count, "gemini")["parameters"]["properties"]
+        self.assertEqual(properties["counts"]["type"], "object")
+        self.assertNotIn("additionalProperties", properties["counts"])
+        self.assertEqual(
+            properties["counts"]["description"],
+            "Locations by name. Values follow the JSON schema"
+            ' {"type":"object","properties":{"city":{"type":"string"},'
+            '"country":{"type":"string","nullable":true}},'
+            '"required":["city"]}.',
+        )
+
+    def test_functions_are_parsed_once_for_every_provider(self):
+        def search(query: str):
+            """
+            Search the store.
+
+            Args:
+                query: Text to search for.
+            """
+            pass
+
+        with mock.patch.object(
+            function_spec,
+            "build_function_spec",
+            wraps=function_spec.build_function_spec,
+        ) as build:
+            for provider in ["openai", "anthropic", "gemini", "openai"]:
+                render_tool(search, provider)
+            self.assertEqual(build.call_count, 1)
+
+            search.__doc__ = search.__doc__.replace("store", "index")
+            self.assertEqual(
+                render_tools([search])[0]["description"], "Search the index."
+            )
+            self.assertEqual(build.call_count, 2)
+
+    def test_results_are_copies(self):
+        render_tool(ping)["name"] = "changed"
+        self.assertEqual(render_tool(ping)["name"], "ping")
+
+    def test_unknown_provider(self):
+        with self.assertRaises(ValueError):
+            render_tool(ping, "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
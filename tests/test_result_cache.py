@@ -0,0 +1,215 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.result_cache import (
+    CachePolicy,
+    MemoryResultBackend,
+    ToolResultCache,
+    get_result_key,
+)
+from src.tool_registry import ToolRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def lookup(city: str, days: float = 1, verbose: bool = False):
+    """
+    Look up the weather.
+
+    Args:
+        city: City to look up.
+        days: Number of days.
+    """
+    lookup.calls += 1
+    return f"{city} {days}"
+
+
+lookup.calls = 0
+
+
+def send(to: str):
+    """
+    Send a message.
+
+    Args:
+        to: Recipient.
+    """
+    send.calls += 1
+    return to
+
+
+send.calls = 0
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        lookup.calls = send.calls = 0
+        self.clock = FakeClock()
+        self.cache = ToolResultCache(
+            policies={"lookup": CachePolicy(ttl=10, maxsize=2)},
+            clock=self.clock,
+        )
+
+    def test_keys_are_canonical(self):
+        properties = {"city": {}, "days": {}}
+        key = get_result_key(lookup, {"city": "Oslo"}, properties)
+        self.assertEqual(key, b'{"city":"Oslo","days":1}')
+        for arguments in [
+            {"city": "Oslo", "days": 1.0},
+            {"days": 1, "city": "Oslo"},
+        ]:
+            with self.subTest(arguments=arguments):
+                self.assertEqual(
+                    get_result_key(lookup, arguments, properties), key
+                )
+        self.assertNotEqual(
+            get_result_key(lookup, {"city": "Oslo", "days": 1.5}), key
+        )
+        self.assertIsNone(get_result_key(lookup, {"city": object()}))
+
+    def test_results_expire(self):
+        self.assertEqual(
+            self.cache.call("lookup", lookup, {"city": "A"}), "A 1"
+        )
+        self.cache.call("lookup", lookup, {"city": "A", "days": 1.0})
+        self.assertEqual(lookup.calls, 1)
+
+        self.clock.now = 11
+        self.cache.call("lookup", lookup, {"city": "A"})
+        self.assertEqual(lookup.calls, 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_size_limit_per_tool(self):
+        for city in ["A", "B", "C", "A"]:
+            self.cache.call("lookup", lookup, {"city": city})
+        self.assertEqual(lookup.calls, 4)
+        self.assertEqual(len(self.cache._backends["lookup"]), 2)
+
+        self.cache.invalidate("lookup")
+        self.assertEqual(len(self.cache._backends["lookup"]), 0)
+
+    def test_only_tools_with_a_policy_are_cached(self):
+        self.cache.call("send", send, {"to": "a"})
+        self.cache.call("send", send, {"to": "a"})
+        self.assertEqual(send.calls, 2)
+
+        cache = ToolResultCache(default_policy=CachePolicy())
+        cache.call("send", send, {"to": "a"})
+        cache.call("send", send, {"to": "a"})
+        self.assertEqual(send.calls, 3)
+
+    def test_errors_are_not_cached(self):
+        calls = []
+
+        def fail(x: int):
+            calls.append(x)
+            raise RuntimeError("backend down")
+
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.cache.call("lookup", fail, {"x": 1})
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_calls_run_once(self):
+        calls = []
+        started = threading.Event()
+
+        def slow(x: int):
+            calls.append(x)
+            started.set()
+            time.sleep(0.05)
+            return x * 2
+
+        cache = ToolResultCache(default_policy=CachePolicy())
+        with ThreadPoolExecutor(8) as executor:
+            first = executor.submit(cache.call, "slow", slow, {"x": 2})
+            started.wait()
+            results = list(
+                executor.map(
+                    lambda _: cache.call("slow", slow, {"x": 2}), range(7)
+                )
+            )
+        self.assertEqual([first.result()] + results, [4] * 8)
+        self.assertEqual(calls, [2])
+
+    def test_custom_backend(self):
+        backends = {}
+
+        def create_backend(name, policy):
+            backends[name] = MemoryResultBackend(maxsize=1)
+            return backends[name]
+
+        cache = ToolResultCache(
+            default_policy=CachePolicy(), backend_factory=create_backend
+        )
+        cache.call("send", send, {"to": "a"})
+        self.assertEqual(list(backends), ["send"])
+        self.assertEqual(len(backends["send"]), 1)
+
+
+class TestRegistryResultCache(unittest.TestCase):
+    def setUp(self):
+        lookup.calls = send.calls = 0
+        self.registry = ToolRegistry(
+            result_cache=ToolResultCache(
+                policies={"lookup": CachePolicy(ttl=60)}
+            )
+        )
+        self.registry.register(lookup)
+        self.registry.register(send)
+
+    def test_dispatch(self):
+        for arguments in ['{"city": "Oslo"}', '{"city": "Oslo", "days": 1}']:
+            self.assertEqual(
+                self.registry.dispatch(
+                    {"name": "lookup", "arguments": arguments}
+                ),
+                "Oslo 1",
+            )
+        self.assertEqual(lookup.calls, 1)
+
+        for _ in range(2):
+            self.registry.dispatch(
+                {"name": "send", "arguments": '{"to": "a"}'}
+            )
+        self.assertEqual(send.calls, 2)
+
+    def test_dispatch_async_single_flight(self):
+        calls = []
+
+        async def fetch(url: str):
+            """
+            Fetch a page.
+
+            Args:
+                url: Page to fetch.
+            """
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return url.upper()
+
+        self.registry.result_cache.policies["fetch"] = CachePolicy()
+        self.registry.register(fetch)
+        payload = {"name": "fetch", "arguments": '{"url": "a"}'}
+
+        async def main():
+            return await asyncio.gather(
+                *(self.registry.dispatch_async(payload) for _ in range(5))
+            )
+
+        self.assertEqual(asyncio.run(main()), ["A"] * 5)
+        self.assertEqual(asyncio.run(main()), ["A"] * 5)
+        self.assertEqual(calls, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from src.get_function_calling_schema import (
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+)
+from src.schema_bundle import (
+    SchemaBundle,
+    build_schema_bundle,
+    compute_function_hash,
+    load_schema_bundle,
+    main,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_funcs():
+    def first(i: int):
+        """
+        First description.
+
+        Args:
+            i: Integer parameter.
+        """
+        pass
+
+    def second(s: str = ""):
+        """
+        Second description.
+
+        Args:
+            s: String parameter.
+        """
+        pass
+
+    def third():
+        pass
+
+    return [first, second, third]
+
+
+class TestSchemaBundle(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tools.bundle")
+        self.funcs = make_funcs()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        errors = build_schema_bundle(self.funcs, self.path)
+        self.assertEqual(len(errors), 1)
+
+        with SchemaBundle(self.path) as bundle:
+            self.assertEqual(bundle.names(), ["first", "second"])
+            for func in self.funcs[:2]:
+                self.assertEqual(
+                    bundle.get(func.__name__),
+                    get_function_calling_schema(func),
+                )
+                self.assertEqual(
+                    bundle.get_bytes(func.__name__),
+                    get_function_calling_schema_bytes(func),
+                )
+                self.assertFalse(bundle.is_stale(func))
+            with self.assertRaises(KeyError):
+                bundle.get("third")
+
+    def test_stale_entries_are_regenerated(self):
+        build_schema_bundle(self.funcs, self.path)
+        first = self.funcs[0]
+        first.__doc__ = "Changed description."
+
+        with SchemaBundle(self.path) as bundle:
+            self.assertTrue(bundle.is_stale(first))
+            schema = bundle.get("first", func=first)
+            self.assertEqual(schema["description"], "Changed description.")
+            self.assertEqual(bundle.stale_names, {"first"})
+
+        bundle = load_schema_bundle(self.path, self.funcs[:2])
+        with bundle:
+            self.assertFalse(bundle.is_stale(first))
+            self.assertEqual(
+                bundle.get("first")["description"], "Changed description."
+            )
+
+    def test_hash_is_computed_without_the_source(self):
+        first, second = self.funcs[:2]
+        with mock.patch("inspect.getsource", side_effect=AssertionError):
+            key = compute_function_hash(second)
+            self.assertEqual(compute_function_hash(second), key)
+
+            second.__defaults__ = None
+            self.assertNotEqual(compute_function_hash(second), key)
+
+            key = compute_function_hash(first)
+            first.__code__ = second.__code__
+            self.assertNotEqual(compute_function_hash(first), key)
+
+    def test_hash_does_not_depend_on_the_hash_seed(self):
+        path = os.path.join(self.directory.name, "seeded_tools.py")
+        with open(path, "w") as f:
+            f.write(textwrap.dedent('''
+                    def pick(color: str):
+                        """
+                        Pick a color.
+
+                        Args:
+                            color: Color to pick.
+                        """
+                        return color in {"red", "green", "blue", "cyan"}
+                    '''))
+        script = (
+            "import seeded_tools;"
+            "from src.schema_bundle import compute_function_hash;"
+            "print(compute_function_hash(seeded_tools.pick))"
+        )
+        hashes = set()
+        for seed in ["1", "2", "3"]:
+            environment = dict(
+                os.environ,
+                PYTHONHASHSEED=seed,
+                PYTHONPATH=os.pathsep.join([self.directory.name, ROOT]),
+                PYTHONDONTWRITEBYTECODE="1",
+            )
+            hashes.add(
+                subprocess.run(
+                    [sys.executable, "-c", script],
+                    env=environment,
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+            )
+        self.assertEqual(len(hashes), 1)
+
+    def test_command_line(self):
+        package_directory = os.path.join(self.directory.name, "bundle_tools")
+        os.makedirs(package_directory)
+        with open(os.path.join(package_directory, "__init__.py"), "w") as f:
+            f.write("")
+        with open(os.path.join(package_directory, "tools.py"), "w") as f:
+            f.write(textwrap.dedent('''
+                    def tool(i: int):
+                        """
+                        Tool description.
+
+                        Args:
+                            i: Integer parameter.
+                        """
+                        pass
+
+
+                    def _helper():
+                        """Private helper."""
+                        pass
+                    '''))
+
+        sys.path.insert(0, self.directory.name)
+        try:
+            main(["bundle_tools", "-o", self.path])
+        finally:
+            sys.path.remove(self.directory.name)
+
+        with SchemaBundle(self.path) as bundle:
+            self.assertEqual(bundle.names(), ["tool"])
+            self.assertEqual(
+                bundle.get("tool")["description"], "Tool description."
+            )
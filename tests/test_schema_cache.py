@@ -0,0 +1,117 @@
+import gc
+import unittest
+
+from src.get_function_calling_schema import (
+    SCHEMA_CACHE,
+    get_function_calling_schema,
+    invalidate_schema_cache,
+    schema_cache_info,
+)
+from src.schema_cache import SchemaCache
+
+
+def make_func():
+    def func(i: int):
+        """
+        Short description.
+
+        Args:
+            i: Integer parameter.
+        """
+        pass
+
+    return func
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        invalidate_schema_cache()
+        SCHEMA_CACHE.reset_stats()
+
+    def test_hits_and_misses(self):
+        func = make_func()
+
+        first = get_function_calling_schema(func)
+        second = get_function_calling_schema(func)
+        get_function_calling_schema(func, include_long_description=False)
+
+        self.assertEqual(first, second)
+        info = schema_cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.currsize, 1)
+
+    def test_returned_schema_cannot_corrupt_cache(self):
+        func = make_func()
+
+        first = get_function_calling_schema(func)
+        first["parameters"]["properties"]["i"]["type"] = "string"
+        first["parameters"]["required"].clear()
+
+        second = get_function_calling_schema(func)
+        self.assertEqual(
+            second["parameters"]["properties"]["i"]["type"], "number"
+        )
+        self.assertEqual(second["parameters"]["required"], ["i"])
+
+    def test_docstring_change_invalidates_entry(self):
+        func = make_func()
+
+        get_function_calling_schema(func)
+        func.__doc__ = "Another description."
+        schema = get_function_calling_schema(func)
+
+        self.assertEqual(schema["description"], "Another description.")
+        self.assertEqual(schema_cache_info().misses, 2)
+
+    def test_explicit_invalidation(self):
+        func = make_func()
+
+        get_function_calling_schema(func)
+        invalidate_schema_cache(func)
+        self.assertEqual(schema_cache_info().currsize, 0)
+
+        get_function_calling_schema(func)
+        self.assertEqual(schema_cache_info().misses, 2)
+
+    def test_entries_do_not_pin_functions(self):
+        func = make_func()
+
+        get_function_calling_schema(func)
+        self.assertEqual(schema_cache_info().currsize, 1)
+
+        del func
+        gc.collect()
+        self.assertEqual(schema_cache_info().currsize, 0)
+
+    def test_lru_eviction(self):
+        cache = SchemaCache(maxsize=2)
+        funcs = [make_func() for _ in range(3)]
+
+        for func in funcs:
+            cache.put(func, (), {"name": "func"})
+        cache.get(funcs[1], ())
+        cache.put(funcs[0], (), {"name": "func"})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(funcs[2], ()))
+        self.assertIsNotNone(cache.get(funcs[1], ()))
+
+    def test_bound_methods_share_entry(self):
+        class Service:
+            def method(self, i: int):
+                """
+                Short description.
+
+                Args:
+                    i: Integer parameter.
+                """
+                pass
+
+        service = Service()
+        get_function_calling_schema(service.method)
+        get_function_calling_schema(Service().method)
+
+        info = schema_cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
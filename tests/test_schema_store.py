@@ -0,0 +1,125 @@
+import gc
+import json
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from src.get_function_calling_schema import (
+    SCHEMA_BYTES,
+    SCHEMA_CACHE,
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+    invalidate_schema_cache,
+)
+from src.get_function_calling_schemas import get_tools_json
+from src.schema_store import SchemaStore, SchemaStoreError, warmup
+
+
+def get_weather(city: str, unit: str = "celsius"):
+    """
+    Get the current weather.
+
+    Args:
+        city: City to get the weather for.
+        unit: Temperature unit.
+    """
+    pass
+
+
+def send_email(to: str, body: str):
+    """
+    Send an email.
+
+    Args:
+        to: Recipient address.
+        body: Message text.
+    """
+    pass
+
+
+def read_from_shared_memory(name: str) -> dict:
+    store = SchemaStore.attach(name)
+    try:
+        return store.get("send_email")
+    finally:
+        store.close()
+
+
+class TestSchemaStore(unittest.TestCase):
+    def setUp(self):
+        self.store = warmup([get_weather, send_email], freeze=False)
+
+    def test_schemas_round_trip(self):
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(list(self.store), ["get_weather", "send_email"])
+        self.assertIn("send_email", self.store)
+        self.assertEqual(
+            self.store.get("get_weather"),
+            get_function_calling_schema(get_weather),
+        )
+        self.assertEqual(
+            self.store.get_bytes("send_email"),
+            get_function_calling_schema_bytes(send_email),
+        )
+        with self.assertRaises(KeyError):
+            self.store.get("missing")
+
+    def test_get_returns_new_dicts(self):
+        schema = self.store.get("get_weather")
+        schema["name"] = "changed"
+        self.assertEqual(self.store.get("get_weather")["name"], "get_weather")
+
+    def test_tools_json(self):
+        self.assertEqual(
+            self.store.get_tools_json(),
+            get_tools_json([get_weather, send_email]),
+        )
+        tools = json.loads(self.store.get_tools_json(["send_email"]))
+        self.assertEqual(
+            [tool["function"]["name"] for tool in tools], ["send_email"]
+        )
+
+    def test_store_is_rebuilt_from_its_buffer(self):
+        store = SchemaStore(bytes(self.store._view[: self.store.nbytes]))
+        self.assertEqual(store.get("send_email"), self.store.get("send_email"))
+
+    def test_invalid_buffers_are_rejected(self):
+        with self.assertRaises(SchemaStoreError):
+            SchemaStore(b"not a store at all")
+        with self.assertRaises(SchemaStoreError):
+            SchemaStore.from_schemas(
+                [get_function_calling_schema(get_weather)] * 2
+            )
+
+    def test_workers_attach_to_shared_memory(self):
+        segment = self.store.publish()
+        try:
+            attached = SchemaStore.attach(segment.name)
+            self.assertEqual(
+                attached.get_tools_json(), self.store.get_tools_json()
+            )
+            attached.close()
+            with ProcessPoolExecutor(2) as executor:
+                schemas = list(
+                    executor.map(read_from_shared_memory, [segment.name] * 4)
+                )
+        finally:
+            segment.close()
+            segment.unlink()
+        self.assertEqual(schemas, [self.store.get("send_email")] * 4)
+
+    def test_warmup_leaves_the_schema_caches_empty(self):
+        invalidate_schema_cache()
+        warmup([get_weather, send_email], freeze=False)
+        self.assertEqual(len(SCHEMA_CACHE), 0)
+        self.assertNotIn(get_weather, SCHEMA_BYTES)
+
+    def test_warmup_freezes_the_collector(self):
+        warmup([get_weather])
+        try:
+            self.assertGreater(gc.get_freeze_count(), 0)
+        finally:
+            gc.unfreeze()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import unittest
+from unittest import mock
+
+from src import serialization
+from src.get_function_calling_schema import (
+    SCHEMA_CACHE,
+    get_function_calling_schema,
+    get_function_calling_schema_bytes,
+    invalidate_schema_cache,
+)
+from src.get_function_calling_schemas import get_tools_json
+from src.schema_cache import DEFAULT_SCHEMA_CACHE_SIZE
+from src.serialization import dumps_canonical
+
+
+def func(b: int, a: str = "ü"):
+    """
+    Function with non-ASCII text: ü.
+
+    Args:
+        b: Integer parameter.
+        a: String parameter.
+    """
+    pass
+
+
+def other():
+    """
+    Other function.
+    """
+    pass
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        invalidate_schema_cache()
+
+    def test_backends_agree(self):
+        schema = get_function_calling_schema(func)
+        expected = json.dumps(
+            schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        self.assertEqual(dumps_canonical(schema), expected)
+        with mock.patch.object(serialization, "orjson", None):
+            self.assertEqual(dumps_canonical(schema), expected)
+
+    def test_schema_bytes_are_cached(self):
+        schema_bytes = get_function_calling_schema_bytes(func)
+        self.assertIs(get_function_calling_schema_bytes(func), schema_bytes)
+        self.assertEqual(
+            json.loads(schema_bytes), get_function_calling_schema(func)
+        )
+        self.assertIsNot(
+            get_function_calling_schema_bytes(func, use_cache=False),
+            schema_bytes,
+        )
+
+    def test_schema_bytes_outlive_the_schema_lru(self):
+        # Two entries per tool used to cycle catalogs of more than half the
+        #  LRU size through it without a single hit.
+        namespace = {}
+        count = DEFAULT_SCHEMA_CACHE_SIZE // 2 + 100
+        exec(
+            "\n".join(
+                f"def tool_{index}(x: int):\n"
+                f'    """\n    Tool {index}.\n\n'
+                '    Args:\n        x: A number.\n    """\n'
+                for index in range(count)
+            ),
+            namespace,
+        )
+        funcs = [namespace[f"tool_{index}"] for index in range(count)]
+        tools_json = get_tools_json(funcs)
+        SCHEMA_CACHE.reset_stats()
+        self.assertEqual(get_tools_json(funcs), tools_json)
+        info = SCHEMA_CACHE.info()
+        self.assertEqual((info.hits, info.misses), (0, 0))
+        self.assertIs(
+            get_function_calling_schema_bytes(funcs[0]),
+            get_function_calling_schema_bytes(funcs[0]),
+        )
+
+    def test_tools_json(self):
+        self.assertEqual(
+            json.loads(get_tools_json([func, other])),
+            [
+                {
+                    "type": "function",
+                    "function": get_function_calling_schema(f),
+                }
+                for f in [func, other]
+            ],
+        )
+        self.assertEqual(get_tools_json([]), b"[]")
@@ -0,0 +1,239 @@
+import os
+import sys
+import tempfile
+import textwrap
+import types
+import unittest
+
+from src.get_function_calling_schema import (
+    FunctionDescriptionError,
+    get_function_calling_schema,
+)
+from src.static_schema import (
+    get_function_calling_schemas_from_directory,
+    get_static_function_calling_schemas,
+)
+
+SOURCE = textwrap.dedent('''
+    import typing
+    from typing import Literal
+
+
+    def func_with_google_style_docstring(
+        i: int,
+        e: Literal["a", "b"],
+        f: float = 0.0,
+        *,
+        s: typing.Optional[str] = None,
+    ) -> int:
+        """
+        Short description.
+
+        Long description.
+
+        Args:
+            i: Integer parameter.
+            e: Enum parameter.
+            f: Float parameter.
+            s: String parameter.
+
+        Returns:
+            Return value.
+        """
+        pass
+
+
+    async def func_with_rest_style_docstring(l, d: dict):
+        """
+        Short description.
+
+        :param l: List parameter.
+        :type l: list
+        :param d: Dictionary parameter.
+        :return: Return value.
+        :rtype: int
+        """
+        pass
+
+
+    def func_without_docstring():
+        pass
+    ''')
+
+TYPED_SOURCE = textwrap.dedent('''
+    from dataclasses import dataclass, field
+    from enum import Enum
+    from pathlib import Path
+    from typing import List, Optional, TypedDict
+
+
+    class Unit(str, Enum):
+        CELSIUS = "celsius"
+        FAHRENHEIT = "fahrenheit"
+
+
+    @dataclass
+    class Location:
+        city: str
+        country: Optional[str] = None
+        tags: List[str] = field(default_factory=list)
+
+
+    class Reading(TypedDict, total=False):
+        value: float
+        unit: Unit
+
+
+    @dataclass
+    class Region:
+        name: str
+        children: List["Region"] = field(default_factory=list)
+
+
+    Coordinates = tuple[float, float]
+
+
+    def get_weather(
+        location: Location,
+        unit: Unit = Unit.CELSIUS,
+        reading: Optional[Reading] = None,
+        region: "Region | None" = None,
+        at: Coordinates = (0.0, 0.0),
+    ):
+        """
+        Get the weather.
+
+        Args:
+            location: Location to get the weather for.
+            unit: Unit of the temperature.
+            reading: Last reading.
+            region: Region of the location.
+            at: Coordinates of the location.
+        """
+        pass
+
+
+    def read(path: Path):
+        """
+        Read a file.
+
+        Args:
+            path: Path of the file.
+        """
+        pass
+    ''')
+
+
+class TestStaticSchema(unittest.TestCase):
+    def setUp(self):
+        self.namespace = {}
+        exec(SOURCE, self.namespace)
+
+    def test_matches_runtime_schema(self):
+        for options in [
+            {},
+            {"include_long_description": True},
+            {"include_return_in_parameters": True},
+        ]:
+            schemas = get_static_function_calling_schemas(SOURCE, **options)
+            for name in [
+                "func_with_google_style_docstring",
+                "func_with_rest_style_docstring",
+            ]:
+                try:
+                    expected = get_function_calling_schema(
+                        self.namespace[name], **options
+                    )
+                except FunctionDescriptionError:
+                    self.assertIsInstance(
+                        schemas[name], FunctionDescriptionError
+                    )
+                else:
+                    self.assertEqual(schemas[name], expected)
+
+    def test_module_types_match_runtime_schema(self):
+        module = types.ModuleType("typed_tools")
+        sys.modules[module.__name__] = module
+        self.addCleanup(sys.modules.pop, module.__name__)
+        exec(TYPED_SOURCE, module.__dict__)
+
+        schemas = get_static_function_calling_schemas(TYPED_SOURCE)
+        self.assertEqual(
+            schemas["get_weather"],
+            get_function_calling_schema(module.get_weather),
+        )
+
+    def test_unresolvable_names_are_errors(self):
+        schemas = get_static_function_calling_schemas(TYPED_SOURCE)
+        self.assertIsInstance(schemas["read"], FunctionDescriptionError)
+        self.assertIn("Path", str(schemas["read"]))
+
+    def test_function_without_docstring(self):
+        schemas = get_static_function_calling_schemas(SOURCE)
+        self.assertIsInstance(
+            schemas["func_without_docstring"], FunctionDescriptionError
+        )
+
+    def test_directory_scan(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "package"))
+            paths = [
+                os.path.join(directory, "tools.py"),
+                os.path.join(directory, "package", "more_tools.py"),
+            ]
+            for path in paths:
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(SOURCE)
+
+            for max_workers in [1, 2]:
+                schemas = get_function_calling_schemas_from_directory(
+                    directory, max_workers=max_workers
+                )
+                self.assertEqual(sorted(schemas), sorted(paths))
+                for path in paths:
+                    self.assertEqual(
+                        schemas[path]["func_with_rest_style_docstring"],
+                        get_function_calling_schema(
+                            self.namespace["func_with_rest_style_docstring"]
+                        ),
+                    )
+
+    def test_directory_scan_reports_broken_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sources = {
+                "broken.py": "def broken(:\n",
+                "forward.py": textwrap.dedent('''
+                    def forward(query: str, **kwargs):
+                        """
+                        Forward a query.
+
+                        Args:
+                            query: Query to forward.
+                            timeout: Passed on through kwargs.
+                        """
+                        pass
+                    '''),
+                "tools.py": SOURCE,
+            }
+            for file_name, source in sources.items():
+                with open(
+                    os.path.join(directory, file_name), "w", encoding="utf-8"
+                ) as file:
+                    file.write(source)
+
+            for max_workers in [1, 2]:
+                schemas = get_function_calling_schemas_from_directory(
+                    directory, max_workers=max_workers
+                )
+                self.assertIsInstance(
+                    schemas[os.path.join(directory, "broken.py")],
+                    FunctionDescriptionError,
+                )
+                self.assertIsInstance(
+                    schemas[os.path.join(directory, "forward.py")]["forward"],
+                    FunctionDescriptionError,
+                )
+                self.assertIn(
+                    "func_with_rest_style_docstring",
+                    schemas[os.path.join(directory, "tools.py")],
+                )
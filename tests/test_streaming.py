@@ -0,0 +1,120 @@
+import json
+import time
+import unittest
+from typing import Literal
+
+from src.argument_validation import ArgumentValidationError
+from src.streaming import StreamingArgumentsParser
+from src.tool_registry import ToolRegistry
+
+
+def search(
+    query: str,
+    mode: Literal["fast", "exact"],
+    limit: int = 10,
+    filters: dict = None,
+    tags: list = None,
+    strict: bool = False,
+):
+    """
+    Search records.
+
+    Args:
+        query: Search query.
+        mode: Search mode.
+        limit: Maximum number of results.
+        filters: Filters to apply.
+        tags: Tags to match.
+        strict: Whether to match strictly.
+    """
+    pass
+
+
+def chunks(text, size):
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+class TestStreamingArgumentsParser(unittest.TestCase):
+    def test_arguments_complete_while_streaming(self):
+        arguments = {
+            "query": 'say "hi" \\ é',
+            "mode": "exact",
+            "limit": 5.0,
+            "filters": {"a": [1, {"b": "}"}]},
+            "tags": ["x", "]"],
+            "strict": True,
+        }
+        text = json.dumps(arguments, indent=1)
+        for size in [1, 3, 7, len(text)]:
+            parser = StreamingArgumentsParser.for_function(search)
+            completed = []
+            for delta in chunks(text, size):
+                completed += parser.feed(delta)
+            self.assertTrue(parser.done)
+            self.assertEqual([name for name, _ in completed], list(arguments))
+            result = parser.close()
+            self.assertEqual(result["limit"], 5)
+            self.assertIs(type(result["limit"]), int)
+            self.assertEqual(result["filters"], arguments["filters"])
+
+    def test_first_argument_is_available_early(self):
+        parser = StreamingArgumentsParser.for_function(search)
+        self.assertEqual(parser.feed('{"query": "a'), [])
+        self.assertEqual(parser.feed('b", "mo'), [("query", "ab")])
+
+    def test_early_failures(self):
+        for text, position in [
+            ("[", 0),
+            ('{"qx', 3),
+            ('{"query": 1', 10),
+            ('{"mode": "fl', 11),
+            ('{"limit": 1.5,', 13),
+            ('{"query": "a" "mode"', 14),
+            ('{"query": "a", }', 15),
+            ('{"strict": nul', 11),
+            ('{"query": "a"} x', 15),
+            ('{"query": "a", "query"', 21),
+        ]:
+            with self.subTest(text=text):
+                parser = StreamingArgumentsParser.for_function(search)
+                with self.assertRaises(ArgumentValidationError):
+                    parser.feed(text)
+                self.assertEqual(parser.position, position)
+                with self.assertRaises(ArgumentValidationError):
+                    parser.feed("}")
+
+    def test_long_strings_stream_in_linear_time(self):
+        # Every character used to rejoin the whole string read so far.
+        query = "x" * 200_000
+        text = json.dumps({"query": query, "mode": "fast"})
+        parser = StreamingArgumentsParser.for_function(search)
+        start = time.perf_counter()
+        for delta in chunks(text, 16):
+            parser.feed(delta)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual(parser.close()["query"], query)
+
+        parser = StreamingArgumentsParser.for_function(search)
+        parser.feed('{"mode": "fas')
+        with self.assertRaises(ArgumentValidationError):
+            parser.feed("x" * 1000)
+
+    def test_close_checks_completeness(self):
+        parser = StreamingArgumentsParser.for_function(search)
+        parser.feed('{"query": "a"')
+        with self.assertRaises(ArgumentValidationError):
+            parser.close()
+
+        parser = StreamingArgumentsParser.for_function(search)
+        parser.feed('{"query": "a"}')
+        with self.assertRaises(ArgumentValidationError):
+            parser.close()
+
+    def test_registry_stream(self):
+        registry = ToolRegistry()
+        registry.register(search)
+        parser = registry.stream_arguments("search")
+        parser.feed('{"query": "a", "mode": "fast", "limit": 3}')
+        self.assertEqual(
+            parser.close(), {"query": "a", "mode": "fast", "limit": 3}
+        )
@@ -0,0 +1,142 @@
+import unittest
+from unittest import mock
+
+from src import tool_registry
+from src.get_function_calling_schema import get_function_calling_schema
+from src.tool_decorator import get_tool_options, get_tool_schema, is_tool, tool
+from src.tool_registry import ToolRegistry
+
+
+@tool
+def add(a: int, b: int = 1):
+    """
+    Add two numbers.
+
+    Args:
+        a: First number.
+        b: Second number.
+    """
+    return a + b
+
+
+@tool(name="say_hello", include_long_description=True)
+def greet(name: str):
+    """
+    Greet someone.
+
+    Says hello in a friendly way.
+
+    Args:
+        name: Name to greet.
+    """
+    return f"hello {name}"
+
+
+class TestToolDecorator(unittest.TestCase):
+    def test_function_is_returned_unchanged(self):
+        self.assertEqual(add(2, 3), 5)
+        self.assertEqual(add.__name__, "add")
+        self.assertTrue(is_tool(add))
+        self.assertFalse(is_tool(get_tool_schema))
+        self.assertEqual(get_tool_options(greet).name, "say_hello")
+
+    def test_schema_uses_the_decorator_options(self):
+        self.assertEqual(
+            get_tool_schema(add), get_function_calling_schema(add)
+        )
+        schema = get_tool_schema(greet)
+        self.assertEqual(schema["name"], "say_hello")
+        self.assertIn("friendly", schema["description"])
+
+    def test_decorating_does_not_generate_schemas(self):
+        registry = ToolRegistry()
+        with mock.patch.object(
+            tool_registry,
+            "get_function_calling_schema",
+            wraps=tool_registry.get_function_calling_schema,
+        ) as generate:
+
+            @tool(registry=registry)
+            def subtract(a: int, b: int):
+                """
+                Subtract two numbers.
+
+                Args:
+                    a: First number.
+                    b: Second number.
+                """
+                return a - b
+
+            self.assertIn("subtract", registry)
+            self.assertEqual(generate.call_count, 0)
+
+            self.assertEqual(
+                registry.dispatch(
+                    {"name": "subtract", "arguments": '{"a": 5, "b": 2}'}
+                ),
+                3,
+            )
+            self.assertEqual(generate.call_count, 1)
+            registry.get_schema("subtract")
+            self.assertEqual(generate.call_count, 1)
+
+    def test_registry_uses_the_decorator_options(self):
+        @tool(include_return_in_parameters=True)
+        def divide(a: float, b: float) -> float:
+            """
+            Divide two numbers.
+
+            Args:
+                a: Dividend.
+                b: Divisor.
+
+            Returns:
+                float: The quotient, as you expect it to be.
+            """
+            return a / b
+
+        for lazy in [False, True]:
+            with self.subTest(lazy=lazy):
+                registry = ToolRegistry()
+                registry.register(greet, lazy=lazy)
+                registry.register(divide, lazy=lazy)
+                self.assertEqual(
+                    registry.get_schema("say_hello"), get_tool_schema(greet)
+                )
+                self.assertEqual(
+                    registry.get_schema("divide"), get_tool_schema(divide)
+                )
+                self.assertEqual(
+                    registry.dispatch(
+                        {
+                            "name": "divide",
+                            "arguments": '{"a": 6, "b": 3, "return": 2}',
+                        }
+                    ),
+                    2,
+                )
+
+    def test_registry_compiles_lazy_tools(self):
+        registry = ToolRegistry()
+        registry.register(add, lazy=True)
+        registry.register(greet, lazy=True)
+        self.assertEqual(len(registry), 2)
+        registry.compile()
+        self.assertEqual(
+            [schema["name"] for schema in registry.schemas],
+            ["add", "say_hello"],
+        )
+        self.assertFalse(
+            any(
+                isinstance(entry, tool_registry.PendingTool)
+                for entry in registry._tools.values()
+            )
+        )
+        self.assertEqual(
+            [t["function"]["name"] for t in registry.select_tools("greet")],
+            ["say_hello"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from src.tool_index import ToolIndex, tokenize
+from src.tool_registry import ToolRegistry
+
+
+def get_weather(city: str, unit: str = "celsius"):
+    """
+    Get the current weather forecast.
+
+    Args:
+        city: City to look up.
+        unit: Temperature unit.
+    """
+    pass
+
+
+def send_email(recipient: str, body: str):
+    """
+    Send an email message.
+
+    Args:
+        recipient: Address of the recipient.
+        body: Text of the message.
+    """
+    pass
+
+
+def createInvoice(customer: str, amount: float):
+    """
+    Create an invoice for a customer.
+
+    Args:
+        customer: Customer to bill.
+        amount: Amount to charge in the local currency.
+    """
+    pass
+
+
+class TestToolIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ToolIndex()
+        for func in [get_weather, send_email, createInvoice]:
+            self.index.add_function(func)
+
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("createInvoice get_weather for the HTTPServer 42"),
+            ["create", "invoice", "get", "weather", "http", "server", "42"],
+        )
+
+    def test_search(self):
+        self.assertEqual(
+            [schema["name"] for schema in self.index.search("weather", k=3)],
+            ["get_weather"],
+        )
+        self.assertEqual(
+            self.index.search("bill the customer an invoice", k=1)[0]["name"],
+            "createInvoice",
+        )
+        self.assertEqual(
+            [name for name, _ in self.index.rank("temperature in a city")],
+            ["get_weather"],
+        )
+        self.assertEqual(self.index.search("the", k=3), [])
+        self.assertEqual(self.index.search("unknown words", k=3), [])
+
+    def test_incremental_updates(self):
+        self.index.remove("get_weather")
+        self.assertNotIn("get_weather", self.index)
+        self.assertEqual(self.index.search("weather"), [])
+        self.assertEqual(len(self.index), 2)
+
+        self.index.add_function(get_weather)
+        self.index.add_function(get_weather)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(
+            [name for name, _ in self.index.rank("weather")], ["get_weather"]
+        )
+
+    def test_registry_selection(self):
+        registry = ToolRegistry()
+        registry.register(get_weather)
+        registry.register(send_email)
+        self.assertEqual(
+            registry.select_tools("email message", k=1)[0]["function"]["name"],
+            "send_email",
+        )
+
+        registry.register(createInvoice)
+        registry.unregister("send_email")
+        self.assertEqual(registry.select_tools("email message"), [])
+        self.assertEqual(
+            registry.select_tools("invoice")[0]["function"]["name"],
+            "createInvoice",
+        )
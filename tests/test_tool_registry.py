@@ -0,0 +1,114 @@
+import json
+import unittest
+from types import SimpleNamespace
+from typing import Literal
+
+from src.argument_validation import ArgumentValidationError
+from src.tool_registry import ToolCallError, ToolRegistry, parse_tool_call
+
+
+def add(a: int, b: int = 1):
+    """
+    Add two numbers.
+
+    Args:
+        a: First number.
+        b: Second number.
+    """
+    return a + b
+
+
+def greet(name: str, tone: Literal["warm", "cold"] = "warm"):
+    """
+    Greet someone.
+
+    Args:
+        name: Name to greet.
+        tone: Tone of the greeting.
+    """
+    return f"{tone} hello {name}"
+
+
+class TestToolRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ToolRegistry()
+        self.registry.register(add)
+        self.registry.register(name="say_hello")(greet)
+
+    def test_tools_are_precomputed(self):
+        tools = self.registry.tools
+        self.assertIs(tools, self.registry.tools)
+        self.assertEqual(
+            [tool["function"]["name"] for tool in tools],
+            ["add", "say_hello"],
+        )
+        self.assertEqual(tools[0]["type"], "function")
+
+        tools_json = self.registry.tools_json
+        self.assertIs(tools_json, self.registry.tools_json)
+        self.assertEqual(json.loads(tools_json), tools)
+
+        self.registry.unregister("add")
+        self.assertIsNot(tools, self.registry.tools)
+        self.assertEqual(len(self.registry.tools), 1)
+        self.assertEqual(
+            json.loads(self.registry.tools_json), self.registry.tools
+        )
+
+    def test_canonical_order(self):
+        registry = ToolRegistry(canonical=True)
+        registry.register(name="say_hello")(greet)
+        registry.register(add)
+        self.assertEqual(
+            [schema["name"] for schema in registry.schemas],
+            ["add", "say_hello"],
+        )
+        self.assertEqual(
+            json.loads(registry.tools_json),
+            json.loads(self.registry.tools_json),
+        )
+        self.assertEqual(registry.prefix_hash, self.registry.prefix_hash)
+
+    def test_dispatch_payload_formats(self):
+        arguments = json.dumps({"a": 2.0, "b": 3})
+        for payload in [
+            {
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "add", "arguments": arguments},
+            },
+            {"name": "add", "arguments": arguments},
+            json.dumps({"name": "add", "arguments": arguments}),
+            SimpleNamespace(
+                id="call_1",
+                function=SimpleNamespace(name="add", arguments=arguments),
+            ),
+        ]:
+            with self.subTest(payload=payload):
+                result = self.registry.dispatch(payload)
+                self.assertEqual(result, 5)
+                self.assertIs(type(result), int)
+
+        self.assertEqual(
+            self.registry.dispatch(
+                {"name": "say_hello", "arguments": '{"name": "Ada"}'}
+            ),
+            "warm hello Ada",
+        )
+
+    def test_errors(self):
+        with self.assertRaises(ToolCallError):
+            self.registry.dispatch({"name": "missing", "arguments": "{}"})
+        with self.assertRaises(ToolCallError):
+            self.registry.dispatch("{not json")
+        with self.assertRaises(ArgumentValidationError):
+            self.registry.dispatch(
+                {"name": "say_hello", "arguments": '{"tone": "hot"}'}
+            )
+
+    def test_parse_tool_call(self):
+        tool_call = parse_tool_call(
+            {"id": "call_1", "function": {"name": "add", "arguments": "{}"}}
+        )
+        self.assertEqual(tool_call.name, "add")
+        self.assertEqual(tool_call.id, "call_1")
@@ -0,0 +1,90 @@
+import json
+import unittest
+
+from src.get_function_calling_schema import (
+    get_function_calling_schema,
+    invalidate_schema_cache,
+)
+from src.tool_set import ToolSetError, build_tool_set
+
+
+def search(query: str, limit: int, exact: bool = False):
+    """
+    Search records.
+
+    Args:
+        query: Search query.
+        limit: Maximum number of results.
+        exact: Whether to match exactly.
+    """
+    pass
+
+
+def search_reordered(limit: int, query: str, exact: bool = False):
+    """
+    Search records.
+
+    Args:
+        query: Search query.
+        exact: Whether to match exactly.
+        limit: Maximum number of results.
+    """
+    pass
+
+
+def add(a: int, b: int):
+    """
+    Add two numbers.
+
+    Args:
+        a: First number.
+        b: Second number.
+    """
+    pass
+
+
+class TestToolSet(unittest.TestCase):
+    def setUp(self):
+        invalidate_schema_cache()
+
+    def test_canonical_schema(self):
+        schema = get_function_calling_schema(search_reordered, canonical=True)
+        self.assertEqual(
+            list(schema["parameters"]["properties"]),
+            ["exact", "limit", "query"],
+        )
+        self.assertEqual(schema["parameters"]["required"], ["limit", "query"])
+        self.assertEqual(
+            list(
+                get_function_calling_schema(search_reordered)["parameters"][
+                    "properties"
+                ]
+            ),
+            ["query", "exact", "limit"],
+        )
+
+    def test_order_independent(self):
+        search_reordered.__name__ = "search"
+        try:
+            first = build_tool_set([search, add])
+            second = build_tool_set([add, search_reordered])
+        finally:
+            search_reordered.__name__ = "search_reordered"
+
+        self.assertEqual(first.names, ("add", "search"))
+        self.assertEqual(first.tools_json, second.tools_json)
+        self.assertEqual(first.prefix_hash, second.prefix_hash)
+        self.assertEqual(
+            [
+                tool["function"]["name"]
+                for tool in json.loads(first.tools_json)
+            ],
+            ["add", "search"],
+        )
+        self.assertNotEqual(
+            first.prefix_hash, build_tool_set([search]).prefix_hash
+        )
+
+    def test_duplicate_names(self):
+        with self.assertRaises(ToolSetError):
+            build_tool_set([add, add])
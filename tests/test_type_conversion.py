@@ -0,0 +1,325 @@
+import enum
+import gc
+import sys
+import textwrap
+import types
+import unittest
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional, Tuple, TypedDict, Union
+
+from src.get_function_calling_schema import get_function_calling_schema
+from src.static_schema import get_static_function_calling_schemas
+from src.type_conversion import (
+    TYPE_SCHEMAS,
+    UNKNOWN_TYPE,
+    clear_type_schemas,
+    convert_type,
+)
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@dataclass
+class Address:
+    street: str
+    tags: List[str] = field(default_factory=list)
+
+
+class Contact(TypedDict, total=False):
+    address: Address
+    color: Color
+
+
+@dataclass
+class Node:
+    value: int
+    children: List["Node"]
+
+
+ADDRESS_DEF = {
+    "type": "object",
+    "properties": {
+        "street": {"type": "string"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["street"],
+}
+
+
+def ship(
+    home: Address,
+    work: Optional[Address] = None,
+    contacts: Dict[str, Contact] = None,
+    sizes: list[int] = None,
+    point: Tuple[int, str] = None,
+    code: Union[int, str] = None,
+    flag: Literal[True, False] = True,
+):
+    """
+    Ship a parcel.
+
+    Args:
+        home: Home address.
+        work: Work address.
+        contacts: Contacts by name.
+        sizes: Parcel sizes.
+        point: A point.
+        code: A code.
+        flag: A flag.
+    """
+    pass
+
+
+POSTPONED_SOURCE = textwrap.dedent('''
+    from __future__ import annotations
+
+    from dataclasses import dataclass, field
+    from typing import List, Optional
+
+
+    @dataclass
+    class Address:
+        street: str
+        tags: List[str] = field(default_factory=list)
+
+
+    def ship(
+        home: Address, note: Optional[str] = None, sizes: list[int] = None
+    ):
+        """
+        Ship a parcel.
+
+        Args:
+            home: Home address.
+            note: A note.
+            sizes: Parcel sizes.
+        """
+        pass
+
+
+    def unresolved(item: Missing, count: int = 0):
+        """
+        Use a name that is not defined.
+
+        Args:
+            item: An item.
+            count: A count.
+        """
+        pass
+    ''')
+
+
+class TestTypeConversion(unittest.TestCase):
+    def setUp(self):
+        clear_type_schemas()
+
+    def test_function_schema(self):
+        parameters = get_function_calling_schema(ship, use_cache=False)[
+            "parameters"
+        ]
+        properties = parameters["properties"]
+        self.assertEqual(
+            properties["home"],
+            {"$ref": "#/$defs/Address", "description": "Home address."},
+        )
+        self.assertEqual(
+            properties["work"]["anyOf"],
+            [{"$ref": "#/$defs/Address"}, {"type": "null"}],
+        )
+        self.assertEqual(
+            properties["contacts"]["additionalProperties"],
+            {"$ref": "#/$defs/Contact"},
+        )
+        self.assertEqual(properties["sizes"]["items"], {"type": "number"})
+        self.assertEqual(
+            properties["point"]["prefixItems"],
+            [{"type": "number"}, {"type": "string"}],
+        )
+        self.assertEqual(
+            properties["code"]["anyOf"],
+            [{"type": "number"}, {"type": "string"}],
+        )
+        self.assertEqual(properties["flag"]["enum"], [True, False])
+        self.assertEqual(properties["flag"]["type"], "boolean")
+        self.assertEqual(parameters["required"], ["home"])
+        self.assertEqual(
+            parameters["$defs"],
+            {
+                "Address": ADDRESS_DEF,
+                "Contact": {
+                    "type": "object",
+                    "properties": {
+                        "address": {"$ref": "#/$defs/Address"},
+                        "color": {"$ref": "#/$defs/Color"},
+                    },
+                    "required": [],
+                },
+                "Color": {"type": "string", "enum": ["red", "green"]},
+            },
+        )
+
+    def test_memoized(self):
+        first = convert_type(Dict[str, Contact])
+        self.assertIs(
+            TYPE_SCHEMAS[Address].defs["Address"], first.defs["Address"]
+        )
+        self.assertIs(convert_type(Dict[str, Contact]), first)
+
+        # Schemas handed out are copies of the memoized fragments.
+        schema = get_function_calling_schema(ship, use_cache=False)
+        schema["parameters"]["$defs"]["Address"]["required"].append("tags")
+        self.assertEqual(convert_type(Address).defs["Address"], ADDRESS_DEF)
+
+    def test_recursive_type(self):
+        node = convert_type(Node)
+        self.assertEqual(node.schema, {"$ref": "#/$defs/Node"})
+        self.assertEqual(
+            node.defs["Node"]["properties"]["children"],
+            {"type": "array", "items": {"$ref": "#/$defs/Node"}},
+        )
+        self.assertIs(convert_type(Node), node)
+        self.assertNotIn(List[Node], TYPE_SCHEMAS)
+        self.assertIn("Node", convert_type(List[Node]).defs)
+
+    def test_unknown_types_fall_back(self):
+        class Custom:
+            pass
+
+        self.assertIs(convert_type(Custom), UNKNOWN_TYPE)
+
+        def func(c: Custom):
+            """
+            Short description.
+
+            :param c: Custom parameter.
+            :type c: int
+            """
+            pass
+
+        self.assertEqual(
+            get_function_calling_schema(func)["parameters"]["properties"],
+            {"c": {"type": "number", "description": "Custom parameter."}},
+        )
+
+    def test_conflicting_names(self):
+        def make_address():
+            @dataclass
+            class Address:
+                city: str
+
+            return Address
+
+        def func(a: Address, b: make_address()):
+            """
+            Short description.
+
+            :param a: First address.
+            :param b: Second address.
+            """
+            pass
+
+        parameters = get_function_calling_schema(func)["parameters"]
+        self.assertEqual(
+            parameters["$defs"],
+            {
+                "Address": ADDRESS_DEF,
+                "Address2": {
+                    "type": "object",
+                    "properties": {"city": {"type": "string"}},
+                    "required": ["city"],
+                },
+            },
+        )
+        self.assertEqual(
+            [parameters["properties"][name]["$ref"] for name in "ab"],
+            ["#/$defs/Address", "#/$defs/Address2"],
+        )
+
+    def test_conflicting_names_in_nested_references(self):
+        @dataclass
+        class Location:
+            address: Address
+
+        def make_location():
+            @dataclass
+            class Address:
+                city: str
+
+            @dataclass
+            class Location:
+                address: Address
+
+            return Location
+
+        schema = convert_type(Tuple[Location, make_location()])
+        self.assertEqual(
+            schema.schema["prefixItems"],
+            [{"$ref": "#/$defs/Location"}, {"$ref": "#/$defs/Location2"}],
+        )
+        self.assertEqual(
+            schema.defs["Location2"]["properties"]["address"],
+            {"$ref": "#/$defs/Address2"},
+        )
+        self.assertEqual(schema.defs["Address"], ADDRESS_DEF)
+        self.assertEqual(
+            schema.defs["Address2"]["properties"], {"city": {"type": "string"}}
+        )
+
+    def test_converted_types_are_not_kept_alive(self):
+        @dataclass
+        class Temporary:
+            value: int
+
+        convert_type(list[Temporary])
+        reference = weakref.ref(Temporary)
+        del Temporary
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_static_annotations(self):
+        schemas = get_static_function_calling_schemas(
+            'def func(a: list[int], b: "dict[str, float] | None" = None):\n'
+            '    """\n'
+            "    Short description.\n\n"
+            "    :param a: Integers.\n"
+            "    :param b: Mapping.\n"
+            '    """\n'
+        )
+        properties = schemas["func"]["parameters"]["properties"]
+        self.assertEqual(properties["a"]["items"], {"type": "number"})
+        self.assertEqual(
+            properties["b"]["anyOf"],
+            [
+                {"type": "object", "additionalProperties": {"type": "number"}},
+                {"type": "null"},
+            ],
+        )
+
+    def test_postponed_annotations(self):
+        module = types.ModuleType("postponed_tools")
+        sys.modules[module.__name__] = module
+        try:
+            exec(POSTPONED_SOURCE, module.__dict__)
+            schema = get_function_calling_schema(module.ship, use_cache=False)
+            unresolved = get_function_calling_schema(
+                module.unresolved, use_cache=False
+            )
+        finally:
+            del sys.modules[module.__name__]
+
+        self.assertEqual(
+            schema["parameters"]["$defs"], {"Address": ADDRESS_DEF}
+        )
+        properties = schema["parameters"]["properties"]
+        self.assertEqual(properties["home"]["$ref"], "#/$defs/Address")
+        self.assertEqual(
+            properties["note"]["anyOf"], [{"type": "string"}, {"type": "null"}]
+        )
+        self.assertEqual(properties["sizes"]["items"], {"type": "number"})
+        self.assertEqual(
+            unresolved["parameters"]["properties"]["count"]["type"], "number"
+        )